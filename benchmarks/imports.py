@@ -0,0 +1,56 @@
+#benchmark for how long it takes to import plotlyPowerpoint, in a fresh interpreter each time
+#fails if the import goes over budget, or if a module that should only load once a chart needs it is imported up front
+#usage: python benchmarks/imports.py [--runs 10] [--budget 1.0]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+#modules that should only be imported once a chart or an image export needs them
+_lazyModules = ['plotly', 'scipy', 'numerize', 'kaleido', 'polars', 'duckdb']
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#function to import the library in a fresh interpreter
+#returns the seconds spent importing it, from python's own import timer, and the modules it loaded
+def _importOnce():
+    code = 'import json, sys, plotlyPowerpoint; print(json.dumps(sorted(sys.modules)))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=_root, capture_output=True, text=True, check=True)
+
+    #the last line of the timer's output is the library itself, with everything it imported
+    seconds = None
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.rstrip().endswith('| plotlyPowerpoint'):
+            seconds = int(line.split('|')[1]) / 1000000
+    return seconds, json.loads(result.stdout)
+
+def importTime(runs=10):
+    times = []
+    eager = set()
+    for i in range(runs):
+        seconds, modules = _importOnce()
+        times.append(seconds)
+        eager.update(m for m in modules if any(m == lazy or m.startswith(lazy + '.') for lazy in _lazyModules))
+
+    return {
+        'runs': runs,
+        'median': round(statistics.median(times), 4),
+        'min': round(min(times), 4),
+        'max': round(max(times), 4),
+        'eager-modules': sorted(eager)
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget', type=float, default=1.0, help='most seconds the median import can take')
+    args = parser.parse_args()
+
+    result = importTime(args.runs)
+    result['budget'] = args.budget
+    print(json.dumps(result, indent=2))
+
+    if result['eager-modules'] or result['median'] > args.budget:
+        sys.exit(1)
@@ -0,0 +1,195 @@
+#benchmark for each stage of building slides, for every chart type, over synthetic data of different sizes
+#stages are timed on their own: filter, groupby/agg, figure construction, image export, slide insertion, table fill, and save
+#results are written as json, and can be compared against the results from another commit
+#usage: python benchmarks/stages.py [--rows 10000 1000000 10000000] [--output results.json] [--compare baseline.json]
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _root)
+
+import plotlyPowerpoint.core as core
+from plotlyPowerpoint.export import ImageExporter
+from plotlyPowerpoint.filters import compileFilters
+
+#every chart type createSlides can draw, plus tables
+_chartTypes = ['line', 'bar', 'facetLine', 'facetBar', 'filledLine', 'facetFilledLine', 'table']
+
+#placeholders in the example template
+_chartIndex = {'slide': 0, 'title': 0, 'chart': 10, 'description': 11}
+_tableIndex = {'slide': 2, 'title': 0, 'chart': 12, 'description': 11}
+
+#function to make a synthetic dataframe, with the given number of distinct colors and facets
+def makeData(rows, colors, facets, seed=0):
+    rng = np.random.default_rng(seed)
+    colorNames = np.array(['color ' + str(i) for i in range(colors)], dtype=object)
+    facetNames = np.array(['facet ' + str(i) for i in range(facets)], dtype=object)
+    return pd.DataFrame({
+        'day': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+        'color': colorNames[rng.integers(0, colors, rows)],
+        'facet': facetNames[rng.integers(0, facets, rows)],
+        'year': rng.integers(2015, 2022, rows),
+        'sales': rng.random(rows) * 100,
+        'units': rng.integers(0, 10, rows)
+    })
+
+#function to get a chart definition of each type over the synthetic data
+def makeChart(chartType, data):
+    filters = [{'variable': 'year', 'operation': '>=', 'value': '2016', 'type': 'int'}]
+    sales = {'name': 'sales', 'prettyName': 'Sales', 'method': 'sum'}
+    units = {'name': 'units', 'prettyName': 'Units', 'method': 'mean'}
+
+    if chartType == 'table':
+        return {'data': data, 'type': 'table', 'name': 'Table', 'filters': filters,
+                'column_formats': ['', '', 'money', 'twoDigitNum'], 'pagination': {'rows-per-slide': 15},
+                'item-index': _tableIndex}
+
+    chart = {'data': data, 'type': chartType, 'name': chartType, 'filters': filters, 'metrics': [sales],
+             'x-axis-title': 'Day', 'y-axis-title': 'Sales', 'options': {}, 'item-index': _chartIndex}
+    if chartType in ['line', 'filledLine', 'facetLine', 'facetFilledLine']:
+        chart['axis'] = 'day'
+    else:
+        chart['axis'] = 'color'
+        chart['metrics'] = [sales, units]
+    if chartType in ['line', 'filledLine', 'facetFilledLine']:
+        chart['color'] = 'color'
+    if chartType.startswith('facet'):
+        chart['facet'] = 'facet'
+        chart['facet-direction'] = 'columns'
+    return chart
+
+#function to get a table's columns, since tables aren't grouped when they are built
+def _tableData(temp):
+    return temp.groupby(['color', 'facet']).agg({'sales': 'sum', 'units': 'mean'}).reset_index()
+
+#function to time a call, returning the seconds it took and what it returned
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+#function to time every stage of one chart. Returns the seconds for each stage
+def benchmarkChart(chartDefinition, exporter, mainColors):
+    stages = {}
+
+    #filter the raw data
+    data = chartDefinition['data']
+    stages['filter'], temp = _timed(lambda: data.loc[compileFilters(chartDefinition['filters'])(data), :])
+
+    #group and summarise, through the same code createSlides uses
+    grouped = {k: v for k, v in chartDefinition.items() if k != 'filters'}
+    grouped['data'] = temp
+    if chartDefinition['type'] == 'table':
+        stages['groupby'], temp = _timed(_tableData, temp)
+    else:
+        stages['groupby'], temp = _timed(core._prepareData, grouped, core._groupList(grouped), core._metricDict(grouped))
+
+    #tables don't have a figure. Their stage is filling in the table, one page at a time
+    if chartDefinition['type'] == 'table':
+        stages['table-fill'], result = _timed(core._insertSlide, chartDefinition, temp, None, mainColors)
+        return stages
+
+    stages['figure'], fig = _timed(core._createFigure, chartDefinition, temp, mainColors)
+    stages['export'], image = _timed(exporter.export, fig, **core._exportOptions(chartDefinition))
+    stages['slide-insert'], result = _timed(core._insertSlide, chartDefinition, temp, image, mainColors)
+    return stages
+
+#function to run every chart type over one synthetic dataset, and save the deck at the end
+#returns a list of results, taking the fastest of each stage over every repeat
+def benchmarkCase(rows, colors, facets, template, exporter, repeat=1, chartTypes=_chartTypes):
+    data = makeData(rows, colors, facets)
+    case = {'rows': rows, 'colors': colors, 'facets': facets}
+
+    #some charts take a palette color for each distinct color, so the palette is repeated to cover them all
+    palette = core._getColors()
+    mainColors = list(palette) * (max(colors, facets) // len(palette) + 1)
+
+    best = {}
+    for i in range(repeat):
+        core.setTemplate(template)
+        for chartType in chartTypes:
+            stages = benchmarkChart(makeChart(chartType, data), exporter, mainColors)
+            for stage, seconds in stages.items():
+                best[(chartType, stage)] = min(seconds, best.get((chartType, stage), seconds))
+
+        seconds, result = _timed(core.prs.save, io.BytesIO())
+        best[('deck', 'save')] = min(seconds, best.get(('deck', 'save'), seconds))
+
+    return [dict(case, type=chartType, stage=stage, seconds=round(seconds, 6)) for (chartType, stage), seconds in best.items()]
+
+#function to describe what the benchmark ran on, so results from different commits can be told apart
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=_root, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    import plotly
+    import pptx
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'python-pptx': pptx.__version__
+    }
+
+#function to line up two sets of results, giving the ratio of new to old seconds for each stage both have
+def compareResults(old, new):
+    def key(result):
+        return (result['rows'], result['colors'], result['facets'], result['type'], result['stage'])
+
+    oldSeconds = {key(result): result['seconds'] for result in old['results']}
+    comparison = []
+    for result in new['results']:
+        if key(result) in oldSeconds:
+            before = oldSeconds[key(result)]
+            comparison.append(dict(result, before=before, ratio=round(result['seconds'] / before, 3) if before else None))
+    return comparison
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=float, nargs='+', default=[1e4, 1e6, 1e7])
+    parser.add_argument('--colors', type=int, nargs='+', default=[3, 30], help='distinct values of the color column')
+    parser.add_argument('--facets', type=int, nargs='+', default=[2, 6], help='distinct values of the facet column')
+    parser.add_argument('--types', nargs='+', default=_chartTypes, choices=_chartTypes)
+    parser.add_argument('--repeat', type=int, default=1, help='runs of each case, keeping the fastest time for each stage')
+    parser.add_argument('--template', default=os.path.join(_root, 'example', 'template.pptx'))
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', help='results from an earlier run to compare against')
+    args = parser.parse_args()
+
+    results = []
+    with ImageExporter() as exporter:
+
+        #a small run first, so loading plotly and starting the export engine isn't counted against the first chart
+        benchmarkCase(100, 2, 2, args.template, exporter, 1, args.types)
+
+        for rows in args.rows:
+            for colors in args.colors:
+                for facets in args.facets:
+                    print('rows=%d colors=%d facets=%d' % (rows, colors, facets), file=sys.stderr)
+                    results.extend(benchmarkCase(int(rows), colors, facets, args.template, exporter, args.repeat, args.types))
+
+    output = {'environment': environment(), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        for result in compareResults(old, output):
+            print('%9d %3d %3d %-16s %-13s %10.4f %10.4f %8s' % (result['rows'], result['colors'], result['facets'], result['type'], result['stage'],
+                                                             result['before'], result['seconds'], result['ratio']))
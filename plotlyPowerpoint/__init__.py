@@ -1 +1,6 @@
-from plotlyPowerpoint.core import *
\ No newline at end of file
+from plotlyPowerpoint.core import *
+from plotlyPowerpoint.export import *
+from plotlyPowerpoint.cache import *
+from plotlyPowerpoint.filters import *
+from plotlyPowerpoint.template import *
+from plotlyPowerpoint.spec import ChartSpec
@@ -0,0 +1,179 @@
+import pandas as pd
+import hashlib
+import json
+import os
+import threading
+from plotlyPowerpoint.filters import _parseFilter
+from collections import OrderedDict
+from importlib import metadata
+
+#chart definition keys that don't change what the chart image looks like
+_layoutOnlyKeys = ['data', 'filters', 'item-index', 'name', 'description', 'subtitle', 'print-chart']
+
+#function to fingerprint a dataframe by its columns, types, and values
+def _hashFrame(temp):
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in temp.columns]).encode())
+    digest.update(json.dumps([str(t) for t in temp.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(temp, index=False).values.tobytes())
+    return digest.hexdigest()
+
+#function to get the installed plotly version, which changes how charts are drawn
+#read from the package metadata, so fingerprinting charts never loads plotly itself
+def _plotlyVersion():
+    return metadata.version('plotly')
+
+#function to build the cache key for a chart image
+#made up of the aggregated data plus everything in the definition that changes how it is drawn
+def _renderKey(chartDefinition, temp, mainColors, options):
+    definition = {k: v for k, v in chartDefinition.items() if k not in _layoutOnlyKeys}
+
+    digest = hashlib.sha256()
+    digest.update(_hashFrame(temp).encode())
+    digest.update(json.dumps([definition, list(mainColors), options, _plotlyVersion()], sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+#function to turn a value in a chart definition into something that can be fingerprinted
+def _fingerprintValue(value):
+    if isinstance(value, pd.DataFrame):
+        return _hashFrame(value)
+    return str(value)
+
+#function to fingerprint everything that goes into a chart's slides, for incremental builds
+#unlike the render key, this includes the text on the slide and where everything goes
+def _slideKey(chartDefinition, temp, mainColors, options):
+    definition = {k: v for k, v in chartDefinition.items() if k != 'data'}
+
+    digest = hashlib.sha256()
+    digest.update(_hashFrame(temp).encode())
+    digest.update(json.dumps([definition, list(mainColors), options, _plotlyVersion()], sort_keys=True, default=_fingerprintValue).encode())
+    return digest.hexdigest()
+
+#on disk cache of rendered chart images, keyed by content, with least recently used eviction
+#images are looked up on the thread preparing charts while they are added on the thread inserting slides,
+#so the index and its size are only changed while holding the lock
+class RenderCache:
+
+    def __init__(self, folder, maxBytes=500 * 1024 * 1024):
+        self.folder = folder
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self._load()
+
+    #function to build the index of cached images from the folder, least recently used first
+    #evicts straight away if the folder is over this cache's size limit
+    def _load(self):
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith('.img'):
+                stat = os.stat(os.path.join(self.folder, name))
+                entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        with self._lock:
+            self._index = OrderedDict((key, size) for mtime, key, size in sorted(entries))
+            self._size = sum(self._index.values())
+            self._evict()
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + '.img')
+
+    #function to get a cached image, or None if it isn't in the cache
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                image = f.read()
+        except FileNotFoundError:
+            #another build, or another thread, may have evicted it
+            with self._lock:
+                if key in self._index:
+                    self._size -= self._index.pop(key)
+            return None
+
+        #mark as recently used, for this process and any other sharing the folder
+        #if it was evicted since it was read, the image is still good but is no longer in the cache
+        with self._lock:
+            try:
+                os.utime(self._path(key))
+            except FileNotFoundError:
+                return image
+            if key not in self._index:
+                self._size += len(image)
+            self._index[key] = len(image)
+            self._index.move_to_end(key)
+        return image
+
+    #function to add an image to the cache, evicting the least recently used images if over the limit
+    def put(self, key, image):
+        temporary = self._path(key) + '.' + str(os.getpid()) + '.' + str(threading.get_ident())
+        with open(temporary, 'wb') as f:
+            f.write(image)
+        os.replace(temporary, self._path(key))
+
+        with self._lock:
+            if key in self._index:
+                self._size -= self._index[key]
+            self._index[key] = len(image)
+            self._index.move_to_end(key)
+            self._size += len(image)
+            self._evict()
+
+    #function to remove the least recently used images until the cache is under its size limit
+    def _evict(self):
+        with self._lock:
+            while self._size > self.maxBytes and len(self._index) > 1:
+                oldKey, oldSize = self._index.popitem(last=False)
+                self._size -= oldSize
+                self.evictions += 1
+                try:
+                    os.remove(self._path(oldKey))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._index),
+                'bytes': self._size
+            }
+
+#function to build the key for the data a chart needs
+#charts over the same data, with the same filters, groups, and metrics get the same key
+#data read from a file is the same data wherever its path is given
+def _aggregationKey(chartDefinition, groupList, metricDict):
+    data = chartDefinition['data']
+    filters = repr([_parseFilter(item) for item in chartDefinition.get('filters', [])])
+    groups = None if groupList is None else tuple(groupList)
+    metrics = None if metricDict is None else tuple(metricDict.items())
+    return (os.path.abspath(data) if isinstance(data, (str, os.PathLike)) else id(data), filters, groups, metrics)
+
+#in memory cache of filtered and grouped data, shared by the charts in one build
+#the data itself is kept alongside each result, so its id can't be reused while the cache is alive
+class _AggregationCache:
+
+    def __init__(self):
+        self._results = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    #function to get the lock for a key, held while its data is worked out
+    #so when charts are built on several threads, the same data is only worked out once
+    def lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key):
+        if key in self._results:
+            return self._results[key][1]
+        return None
+
+    def put(self, key, data, temp):
+        self._results[key] = (data, temp)
@@ -1,13 +1,23 @@
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from numerize import numerize 
-from scipy.stats import pearsonr
-from pptx.dml.color import RGBColor
+import pandas as pd
 from pptx.oxml.xmlchemy import OxmlElement
-from pptx.util import Pt
+from pptx.slide import Slides
 import os
-import math
+import io
+import json
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from plotlyPowerpoint.export import ImageExporter
+from plotlyPowerpoint.cache import RenderCache, _AggregationCache, _aggregationKey, _renderKey, _slideKey
+from plotlyPowerpoint.filters import compileFilters
+from plotlyPowerpoint.planner import _planCharts
+from plotlyPowerpoint.tables import _insertTable, _tableText, _tablePages
+from plotlyPowerpoint.native import _insertNativeChart
+from plotlyPowerpoint.stream import _DeckStream
+from plotlyPowerpoint.template import Template, _loadTemplate
+from plotlyPowerpoint.spec import _compileSpecs, _groupList, _metricDict, _imageSettingsProblems
+from plotlyPowerpoint.decimate import _decimateChart, _decimateTypes, _decimateMethods
+from plotlyPowerpoint.sources import _isSource, _queryData, _sourceColumns
 
 #Define functions for table/cell formatting
 def SubElement(parent, tagname, **kwargs):
@@ -30,18 +40,25 @@ def _set_cell_border(cell, border_color="000000", border_width='12700'):
 
     return cell
 
+#the presentation being built, set by setTemplate
+prs = None
+
 #function to set the powerpoint template being used
+#takes a filename or a Template. Each file is only parsed once, and every deck gets its own copy of it
 def setTemplate(fileName):
-    from pptx import Presentation
-    
+    global prs
+
     #validate input
-    if type(fileName) != str:
-        raise Exception("You must input your filename as a string")
+    if type(fileName) != str and not isinstance(fileName, Template):
+        raise Exception("You must input your filename as a string, or a Template")
+
+    if isinstance(fileName, Template):
+        prs = fileName.presentation()
+        return
 
     #Load in template for presentation
     try:
-        global prs 
-        prs = Presentation(fileName)
+        prs = _loadTemplate(fileName).presentation()
     except:
         raise Exception("File not found")
         
@@ -50,174 +67,259 @@ def setColors(colors):
     global colorPalette
     colorPalette = colors
     
-#master function for creating slides
-def createSlides(charts):
-    
-    #loop through each item in the array
-    for z in range(len(charts)):
-        
-        chartDefinition = charts[z]
-        
-        #####################
-        ### Prepare Data
-        #####################
-
-        #get data defined
-        temp = chartDefinition['data']
-
-        #filter data if needed
-        if 'filters' in chartDefinition:
-            filters = []
-            for item in chartDefinition['filters']:
-                if item["type"] == "int":
-                    statement = "temp['" + item["variable"] + "'] " + item["operation"] + " int(" + item["value"] + ")"
-                elif item['type'] == 'str':
-                    statement = "temp['" + item["variable"] + "'] " + item["operation"] + " '" + item["value"] + "'"
-                elif item['type'] == 'date':
-                    statement = "temp['" + item["variable"] + "'] " + item["operation"] + " '" + item["value"] + "'"
-                elif (item['type'] == 'list') and (item['operation'] == 'in'):
-                    statement = "temp['" + item["variable"] + "'].isin(" + str(item["value"]) + ")"
-                elif (item['type'] == 'list') and (item['operation'] == 'not in'):
-                    statement = "~temp['" + item["variable"] + "'].isin(" + str(item["value"]) + ")"
-                filters.append(statement)
-
-            #filter data
-            for i in range(len(filters)):
-                temp = temp.loc[eval(filters[i]), :]
-
-        #group data by axis and breakdowns
-        if chartDefinition['type'] != 'table':
-            #assembe list
-            groupList = []
-            if 'color' in chartDefinition:
-                groupList.append(chartDefinition['color'])
-
-            #add axis
-            groupList.append(chartDefinition['axis'])
-
-            #add facet if included
-            if 'facet' in chartDefinition:
-                groupList.append(chartDefinition['facet'])
-
-            #assemble dictionary for aggregation
-            metricDict = {}
-            for metric in chartDefinition["metrics"]:
-                metricDict[metric["name"]] = metric["method"]
-
-            #finally group and summarise data
-            temp = temp.groupby(groupList).agg(metricDict).reset_index()
-
+#plotly's default palette (plotly.colors.qualitative.Plotly), kept here so that decks of tables or native charts never load plotly
+_defaultColors = ['#636EFA', '#EF553B', '#00CC96', '#AB63FA', '#FFA15A', '#19D3F3', '#FF6692', '#B6E880', '#FF97FF', '#FECB52']
 
-        #####################
-        ### Create and Save Chart
-        #####################
-        
-        #set color palette. If pre-set, define it. If not, use default
-        try:
-            colorPalette
-        except NameError:
-            mainColors = px.colors.qualitative.Plotly
+#function to get the color palette for charts. If pre-set, use it. If not, use default
+def _getColors():
+    try:
+        colorPalette
+    except NameError:
+        return _defaultColors
+    else:
+        return colorPalette
+
+#function to filter and group the data needed for a single chart
+#if the chart is being profiled, the time spent filtering and grouping is added to its profile
+def _prepareData(chartDefinition, groupList, metricDict, profile=None):
+
+    #get data defined
+    temp = chartDefinition['data']
+    start = time.perf_counter()
+
+    #data in another engine is filtered and grouped there in one query, so it all counts as aggregating
+    if _isSource(temp):
+        temp = _queryData(temp, chartDefinition.get('filters', []), groupList, metricDict)
+        if profile is not None:
+            profile['seconds']['aggregate'] += time.perf_counter() - start
+        return temp
+
+    #data given as chunks is filtered a chunk at a time, as it is read
+    if not isinstance(temp, pd.DataFrame):
+        temp = _filterChunks(temp, chartDefinition.get('filters', []))
+
+        #grouping needs every row, so only tables keep reading the chunks lazily
+        if groupList is None:
+            return temp
+        temp = pd.concat(list(temp))
+
+    #filter data if needed, slicing the data only once for all filters
+    elif 'filters' in chartDefinition:
+        temp = temp.loc[compileFilters(chartDefinition['filters'])(temp), :]
+    filtered = time.perf_counter()
+
+    #group data by axis and breakdowns, then summarise
+    if groupList is not None:
+        temp = temp.groupby(groupList).agg(metricDict).reset_index()
+
+    if profile is not None:
+        profile['seconds']['filter'] += filtered - start
+        profile['seconds']['aggregate'] += time.perf_counter() - filtered
+    return temp
+
+#function to filter data given as an iterator of dataframe chunks, one chunk at a time
+def _filterChunks(chunks, filters):
+    mask = compileFilters(filters) if filters else None
+    for chunk in chunks:
+        yield chunk if mask is None else chunk.loc[mask(chunk), :]
+
+#function to check if a chart's data is a dataframe, rather than chunks that are read as they are needed
+def _isFrame(chartDefinition):
+    return isinstance(chartDefinition.get('data'), pd.DataFrame)
+
+#function to check if a chart's data is given as chunks, which can only be read once
+def _isChunks(chartDefinition):
+    return not _isFrame(chartDefinition) and not _isSource(chartDefinition.get('data'))
+
+#function to get the columns of a chart's data, wherever it is
+def _dataColumns(data):
+    return _sourceColumns(data) if _isSource(data) else data.columns
+
+#function to get the placeholder indexes on each slide layout of the template
+#every build starts here, so a missing template is caught before anything is done
+def _layoutPlaceholders():
+    if prs is None:
+        raise Exception("No template is set. Call setTemplate first")
+    return [set(placeholder.placeholder_format.idx for placeholder in layout.placeholders) for layout in prs.slide_layouts]
+
+#function to check every chart definition against its data and the template, before any work is done
+#returns a ChartSpec for each chart, which can be given to createSlides instead of the definitions
+#raises a ValueError listing every problem found
+def compileCharts(charts):
+    return _compileSpecs(charts, _layoutPlaceholders())
+
+#function to get the data for a chart, reusing the data of an earlier chart if it needs the same thing
+#charts in a plan group are rolled up from the group's shared grouping instead of going back to the raw data
+#returns the data and where it came from
+def _chartData(chartDefinition, aggregationCache, planGroup=None, profile=None):
+    groupList = _groupList(chartDefinition)
+    metricDict = _metricDict(chartDefinition)
+
+    #chunks can only be read once, so they can't be shared with other charts
+    if _isChunks(chartDefinition):
+        return _prepareData(chartDefinition, groupList, metricDict, profile), 'miss'
+
+    #charts built at the same time on different threads wait for the first one that needs the same data
+    key = _aggregationKey(chartDefinition, groupList, metricDict)
+    with aggregationCache.lock(key):
+        temp = aggregationCache.get(key)
+        if temp is not None:
+            return temp, 'hit'
+
+        if planGroup is not None:
+            start = time.perf_counter()
+            temp = planGroup.rollUp(groupList, metricDict)
+            source = 'rollup'
+            if profile is not None:
+                profile['seconds']['aggregate'] += time.perf_counter() - start
         else:
-            mainColors = colorPalette
+            temp = _prepareData(chartDefinition, groupList, metricDict, profile)
+            source = 'miss'
+
+        aggregationCache.put(key, chartDefinition['data'], temp)
+    return temp, source
+
+#function to start the profile of a chart, which is filled in as the chart is built
+def _chartProfile(index, chartDefinition):
+    data = chartDefinition.get('data')
+    return {
+        'index': index,
+        'name': chartDefinition.get('name'),
+        'type': chartDefinition['type'],
+        'seconds': {'filter': 0.0, 'aggregate': 0.0, 'decimate': 0.0, 'figure': 0.0, 'export': 0.0, 'insert': 0.0, 'table': 0.0},
+        'rows': {'input': len(data) if isinstance(data, pd.DataFrame) else None, 'aggregated': None, 'drawn': None},
+        'traces': None,
+        'image-bytes': None,
+        'peak-memory': None,
+        'aggregation': None
+    }
+
+#function to start measuring the most memory used from here on. Returns the memory in use now
+def _memoryStart():
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+    return tracemalloc.get_traced_memory()[0]
+
+#function to get the most memory used above start since _memoryStart, or None if memory isn't being traced
+def _memoryPeak(start):
+    if not tracemalloc.is_tracing():
+        return None
+    return max(tracemalloc.get_traced_memory()[1] - start, 0)
+
+#function to split a chart's data by facet in a single pass
+#parts come back in the order each facet first appears, the same order as unique()
+def _facetPartitions(temp, facet):
+    return [part for key, part in temp.groupby(facet, sort=False)]
+
+#function to split a chart's data by facet and color in a single pass
+#returns, for each facet, a list of (color, data) in the order each color first appears in that facet
+def _facetColorPartitions(temp, facet, color):
+    partitions = {}
+    for (facetValue, clr), part in temp.groupby([facet, color], sort=False):
+        partitions.setdefault(facetValue, []).append((clr, part))
+    return list(partitions.values())
+
+#function to create the plotly figure for a single chart
+#plotly is only imported once a figure is needed, so decks of tables and native charts never load it
+def _createFigure(chartDefinition, temp, mainColors):
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    #line chart
+    if chartDefinition['type'] == 'line':
+        
+        #first, figure out if we have multiple metrics. Chart is very different if multiple
+        if len(chartDefinition['metrics']) == 1:
 
-        #line chart
-        if chartDefinition['type'] == 'line':
-            
-            #first, figure out if we have multiple metrics. Chart is very different if multiple
-            if len(chartDefinition['metrics']) == 1:
-
-                #Determine if we're grouping by color or not
-                if 'color' in chartDefinition:  
-                    fig = px.line(temp,
-                                  x=chartDefinition['axis'],
-                                  y=chartDefinition['metrics'][0]['name'],
-                                  color_discrete_sequence= mainColors,
-                                  color=chartDefinition['color'])
-                else:
-                    fig = px.line(temp,
+            #Determine if we're grouping by color or not
+            if 'color' in chartDefinition:  
+                fig = px.line(temp,
                               x=chartDefinition['axis'],
                               y=chartDefinition['metrics'][0]['name'],
-                              color_discrete_sequence=mainColors
-                                 )
-
-            else: #we have multiple metrics 
-
-                # Create fig
-                fig = go.Figure()
-
-                # Add all lines to the chart
-                for i in range(len(chartDefinition['metrics'])):
-                    fig.add_trace(go.Scatter(x=temp[chartDefinition['axis']],
-                                             y=temp[chartDefinition['metrics'][i]['name']],
-                                             mode='lines',
-                                             name=chartDefinition['metrics'][i]['prettyName'],
-                                             line = dict(color=mainColors[i])
-                                            )
-                                 )
-
-
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
-
-            ### Handle all options
-            if 'options' in chartDefinition:
-
-                ### Grid lines
-                if 'horizontal-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['horizontal-grid-lines'] == 'true':
-                        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
-
-                if 'vertical-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['vertical-grid-lines'] == 'true':
-                        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb', title="")
-
-                ### X axis ticks rotation
-                if 'x-axis-ticks-angle' in chartDefinition['options']:
-                    fig.update_xaxes(nticks=temp[chartDefinition['axis']].nunique(), tickangle=chartDefinition['options']['x-axis-ticks-angle'])
+                              color_discrete_sequence= mainColors,
+                              color=chartDefinition['color'])
+            else:
+                fig = px.line(temp,
+                          x=chartDefinition['axis'],
+                          y=chartDefinition['metrics'][0]['name'],
+                          color_discrete_sequence=mainColors
+                             )
 
+        else: #we have multiple metrics 
 
-            #update legend
-            fig.update_layout(legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                xanchor="center",
-                x=.5,
-                y=-.3,
-                title=""
-            ))
+            # Create fig
+            fig = go.Figure()
 
-            #X axis title
-            if 'x-axis-title' in chartDefinition:
-                fig.update_layout(
-                    xaxis_title=chartDefinition['x-axis-title']
-                )
+            # Add all lines to the chart
+            for i in range(len(chartDefinition['metrics'])):
+                fig.add_trace(go.Scatter(x=temp[chartDefinition['axis']],
+                                         y=temp[chartDefinition['metrics'][i]['name']],
+                                         mode='lines',
+                                         name=chartDefinition['metrics'][i]['prettyName'],
+                                         line = dict(color=mainColors[i])
+                                        )
+                             )
+
+
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
+
+        ### Handle all options
+        if 'options' in chartDefinition:
+
+            ### Grid lines
+            if 'horizontal-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['horizontal-grid-lines'] == 'true':
+                    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+
+            if 'vertical-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['vertical-grid-lines'] == 'true':
+                    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb', title="")
+
+            ### X axis ticks rotation
+            if 'x-axis-ticks-angle' in chartDefinition['options']:
+                fig.update_xaxes(nticks=temp[chartDefinition['axis']].nunique(), tickangle=chartDefinition['options']['x-axis-ticks-angle'])
+
+
+        #update legend
+        fig.update_layout(legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            xanchor="center",
+            x=.5,
+            y=-.3,
+            title=""
+        ))
+
+        #X axis title
+        if 'x-axis-title' in chartDefinition:
+            fig.update_layout(
+                xaxis_title=chartDefinition['x-axis-title']
+            )
 
-            #Y axis title
-            if 'y-axis-title' in chartDefinition:
-                fig.update_layout(
-                    yaxis_title=chartDefinition['y-axis-title']
-                )
+        #Y axis title
+        if 'y-axis-title' in chartDefinition:
+            fig.update_layout(
+                yaxis_title=chartDefinition['y-axis-title']
+            )
 
-        #if bar chart
-        if chartDefinition['type'] == 'bar':
+    #if bar chart
+    if chartDefinition['type'] == 'bar':
+        
+        #First, define whether or not we have 1 or many metrics
+        if len(chartDefinition['metrics']) == 1:
             
-            #First, define whether or not we have 1 or many metrics
-            if len(chartDefinition['metrics']) == 1:
-                
-                #Find proper orientation of bar chart
-                if 'options' in chartDefinition:
-                    if 'orientation' in chartDefinition['options']:
-                        if chartDefinition['options']['orientation'] == 'horizontal':
-                            x = temp[chartDefinition['metrics'][0]['name']]
-                            y = temp[chartDefinition['axis']]
-                            orien='h'
-                        else:
-                            x = temp[chartDefinition['axis']]
-                            y = temp[chartDefinition['metrics'][0]['name']]
-                            orien='v'
+            #Find proper orientation of bar chart
+            if 'options' in chartDefinition:
+                if 'orientation' in chartDefinition['options']:
+                    if chartDefinition['options']['orientation'] == 'horizontal':
+                        x = temp[chartDefinition['metrics'][0]['name']]
+                        y = temp[chartDefinition['axis']]
+                        orien='h'
                     else:
                         x = temp[chartDefinition['axis']]
                         y = temp[chartDefinition['metrics'][0]['name']]
@@ -226,44 +328,44 @@ def createSlides(charts):
                     x = temp[chartDefinition['axis']]
                     y = temp[chartDefinition['metrics'][0]['name']]
                     orien='v'
-                
-                #Setup figure, based on if color is set in function
-                if 'color' in chartDefinition:
-                    fig = px.bar(temp,
-                                 x=x,
-                                 y=y,
-                                 color=chartDefinition['color'],
-                                 orientation=orien,
-                                 color_discrete_sequence=mainColors
-                                )
-                else:
-                    fig = px.bar(temp,
-                                 x=x,
-                                 y=y,
-                                 color=groupList[0],
-                                 orientation=orien,
-                                 color_discrete_sequence=mainColors
-                                )
-  
-            else: #multiple metrics
+            else:
+                x = temp[chartDefinition['axis']]
+                y = temp[chartDefinition['metrics'][0]['name']]
+                orien='v'
             
-                 # Create fig
-                fig = go.Figure()
-
-                # Add all bars to chart
-                for i in range(len(chartDefinition['metrics'])):
-
-                    #horizontal or vertical for bar chart
-                    if 'options' in chartDefinition:
-                        if 'orientation' in chartDefinition['options']:
-                            if chartDefinition['options']['orientation'] == 'horizontal':
-                                x = temp[chartDefinition['metrics'][i]['name']]
-                                y = temp[chartDefinition['axis']]
-                                orien='h'
-                            else:
-                                x = temp[chartDefinition['axis']]
-                                y = temp[chartDefinition['metrics'][i]['name']]
-                                orien='v'
+            #Setup figure, based on if color is set in function
+            if 'color' in chartDefinition:
+                fig = px.bar(temp,
+                             x=x,
+                             y=y,
+                             color=chartDefinition['color'],
+                             orientation=orien,
+                             color_discrete_sequence=mainColors
+                            )
+            else:
+                fig = px.bar(temp,
+                             x=x,
+                             y=y,
+                             color=chartDefinition['axis'],
+                             orientation=orien,
+                             color_discrete_sequence=mainColors
+                            )
+
+        else: #multiple metrics
+        
+             # Create fig
+            fig = go.Figure()
+
+            # Add all bars to chart
+            for i in range(len(chartDefinition['metrics'])):
+
+                #horizontal or vertical for bar chart
+                if 'options' in chartDefinition:
+                    if 'orientation' in chartDefinition['options']:
+                        if chartDefinition['options']['orientation'] == 'horizontal':
+                            x = temp[chartDefinition['metrics'][i]['name']]
+                            y = temp[chartDefinition['axis']]
+                            orien='h'
                         else:
                             x = temp[chartDefinition['axis']]
                             y = temp[chartDefinition['metrics'][i]['name']]
@@ -272,31 +374,35 @@ def createSlides(charts):
                         x = temp[chartDefinition['axis']]
                         y = temp[chartDefinition['metrics'][i]['name']]
                         orien='v'
+                else:
+                    x = temp[chartDefinition['axis']]
+                    y = temp[chartDefinition['metrics'][i]['name']]
+                    orien='v'
+
+                #add trace to chart    
+                fig.add_trace(
+                    go.Bar(
+                        x=x,
+                        y=y,
+                        name=chartDefinition['metrics'][i]['prettyName'],
+                        marker_color=mainColors[i],
+                        orientation=orien
+                    )
+                ) 
 
-                    #add trace to chart    
-                    fig.add_trace(
-                        go.Bar(
-                            x=x,
-                            y=y,
-                            name=chartDefinition['metrics'][i]['prettyName'],
-                            marker_color=mainColors[i],
-                            orientation=orien
-                        )
-                    ) 
-
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
+        
+        ### Handle Options
+        if 'options' in chartDefinition:
             
-            ### Handle Options
-            if 'options' in chartDefinition:
-                
-                #If horizontal, reverse axis
-                if 'orientation' in chartDefinition['options']:
-                    if chartDefinition['options']['orientation'] == 'horizontal':
-                        fig['layout']['yaxis']['autorange'] = "reversed"
+            #If horizontal, reverse axis
+            if 'orientation' in chartDefinition['options']:
+                if chartDefinition['options']['orientation'] == 'horizontal':
+                    fig['layout']['yaxis']['autorange'] = "reversed"
 
 #                 #add data labels
 #                 if 'datalabels' in chartDefinition['options']:
@@ -309,156 +415,154 @@ def createSlides(charts):
 #                         fig.update_traces(texttemplate=textFormat, textposition='inside', textangle=0)
 #                         fig.update_layout(uniformtext_minsize=12)
 
-            
+        
 
-            #update legend
-            fig.update_layout(legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                xanchor="center",
-                x=.5,
-                y=-.3,
-                title=""
-            ))
-            
-            
-            
-        if chartDefinition['type'] == 'facetLine':
-            
-            #Create Fig
-            facets = temp[chartDefinition['facet']].unique().tolist()
-            facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
-            
-            if chartDefinition['facet-direction'] == 'rows':
-                fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
-            else:
-                fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
+        #update legend
+        fig.update_layout(legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            xanchor="center",
+            x=.5,
+            y=-.3,
+            title=""
+        ))
+        
+        
+        
+    if chartDefinition['type'] == 'facetLine':
+        
+        #Create Fig
+        facets = temp[chartDefinition['facet']].unique().tolist()
+        facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
+        
+        if chartDefinition['facet-direction'] == 'rows':
+            fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
+        else:
+            fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
 
-            #add traces for all metrics and all facets
-            for i in range(len(chartDefinition['metrics'])):
-                for facet in facets:
+        #split the data by facet once, and reuse it for every metric
+        facetData = _facetPartitions(temp, chartDefinition['facet'])
 
-                    #filter data for only current facet
-                    temp2 = temp[temp[chartDefinition['facet']] == facet]
-                    position = facets.index(facet)
+        #add traces for all metrics and all facets
+        for i in range(len(chartDefinition['metrics'])):
+            for position, (facet, temp2) in enumerate(zip(facets, facetData)):
 
-                    #get proper color for line
-                    if 'color-grouping' in chartDefinition['options']:
-                        if chartDefinition['options']['color-grouping'] == 'facet':
-                            lineColor = mainColors[position]
-                        else:
-                            lineColor = mainColors[i]
+                #get proper color for line
+                if 'color-grouping' in chartDefinition['options']:
+                    if chartDefinition['options']['color-grouping'] == 'facet':
+                        lineColor = mainColors[position]
                     else:
                         lineColor = mainColors[i]
-
-                    fig.add_trace(
-                        go.Scatter(
-                            x=temp2[chartDefinition['axis']],
-                            y=temp2[chartDefinition['metrics'][i]['name']],
-                            mode='lines',
-                            name=facet,
-                            line = dict(color=lineColor)
-                        ), 
-                        position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
-                        position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
-                    )
-              
-            
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
-            
-            
-            ### Handle all options
-            if 'options' in chartDefinition:
-
-                ### Grid lines
-                if 'horizontal-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['horizontal-grid-lines'] == 'true':
-                        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
-
-                if 'vertical-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['vertical-grid-lines'] == 'true':
-                        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
-
-
-            #update legend
-            fig.update_layout(legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                xanchor="center",
-                x=.5,
-                y=-.3,
-                title=""
-            ))
-
-            #X axis title
-            if 'x-axis-title' in chartDefinition:
-                if chartDefinition['facet-direction'] == 'rows':
-                    fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=len(facets), col=1)
-                else:
-                    for i in range(len(facets)):
-                        fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=1, col=i+1)
-
-            #Y axis title
-            if 'y-axis-title' in chartDefinition:
-                if chartDefinition['facet-direction'] == 'rows':
-                    for i in range(len(facets)):
-                        fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=i+1, col=1)
                 else:
-                    fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=1, col=1)
-            
-            
-        #Facet Bar Chart
-        if chartDefinition['type'] == 'facetBar':
-            
-            #Create Fig
-            facets = temp[chartDefinition['facet']].unique().tolist()
-            facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
-            
+                    lineColor = mainColors[i]
+
+                fig.add_trace(
+                    go.Scatter(
+                        x=temp2[chartDefinition['axis']],
+                        y=temp2[chartDefinition['metrics'][i]['name']],
+                        mode='lines',
+                        name=facet,
+                        line = dict(color=lineColor)
+                    ), 
+                    position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
+                    position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
+                )
+          
+        
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
+        
+        
+        ### Handle all options
+        if 'options' in chartDefinition:
+
+            ### Grid lines
+            if 'horizontal-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['horizontal-grid-lines'] == 'true':
+                    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+
+            if 'vertical-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['vertical-grid-lines'] == 'true':
+                    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+
+
+        #update legend
+        fig.update_layout(legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            xanchor="center",
+            x=.5,
+            y=-.3,
+            title=""
+        ))
+
+        #X axis title
+        if 'x-axis-title' in chartDefinition:
             if chartDefinition['facet-direction'] == 'rows':
-                fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
+                fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=len(facets), col=1)
             else:
-                fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
+                for i in range(len(facets)):
+                    fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=1, col=i+1)
 
-            #add traces for all metrics and all facets
-            for i in range(len(chartDefinition['metrics'])):
-                for facet in facets:
-
-                    #filter data for only current facet
-                    temp2 = temp[temp[chartDefinition['facet']] == facet]
-                    position = facets.index(facet)
-
-                    #get proper color for line
-                    if 'color-grouping' in chartDefinition['options']:
-                        if chartDefinition['options']['color-grouping'] == 'facet':
-                            barColor = mainColors[position]
-                        elif chartDefinition['options']['color-grouping'] == 'axis':
-                            axisPoints = temp2[chartDefinition['axis']].unique()
-                            barColor = mainColors[0:len(axisPoints)]
-                        else:
-                            barColor = mainColors[i]
+        #Y axis title
+        if 'y-axis-title' in chartDefinition:
+            if chartDefinition['facet-direction'] == 'rows':
+                for i in range(len(facets)):
+                    fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=i+1, col=1)
+            else:
+                fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=1, col=1)
+        
+        
+    #Facet Bar Chart
+    if chartDefinition['type'] == 'facetBar':
+        
+        #Create Fig
+        facets = temp[chartDefinition['facet']].unique().tolist()
+        facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
+        
+        if chartDefinition['facet-direction'] == 'rows':
+            fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
+        else:
+            fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
+
+        #split the data by facet once, and reuse it for every metric
+        facetData = _facetPartitions(temp, chartDefinition['facet'])
+
+        #add traces for all metrics and all facets
+        for i in range(len(chartDefinition['metrics'])):
+            for position, (facet, temp2) in enumerate(zip(facets, facetData)):
+
+                #get proper color for line
+                if 'color-grouping' in chartDefinition['options']:
+                    if chartDefinition['options']['color-grouping'] == 'facet':
+                        barColor = mainColors[position]
+                    elif chartDefinition['options']['color-grouping'] == 'axis':
+                        axisPoints = temp2[chartDefinition['axis']].unique()
+                        barColor = mainColors[0:len(axisPoints)]
                     else:
                         barColor = mainColors[i]
+                else:
+                    barColor = mainColors[i]
+
+                fig.add_trace(
+                    go.Bar(
+                        x=temp2[chartDefinition['axis']],
+                        y=temp2[chartDefinition['metrics'][i]['name']],
+                        name=facet,
+                        marker=dict(color=barColor)
+                    ), 
+                    position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
+                    position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
+                )
 
-                    fig.add_trace(
-                        go.Bar(
-                            x=temp2[chartDefinition['axis']],
-                            y=temp2[chartDefinition['metrics'][i]['name']],
-                            name=facet,
-                            marker=dict(color=barColor)
-                        ), 
-                        position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
-                        position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
-                    )
-
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
 
 #             #make facet titles just the value
 #             fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[1]))
@@ -473,384 +577,1163 @@ def createSlides(charts):
 #             fig.update_xaxes(title_text = "Date", tickfont=dict(size=6))
 #             fig.update_yaxes(tickfont=dict(size=6))
 
-            #update legend, margins, font size, etc.
-            fig.update_layout(
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    xanchor="center",
-                    x=.5,
-                    y=-.3,
-                    title=""
-                ),
-                margin=dict(
-                    l=0, r=0, t=40, b=70
-                )
+        #update legend, margins, font size, etc.
+        fig.update_layout(
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                xanchor="center",
+                x=.5,
+                y=-.3,
+                title=""
+            ),
+            margin=dict(
+                l=0, r=0, t=40, b=70
             )
+        )
 
-        #Filled line chart
-        if chartDefinition['type'] == 'filledLine':
-            
-            #Figure out if there are multiple metrics. If so, throw an error
-            if len(chartDefinition['metrics']) == 1:
-
-                #Determine if we're grouping by color or not
-                if 'color' in chartDefinition:  
-                    fig = px.area(temp,
-                                  x=chartDefinition['axis'],
-                                  y=chartDefinition['metrics'][0]['name'],
-                                  color_discrete_sequence= mainColors,
-                                  color=chartDefinition['color'])
-                else:
-                    fig = px.area(temp,
+    #Filled line chart
+    if chartDefinition['type'] == 'filledLine':
+        
+        #Figure out if there are multiple metrics. If so, throw an error
+        if len(chartDefinition['metrics']) == 1:
+
+            #Determine if we're grouping by color or not
+            if 'color' in chartDefinition:  
+                fig = px.area(temp,
                               x=chartDefinition['axis'],
                               y=chartDefinition['metrics'][0]['name'],
-                              color_discrete_sequence=mainColors
-                                 )
+                              color_discrete_sequence= mainColors,
+                              color=chartDefinition['color'])
+            else:
+                fig = px.area(temp,
+                          x=chartDefinition['axis'],
+                          y=chartDefinition['metrics'][0]['name'],
+                          color_discrete_sequence=mainColors
+                             )
 
-            else: #we have multiple metrics 
+        else: #we have multiple metrics 
 
-               raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
+           raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
 
 
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
 
-            ### Handle all options
-            if 'options' in chartDefinition:
+        ### Handle all options
+        if 'options' in chartDefinition:
 
-                ### Grid lines
-                if 'horizontal-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['horizontal-grid-lines'] == 'true':
-                        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+            ### Grid lines
+            if 'horizontal-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['horizontal-grid-lines'] == 'true':
+                    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
 
-                if 'vertical-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['vertical-grid-lines'] == 'true':
-                        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb', title="")
+            if 'vertical-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['vertical-grid-lines'] == 'true':
+                    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb', title="")
 
-                ### X axis ticks rotation
-                if 'x-axis-ticks-angle' in chartDefinition['options']:
-                    fig.update_xaxes(nticks=temp[chartDefinition['axis']].nunique(), tickangle=chartDefinition['options']['x-axis-ticks-angle'])
+            ### X axis ticks rotation
+            if 'x-axis-ticks-angle' in chartDefinition['options']:
+                fig.update_xaxes(nticks=temp[chartDefinition['axis']].nunique(), tickangle=chartDefinition['options']['x-axis-ticks-angle'])
 
 
-            #update legend
-            fig.update_layout(legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                xanchor="center",
-                x=.5,
-                y=-.3,
-                title=""
-            ))
+        #update legend
+        fig.update_layout(legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            xanchor="center",
+            x=.5,
+            y=-.3,
+            title=""
+        ))
 
-            #X axis title
-            if 'x-axis-title' in chartDefinition:
-                fig.update_layout(
-                    xaxis_title=chartDefinition['x-axis-title']
-                )
+        #X axis title
+        if 'x-axis-title' in chartDefinition:
+            fig.update_layout(
+                xaxis_title=chartDefinition['x-axis-title']
+            )
 
-            #Y axis title
-            if 'y-axis-title' in chartDefinition:
-                fig.update_layout(
-                    yaxis_title=chartDefinition['y-axis-title']
-                )
+        #Y axis title
+        if 'y-axis-title' in chartDefinition:
+            fig.update_layout(
+                yaxis_title=chartDefinition['y-axis-title']
+            )
 
-        #Facet Fill Line
-        if chartDefinition['type'] == 'facetFilledLine':
-            
-            #throw error if there are multiple metrics
-            if len(chartDefinition['metrics']) > 1:
-                raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
+    #Facet Fill Line
+    if chartDefinition['type'] == 'facetFilledLine':
+        
+        #throw error if there are multiple metrics
+        if len(chartDefinition['metrics']) > 1:
+            raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
 
-            #Create Fig
-            facets = temp[chartDefinition['facet']].unique().tolist()
-            facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
+        #Create Fig
+        facets = temp[chartDefinition['facet']].unique().tolist()
+        facetSpacing = chartDefinition['options']['facet-spacing'] if 'facet-spacing' in chartDefinition['options'] else 0.1
+        
+        if chartDefinition['facet-direction'] == 'rows':
+            fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
+        else:
+            fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
+
+        #split the data by facet, and by color within each facet, once
+        facetData = _facetPartitions(temp, chartDefinition['facet'])
+        if 'color' in chartDefinition:
+            facetColorData = _facetColorPartitions(temp, chartDefinition['facet'], chartDefinition['color'])
+
+        #Add the figure to each subplot
+        facetMemory = set()
+        for position, (facet, temp2) in enumerate(zip(facets, facetData)):
             
-            if chartDefinition['facet-direction'] == 'rows':
-                fig = make_subplots(len(facets), 1, vertical_spacing=facetSpacing)
-            else:
-                fig = make_subplots(1, len(facets), horizontal_spacing=facetSpacing)
-
-            #Add the figure to each subplot
-            facetMemory = []
-            for facet in facets:
-                
-                #filter data for only current facet
-                temp2 = temp[temp[chartDefinition['facet']] == facet]
-                position = facets.index(facet)
-                
-                #Add figure, based on whether we're breaking down by color                
-                if 'color' in chartDefinition:
-                    colorOptions = list(temp2[chartDefinition['color']].unique())
-                    for clr in colorOptions:
-                        
-                        #set parameters we need later
-                        colorPosition = colorOptions.index(clr)
-                        showLegend = False if clr in facetMemory else True
-                        
-                        #form new temp
-                        temp3 = temp2[temp2[chartDefinition['color']] == clr]
-                        
-                        #add trace
-                        fig.add_trace(go.Scatter(
-                                x=temp3[chartDefinition['axis']],
-                                y=temp3[chartDefinition['metrics'][0]['name']],
-                                hoverinfo='x+y',
-                                mode='lines',
-                                stackgroup='one',
-                                fill='tonexty',
-                                name=clr,
-                                legendgroup=clr,
-                                showlegend=showLegend,
-                                line=dict(width=0.5, color=mainColors[colorPosition])
-                            ),
-                            position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
-                            position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
-                        )
-                        
-                        #add memory that we now used this color option within the faceting
-                        facetMemory.append(clr)
-
-                        
-                else:
+            #Add figure, based on whether we're breaking down by color                
+            if 'color' in chartDefinition:
+                for colorPosition, (clr, temp3) in enumerate(facetColorData[position]):
+                    
+                    #set parameters we need later
+                    showLegend = False if clr in facetMemory else True
+                    
+                    #add trace
                     fig.add_trace(go.Scatter(
-                            x=temp2[chartDefinition['axis']],
-                            y=temp2[chartDefinition['metrics'][0]['name']],
+                            x=temp3[chartDefinition['axis']],
+                            y=temp3[chartDefinition['metrics'][0]['name']],
                             hoverinfo='x+y',
                             mode='lines',
+                            stackgroup='one',
                             fill='tonexty',
-                            name=facet,
-                            line=dict(width=0.5)
+                            name=clr,
+                            legendgroup=clr,
+                            showlegend=showLegend,
+                            line=dict(width=0.5, color=mainColors[colorPosition])
                         ),
                         position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
                         position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
                     )
-            
-            #change aesthetics
-            fig.update_layout({
-                'plot_bgcolor': 'rgba(0, 0, 0, 0)',
-                'paper_bgcolor': 'rgba(0, 0, 0, 0)',
-            })
-            
-            
-            ### Handle all options
-            if 'options' in chartDefinition:
-
-                ### Grid lines
-                if 'horizontal-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['horizontal-grid-lines'] == 'true':
-                        fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
-
-                if 'vertical-grid-lines' in chartDefinition['options']:
-                    if chartDefinition['options']['vertical-grid-lines'] == 'true':
-                        fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
-
-            #update legend
-            fig.update_layout(legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                xanchor="center",
-                x=.5,
-                y=-.3,
-                title=""
-            ))
-
-            #X axis title
-            if 'x-axis-title' in chartDefinition:
-                if chartDefinition['facet-direction'] == 'rows':
-                    fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=len(facets), col=1)
-                else:
-                    for i in range(len(facets)):
-                        fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=1, col=i+1)
-
-            #Y axis title
-            if 'y-axis-title' in chartDefinition:
-                if chartDefinition['facet-direction'] == 'rows':
-                    for i in range(len(facets)):
-                        fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=i+1, col=1)
-                else:
-                    fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=1, col=1)
-
-            
-        #Global options to handle outside of individual chart sections
-        if 'print-chart' in chartDefinition:
-            if chartDefinition['print-chart'] == 'true':
-                fig.show()
-
-        #save figure
-        if chartDefinition['type'] != 'table':
+                    
+                    #add memory that we now used this color option within the faceting
+                    facetMemory.add(clr)
 
-            #check if the folder for charts exists. If not, create it
-            if not os.path.exists('charts'):
-                os.makedirs('charts')
-            
-            #setup params
-            filename = 'charts/chart' + str(z) + '.png'
-            
-            #save out the files
-            if chartDefinition['type'] == 'barsubplot':
-                fig.write_image(filename, scale=2, width=1.1, height=1)
-            elif chartDefinition['name'] == 'Lead Quality - Lead Status Over Time':
-                fig.update_layout(margin=dict(r=0))
-                fig.write_image(filename, scale=2, width=2, height=1.7)
+                    
             else:
-                fig.write_image(filename, scale=2)
-
+                fig.add_trace(go.Scatter(
+                        x=temp2[chartDefinition['axis']],
+                        y=temp2[chartDefinition['metrics'][0]['name']],
+                        hoverinfo='x+y',
+                        mode='lines',
+                        fill='tonexty',
+                        name=facet,
+                        line=dict(width=0.5)
+                    ),
+                    position + 1 if chartDefinition['facet-direction'] == 'rows' else 1,
+                    position + 1 if chartDefinition['facet-direction'] == 'columns' else 1
+                )
+        
+        #change aesthetics
+        fig.update_layout({
+            'plot_bgcolor': 'rgba(0, 0, 0, 0)',
+            'paper_bgcolor': 'rgba(0, 0, 0, 0)',
+        })
+        
+        
+        ### Handle all options
+        if 'options' in chartDefinition:
+
+            ### Grid lines
+            if 'horizontal-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['horizontal-grid-lines'] == 'true':
+                    fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+
+            if 'vertical-grid-lines' in chartDefinition['options']:
+                if chartDefinition['options']['vertical-grid-lines'] == 'true':
+                    fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#ebebeb')
+
+        #update legend
+        fig.update_layout(legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            xanchor="center",
+            x=.5,
+            y=-.3,
+            title=""
+        ))
+
+        #X axis title
+        if 'x-axis-title' in chartDefinition:
+            if chartDefinition['facet-direction'] == 'rows':
+                fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=len(facets), col=1)
+            else:
+                for i in range(len(facets)):
+                    fig.update_xaxes(title_text=chartDefinition['x-axis-title'], row=1, col=i+1)
 
-        #####################
-        ### Create Slide and insert image + info
-        #####################
+        #Y axis title
+        if 'y-axis-title' in chartDefinition:
+            if chartDefinition['facet-direction'] == 'rows':
+                for i in range(len(facets)):
+                    fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=i+1, col=1)
+            else:
+                fig.update_yaxes(title_text=chartDefinition['y-axis-title'], row=1, col=1)
+
+    return fig
+
+#image settings in a chart definition, and the export option each one becomes
+_imageOptions = {
+    'format': ('format', str),
+    'scale': ('scale', float),
+    'colors': ('colors', int),
+    'quality': ('quality', int),
+    'max-bytes': ('maxBytes', int)
+}
+
+#plotly's image size when none is given
+_defaultWidth = 700
+_defaultHeight = 500
+
+#function to get the image export settings for a chart
+def _exportOptions(chartDefinition):
+    if chartDefinition['type'] == 'barsubplot':
+        options = {'width': 1.1, 'height': 1}
+    elif chartDefinition['name'] == 'Lead Quality - Lead Status Over Time':
+        options = {'width': 2, 'height': 1.7}
+    else:
+        options = {}
+
+    #image settings, where any dpi has already been turned into a scale
+    if 'image-settings' in chartDefinition:
+        settings = chartDefinition['image-settings']
+        for key, (option, convert) in _imageOptions.items():
+            if key in settings:
+                options[option] = convert(settings[key])
+        if 'quantize' in settings:
+            options['quantize'] = settings['quantize'] == 'true'
+
+    return options
+
+#function to get the size of the placeholder a chart goes into, from its slide layout
+def _placeholderSize(chartDefinition):
+    layout = prs.slide_layouts[chartDefinition['item-index']['slide']]
+    placeholder = layout.placeholders.get(idx=chartDefinition['item-index']['chart'])
+    if placeholder is None:
+        raise ValueError("Slide layout " + str(chartDefinition['item-index']['slide']) + " has no placeholder " + str(chartDefinition['item-index']['chart']))
+    return placeholder.width, placeholder.height
+
+#function to check the image settings given for a whole deck, before any chart is built
+def _checkImageSettings(imageSettings):
+    problems = [] if imageSettings is None else _imageSettingsProblems(imageSettings)
+    if problems:
+        raise ValueError("Found problems with imageSettings: " + '; '.join(problems))
+
+#function to merge the image settings for the deck into a chart's own settings
+#a dpi is turned into the scale that gives that many pixels per inch in the chart's placeholder
+def _resolveImageSettings(chartDefinition, imageSettings):
+    if imageSettings is None and 'image-settings' not in chartDefinition:
+        return chartDefinition
+
+    settings = dict(imageSettings) if imageSettings is not None else {}
+    settings.update(chartDefinition['image-settings'] if 'image-settings' in chartDefinition else {})
+
+    if 'dpi' in settings:
+        dpi = float(settings.pop('dpi'))
+        if chartDefinition['type'] != 'table' and 'scale' not in settings:
+            width, height = _placeholderSize(chartDefinition)
+            options = _exportOptions(chartDefinition)
+            settings['scale'] = round(max(width / 914400 * dpi / options.get('width', _defaultWidth),
+                                          height / 914400 * dpi / options.get('height', _defaultHeight)), 3)
+
+    return dict(chartDefinition, **{'image-settings': settings})
+
+#how many points per inch across a native chart are worth drawing, twice the screen resolution like the default image scale
+_nativeDpi = 192
+
+#function to work out how many points a line chart can show across its placeholder, and how to thin it out to that many
+#images are as many pixels across as they are exported at, which fills the placeholder. Native charts use _nativeDpi
+#charts can set 'decimate' themselves, or 'decimate-points' to give the number of points
+def _resolveDecimation(chartDefinition, decimate):
+    method = chartDefinition['decimate'] if 'decimate' in chartDefinition else decimate
+    if method is None or method == 'false' or chartDefinition['type'] not in _decimateTypes:
+        return chartDefinition
+
+    if 'decimate-points' in chartDefinition:
+        points = int(chartDefinition['decimate-points'])
+    elif _isNative(chartDefinition):
+        width, height = _placeholderSize(chartDefinition)
+        points = int(width / 914400 * _nativeDpi)
+    else:
+        options = _exportOptions(chartDefinition)
+        points = int(options.get('width', _defaultWidth) * options.get('scale', 2))
+
+    return dict(chartDefinition, **{'decimate': method, 'decimate-points': points})
+
+#function to check whether a chart is drawn as a native powerpoint chart instead of an image
+def _isNative(chartDefinition):
+    return chartDefinition['type'] != 'table' and 'native' in chartDefinition and chartDefinition['native'] == 'true'
+
+#function to check whether a chart should be shown as well as saved
+def _showChart(chartDefinition):
+    return 'print-chart' in chartDefinition and chartDefinition['print-chart'] == 'true'
+
+#function to create the figure for a chart, timing it if the chart is being profiled
+def _profiledFigure(chartDefinition, temp, mainColors, profile):
+    start = time.perf_counter()
+    fig = _createFigure(chartDefinition, temp, mainColors)
+    if profile is not None:
+        profile['seconds']['figure'] += time.perf_counter() - start
+        profile['traces'] = len(fig.data)
+    return fig
+
+#function to filter, group, and create the figure for a single chart
+#the figure is skipped if the finished image is already in the render cache
+#if the data was already prepared, it is passed in as (data, source)
+#if the chart is being profiled, its profile is filled in and handed back with the render
+def _buildChart(chartDefinition, mainColors, renderCache, aggregationCache, planGroup=None, prepared=None, profile=None):
+
+    #swap the data back in if it was shipped to the worker separately
+    if 'data' in chartDefinition and type(chartDefinition['data']) == _SharedData:
+        chartDefinition = dict(chartDefinition)
+        chartDefinition['data'] = _workerData[chartDefinition['data'].key]
+
+    if profile is not None:
+        memoryStart = _memoryStart()
+
+    if prepared is None:
+        prepared = _chartData(chartDefinition, aggregationCache, planGroup, profile)
+    temp, aggregation = prepared
+    if profile is not None:
+        profile['rows']['aggregated'] = len(temp) if isinstance(temp, pd.DataFrame) else None
+
+    #thin out dense lines to the points the chart can actually show
+    if 'decimate-points' in chartDefinition:
+        start = time.perf_counter()
+        temp = _decimateChart(chartDefinition, temp)
+        if profile is not None:
+            profile['seconds']['decimate'] += time.perf_counter() - start
+
+    render = {'data': temp, 'figure': None, 'image': None, 'cache': None, 'aggregation': aggregation}
+
+    #tables don't need a figure, just the data
+    if chartDefinition['type'] == 'table':
+        pass
+
+    #native charts are built straight from the data when the slide goes in, so there is nothing to export
+    elif _isNative(chartDefinition):
+        if _showChart(chartDefinition):
+            render['figure'] = _profiledFigure(chartDefinition, render['data'], mainColors, profile)
+
+    else:
+        render['options'] = _exportOptions(chartDefinition)
+
+        #check the cache before doing any drawing
+        if renderCache is not None:
+            render['cache-key'] = _renderKey(chartDefinition, render['data'], mainColors, render['options'])
+            render['image'] = renderCache.get(render['cache-key'])
+            render['cache'] = 'miss' if render['image'] is None else 'hit'
+
+        if render['image'] is None or _showChart(chartDefinition):
+            render['figure'] = _profiledFigure(chartDefinition, render['data'], mainColors, profile)
+            if chartDefinition['name'] == 'Lead Quality - Lead Status Over Time':
+                render['figure'].update_layout(margin=dict(r=0))
+
+    if profile is not None:
+        profile['aggregation'] = aggregation
+        profile['rows']['drawn'] = len(temp) if isinstance(temp, pd.DataFrame) else None
+        profile['peak-memory'] = _memoryPeak(memoryStart)
+        render['profile'] = profile
+    return render
+
+#function to finish a chart once its image has been exported, in the given number of seconds
+def _finishRender(chartDefinition, render, image, renderCache, seconds=0.0):
+    if 'profile' in render:
+        render['profile']['seconds']['export'] += seconds
+
+    if image is not None:
+        render['image'] = image
+        if renderCache is not None:
+            renderCache.put(render['cache-key'], image)
+
+    #only hold on to the figure if we need to show it
+    if not _showChart(chartDefinition):
+        render['figure'] = None
+    return render
+
+#function to build and export the chart images for a group of charts that share their data
+#this is the unit of work handed to worker processes when rendering in parallel
+def _renderCharts(chartDefinitions, preparedData, mainColors, profiles):
+    renders = []
+    for chartDefinition, prepared, profile in zip(chartDefinitions, preparedData, profiles):
+        render = _buildChart(chartDefinition, mainColors, _workerCache, _workerAggregations, prepared=prepared, profile=profile)
+
+        image = None
+        start = time.perf_counter()
+        if render['figure'] is not None and render['image'] is None and not _isNative(chartDefinition):
+            image = _workerExporter.export(render['figure'], **render['options'])
+
+        renders.append(_finishRender(chartDefinition, render, image, _workerCache, time.perf_counter() - start))
+    return renders
+
+#function to build every chart in turn, as jobs for an image export session
+#charts found in the render cache go through without a figure, so nothing is exported for them
+def _buildCharts(charts, plan, prepared, mainColors, renderCache, aggregationCache, profiles):
+    for chartDefinition, planGroup, preparedData, profile in zip(charts, plan, prepared, profiles):
+        render = _buildChart(chartDefinition, mainColors, renderCache, aggregationCache, planGroup, preparedData, profile)
+        fig = render['figure'] if render['image'] is None and not _isNative(chartDefinition) else None
+        yield (chartDefinition, render), fig, render.get('options')
+
+#function to get the list of slide ids in the presentation
+#prs.slides renumbers every slide each time it is used, which adds up over a big deck, so slides are reached through this instead
+def _slideIdList():
+    return prs._element.get_or_add_sldIdLst()
+
+#function to create a slide and fill in its title, description, and subtitle
+#the title can be given to use instead of the chart name, like on the later pages of a table
+def _newSlide(chartDefinition, title=None):
+
+    #create slide
+    layout = prs.slide_layouts[chartDefinition['item-index']['slide']]
+    slide = Slides(_slideIdList(), prs).add_slide(layout)
+
+    #set title and subtitle
+    if 'name' in chartDefinition:
+        slide.placeholders[chartDefinition['item-index']['title']].text = chartDefinition['name'] if title is None else title
+
+    #insert placeholder if desired, otherwise delete
+    if "description" in chartDefinition:
+        slide.placeholders[chartDefinition['item-index']['description']].text = chartDefinition['description']
+
+    #insert subtitle if present in dictionary
+    if "subtitle" in chartDefinition:
+        slide.placeholders[chartDefinition['item-index']['subtitle']].text = chartDefinition['subtitle']
+
+    return slide
+
+#function to center a table in the middle of the slide
+def _centerTable(slide, chartDefinition):
+
+    #get base variables
+    slideHeight = 5143500
+    heightOffset = chartDefinition['top_offset'] if 'top_offset' in chartDefinition else 0
+    titleHeight = slide.placeholders[chartDefinition['item-index']['title']].height if 'title' in chartDefinition['item-index'] else 0
+    tableHeight = slide.placeholders[chartDefinition['item-index']['chart']].height
+
+    #calculate where the table needs to start
+    middleOfSlide = int(slideHeight / 2) + int(titleHeight / 2)
+    halfTableHeight = int(tableHeight / 2)
+    idealTableStart = int(middleOfSlide - halfTableHeight + heightOffset)
+
+    #set the top of the table
+    slide.placeholders[chartDefinition['item-index']['chart']].top = idealTableStart
+
+#function to insert a table across as many slides as it takes, one page of rows at a time
+#only one page of the table is formatted and built at once, however many rows there are
+#when streaming, each page is written out as soon as it is done
+def _insertTablePages(chartDefinition, temp, deckStream=None, profile=None):
+    pagination = chartDefinition['pagination']
+    rowsPerSlide = int(pagination['rows-per-slide']) if 'rows-per-slide' in pagination else 15
+    repeatHeader = pagination['repeat-header'] == 'true' if 'repeat-header' in pagination else True
+    continuationTitle = pagination['continuation-title'] if 'continuation-title' in pagination else '{name} (cont.)'
+    fillData = chartDefinition['fill_color'] if 'fill_color' in chartDefinition else None
 
-        #create slide
-        layout = prs.slide_layouts[chartDefinition['item-index']['slide']]
-        slide = prs.slides.add_slide(layout)
+    #validate input
+    if rowsPerSlide < 1:
+        raise ValueError("rows-per-slide must be at least 1")
+
+    offset = 0
+    for page, rows in enumerate(_tablePages(temp, rowsPerSlide)):
+        title = None
+        if page > 0:
+            title = continuationTitle.format(name=chartDefinition.get('name', ''), page=page + 1)
+        slide = _newSlide(chartDefinition, title)
+
+        header = list(rows.columns) if page == 0 or repeatHeader else None
+        fills = None if fillData is None else fillData.iloc[offset:offset + len(rows)]
+        placeholder = slide.placeholders[chartDefinition['item-index']['chart']]
+        start = time.perf_counter()
+        _insertTable(placeholder, header, _tableText(rows, chartDefinition), chartDefinition, fills)
+        if profile is not None:
+            profile['seconds']['table'] += time.perf_counter() - start
+        _centerTable(slide, chartDefinition)
+        offset += len(rows)
+
+        if deckStream is not None:
+            deckStream.writeSlides([_slideIdList()[-1].id])
+
+#function to create a slide and insert the chart image, native chart, or table + info
+#if the chart is being profiled, the time spent formatting and filling in tables is added to its profile
+def _insertSlide(chartDefinition, temp, image, mainColors, deckStream=None, profile=None):
+
+    #large tables are split over several slides
+    if chartDefinition['type'] == 'table' and 'pagination' in chartDefinition:
+        _insertTablePages(chartDefinition, temp, deckStream, profile)
+        return
+
+    slide = _newSlide(chartDefinition)
+
+    #if we are inserting a native chart
+    if _isNative(chartDefinition):
+        _insertNativeChart(slide, slide.placeholders[chartDefinition['item-index']['chart']], chartDefinition, temp, mainColors)
+
+    #if we are inserting a plotly image
+    elif chartDefinition['type'] != 'table':
+
+        #insert image straight from memory
+        picture = slide.placeholders[chartDefinition['item-index']['chart']].insert_picture(io.BytesIO(image))
 
-        #set title and subtitle
-        if 'name' in chartDefinition:
-            slide.placeholders[chartDefinition['item-index']['title']].text = chartDefinition['name']
+        
+    else:
+        #a table given in chunks all goes on the one slide
+        if not isinstance(temp, pd.DataFrame):
+            temp = pd.concat(list(temp))
+
+        #insert table, building all of its rows and formatting in one pass
+        placeholder = slide.placeholders[chartDefinition['item-index']['chart']]
+        fillData = chartDefinition['fill_color'] if 'fill_color' in chartDefinition else None
+        start = time.perf_counter()
+        _insertTable(placeholder, list(temp.columns), _tableText(temp, chartDefinition), chartDefinition, fillData)
+        if profile is not None:
+            profile['seconds']['table'] += time.perf_counter() - start
+
+        ### Now center the table in the middle of the slide
+        _centerTable(slide, chartDefinition)
+
+
+#####################
+### Parallel rendering
+#####################
+
+#reference to a dataframe shipped once to each worker instead of once per chart
+class _SharedData:
+    def __init__(self, key):
+        self.key = key
+
+_workerData = {}
+_workerExporter = None
+_workerCache = None
+_workerAggregations = None
+
+def _initWorker(frames, exportFormat, exportScale, cacheSettings, traceMemory=False):
+    global _workerData, _workerExporter, _workerCache, _workerAggregations
+    if traceMemory:
+        tracemalloc.start()
+    _workerData = frames
+    _workerAggregations = _AggregationCache()
+    _workerExporter = ImageExporter(exportFormat, exportScale)
+    if cacheSettings is not None:
+        _workerCache = RenderCache(*cacheSettings)
+
+#function to swap each dataframe for a reference so it is only sent to each worker once
+#charts with their data already prepared don't need their dataframe at all
+def _shareData(charts, prepared):
+    frames = {}
+    sharedCharts = []
+    for chartDefinition, preparedData in zip(charts, prepared):
+        if 'data' in chartDefinition:
+            chartDefinition = dict(chartDefinition)
+            if preparedData is None:
+                key = id(chartDefinition['data'])
+                frames[key] = chartDefinition['data']
+                chartDefinition['data'] = _SharedData(key)
+            else:
+                chartDefinition['data'] = None
+        sharedCharts.append(chartDefinition)
+    return frames, sharedCharts
+
+#function to split charts into tasks for worker processes
+#charts that need the same data go in the same task, so the data is only prepared once
+#charts with their data already prepared each get their own task, and charts built locally get none
+def _groupTasks(charts, prepared, local):
+    tasks = {}
+    for z in range(len(charts)):
+        if z in local:
+            continue
+        elif prepared[z] is None:
+            key = _aggregationKey(charts[z], _groupList(charts[z]), _metricDict(charts[z]))
+        else:
+            key = z
+        tasks.setdefault(key, []).append(z)
+    return list(tasks.values())
+
+#function to put the results of tasks back into chart order, as soon as each chart is ready
+#local holds the charts built in this process, which are ready from the start
+def _inOrder(tasks, results, local):
+    pending = dict(local)
+    nextChart = 0
+    results = zip(tasks, results)
+    while True:
+        while nextChart in pending:
+            yield pending.pop(nextChart)
+            nextChart += 1
+
+        task, renders = next(results, (None, None))
+        if task is None:
+            return
+        pending.update(zip(task, renders))
+
+#function to insert slides as rendered charts come back, in chart order
+#returns the ids of the slides added for each chart
+#when streaming, each chart's slides are written out as soon as they are done
+#profiled charts have their profile finished, added to the report, and handed to onChart once their slides are in
+def _insertSlides(charts, results, mainColors, imageFolder, renderCache, report, deckStream=None, onChart=None):
+    slides = []
+    for z, render in enumerate(results):
+        if render['figure'] is not None:
+            render['figure'].show()
+
+        #keep count of how often data was reused between charts
+        if render['aggregation'] == 'hit':
+            report['aggregation-cache']['hits'] += 1
+        elif render['aggregation'] == 'rollup':
+            report['query-plan']['rollups'] += 1
+        else:
+            report['aggregation-cache']['misses'] += 1
+
+        #keep count of how the render cache did
+        if render['cache'] == 'hit':
+            renderCache.hits += 1
+        elif render['cache'] == 'miss':
+            renderCache.misses += 1
+
+        #optionally write the image out as well, for debugging
+        if imageFolder is not None and render['image'] is not None:
+            extension = '.jpg' if render['image'][:3] == b'\xff\xd8\xff' else '.png'
+            with open(os.path.join(imageFolder, 'chart' + str(z) + extension), 'wb') as f:
+                f.write(render['image'])
+
+        start = time.perf_counter()
+        before = len(_slideIdList())
+        _insertSlide(charts[z], render['data'], render['image'], mainColors, deckStream, render.get('profile'))
+        slides.append([sldId.id for sldId in _slideIdList()[before:]])
+        if deckStream is not None:
+            deckStream.writeSlides(slides[-1])
+
+        if 'profile' in render:
+            profile = render['profile']
+            profile['seconds']['insert'] += time.perf_counter() - start
+            profile['image-bytes'] = None if render['image'] is None else len(render['image'])
+            report['charts'].append(profile)
+            if onChart is not None:
+                onChart(profile)
+
+    return slides
+
+#####################
+### Incremental builds
+#####################
+
+#manifest of what went into each chart's slides, kept next to the output for incremental builds
+_manifestFile = 'output.manifest.json'
+
+#function to pick up the last build, if there is one to build on
+#the last output takes the place of the template, and the charts in its manifest are returned
+#returns None if there is no manifest, or the output has changed since it was written
+def _loadPrevious(fileName):
+    global prs
+    try:
+        with open(_manifestFile) as f:
+            manifest = json.load(f)
+        stat = os.stat(fileName)
+    except (FileNotFoundError, ValueError):
+        return None
 
-        #insert placeholder if desired, otherwise delete
-        if "description" in chartDefinition:
-            slide.placeholders[chartDefinition['item-index']['description']].text = chartDefinition['description']
+    if manifest.get('version') != 1 or manifest.get('output') != [stat.st_size, stat.st_mtime]:
+        return None
 
-        #insert subtitle if present in dictionary
-        if "subtitle" in chartDefinition:
-            slide.placeholders[chartDefinition['item-index']['subtitle']].text = chartDefinition['subtitle']
+    from pptx import Presentation
+    prs = Presentation(fileName)
+    return manifest['charts']
+
+#function to fingerprint a chart's slides from its definition and data
+#tables read in chunks can't be fingerprinted without reading them, so they are always rebuilt
+def _slideFingerprint(chartDefinition, temp, mainColors):
+    if not isinstance(temp, pd.DataFrame):
+        return None
+    options = {} if chartDefinition['type'] == 'table' else _exportOptions(chartDefinition)
+    return _slideKey(chartDefinition, temp, mainColors, options)
+
+#function to find the charts that need their slides built again
+#a chart is rebuilt if it is new, its fingerprint changed, or any of its slides have gone missing
+def _changedCharts(previous, fingerprints):
+    if previous is None:
+        return list(range(len(fingerprints)))
+
+    existing = set(sldId.id for sldId in _slideIdList())
+    changed = []
+    for z, fingerprint in enumerate(fingerprints):
+        if (fingerprint is None or z >= len(previous) or previous[z]['fingerprint'] != fingerprint
+                or not all(slideId in existing for slideId in previous[z]['slides'])):
+            changed.append(z)
+    return changed
+
+#function to put rebuilt slides where the old ones were, and remove slides that aren't needed anymore
+#slides that didn't come from a chart, like those in the template, stay where they are
+def _arrangeSlides(previous, slides):
+    sldIdLst = _slideIdList()
+    elements = {sldId.id: sldId for sldId in sldIdLst}
+
+    owners = {}
+    for z, entry in enumerate(previous):
+        for slideId in entry['slides']:
+            owners[slideId] = z
+    added = set(slideId for chartSlides in slides for slideId in chartSlides if slideId not in owners)
+
+    #each chart's slides go where its first old slide was, and new charts go on the end
+    order = []
+    placed = set()
+    for sldId in sldIdLst:
+        z = owners.get(sldId.id)
+        if z is None:
+            if sldId.id not in added:
+                order.append(sldId.id)
+        elif z < len(slides) and z not in placed:
+            order.extend(slides[z])
+            placed.add(z)
+    for z in range(len(slides)):
+        if z not in placed:
+            order.extend(slides[z])
+
+    #remove the old slides, then put the rest back in order
+    keep = set(order)
+    for sldId in list(sldIdLst):
+        if sldId.id not in keep:
+            prs.part.drop_rel(sldId.rId)
+        sldIdLst.remove(sldId)
+    for slideId in order:
+        sldIdLst.append(elements[slideId])
+
+#function to write the manifest for a build, once its output has been saved
+def _saveManifest(fileName, fingerprints, slides):
+    stat = os.stat(fileName)
+    manifest = {
+        'version': 1,
+        'output': [stat.st_size, stat.st_mtime],
+        'charts': [{'fingerprint': fingerprint, 'slides': chartSlides} for fingerprint, chartSlides in zip(fingerprints, slides)]
+    }
+    with open(_manifestFile, 'w') as f:
+        json.dump(manifest, f)
 
-        #if we are inserting a plotly image
-        if chartDefinition['type'] != 'table':
+#master function for creating slides
+def createSlides(charts, workers=None, exporter=None, imageFolder=None, renderCache=None, native=False, imageSettings=None, incremental=False, stream=False, profile=False, onChart=None, decimate=None):
 
-            #insert image
-            picture = slide.placeholders[chartDefinition['item-index']['chart']].insert_picture(filename)
+    #validate input
+    if workers is not None and (type(workers) != int or workers < 1):
+        raise ValueError("workers must be a positive integer")
+    if stream and incremental:
+        raise ValueError("stream and incremental builds can't be used together")
+    if onChart is not None and not callable(onChart):
+        raise ValueError("onChart must be a function")
+    if decimate is not None and decimate not in _decimateMethods:
+        raise ValueError("decimate must be one of " + ', '.join(_decimateMethods))
+    _checkImageSettings(imageSettings)
+
+    return _createSlides(charts, "output.pptx", workers=workers, exporter=exporter, imageFolder=imageFolder, renderCache=renderCache,
+                         native=native, imageSettings=imageSettings, incremental=incremental, stream=stream, profile=profile, onChart=onChart, decimate=decimate)
+
+#function to check the charts against the current presentation, and fill in the settings for the deck
+#returns the spec for each chart, and the chart definitions as they are built
+def _resolveCharts(charts, native, imageSettings, decimate):
+
+    #check every chart before doing any work, so a mistake in any chart fails the build straight away
+    specs = compileCharts(charts)
+
+    #image settings for the deck and for each chart, worked out here where the template is loaded
+    charts = [_resolveImageSettings(spec.definition, imageSettings) for spec in specs]
+
+    #draw every chart as a native powerpoint chart, unless a chart says otherwise
+    if native:
+        charts = [dict(chartDefinition, native=chartDefinition['native'] if 'native' in chartDefinition else 'true') for chartDefinition in charts]
+
+    #how far to thin out dense line charts, once it's known how each chart is drawn
+    charts = [_resolveDecimation(chartDefinition, decimate) for chartDefinition in charts]
+    return specs, charts
+
+#function to build the slides for charts into the current presentation and save it to fileName
+#prepared can hold the filtered and grouped data for each chart, worked out ahead of time, in which case the data isn't planned or grouped again
+def _createSlides(charts, fileName, prepared=None, workers=None, exporter=None, imageFolder=None, renderCache=None, native=False, imageSettings=None, incremental=False, stream=False, profile=False, onChart=None, decimate=None):
+    global prs
+    specs, charts = _resolveCharts(charts, native, imageSettings, decimate)
+
+    mainColors = _getColors()
+
+    #chart images are kept in memory. Only write them out if a folder was given
+    if imageFolder is not None and not os.path.exists(imageFolder):
+        os.makedirs(imageFolder)
+
+    #plan how each chart gets its data before doing any work
+    if prepared is None:
+        plan = _planCharts(charts, [spec.groupList for spec in specs], [spec.metricDict for spec in specs])
+        prepared = [None] * len(charts)
+    else:
+        plan = [None] * len(charts)
+    aggregationCache = _AggregationCache()
+
+    #statistics for this build, handed back once it is done
+    report = {
+        'aggregation-cache': {'hits': 0, 'misses': 0},
+        'query-plan': {'groups': len(set(id(group) for group in plan if group is not None)), 'rollups': 0}
+    }
+
+    #profile each chart if asked, with the time each step took, how much data it had, and the most memory it used
+    profiling = profile or onChart is not None
+    profiles = [_chartProfile(z, chartDefinition) if profiling else None for z, chartDefinition in enumerate(charts)]
+    if profiling:
+        report['charts'] = []
+
+    #in incremental mode, build on the last output and only rebuild the charts whose slides would change
+    if incremental:
+        previous = _loadPrevious(fileName)
+        prepared = [_chartData(chartDefinition, aggregationCache, planGroup, chartProfile) for chartDefinition, planGroup, chartProfile in zip(charts, plan, profiles)]
+        fingerprints = [_slideFingerprint(chartDefinition, temp, mainColors) for chartDefinition, (temp, source) in zip(charts, prepared)]
+        changed = _changedCharts(previous, fingerprints)
+        report['incremental'] = {'rebuilt': len(changed), 'kept': len(charts) - len(changed)}
+
+        allCharts = charts
+        charts = [allCharts[z] for z in changed]
+        plan = [plan[z] for z in changed]
+        prepared = [prepared[z] for z in changed]
+        profiles = [profiles[z] for z in changed]
+
+    #use one export session for the whole build, unless one was handed to us
+    ownsExporter = exporter is None
+    if ownsExporter:
+        exporter = ImageExporter()
+
+    #number the slides once, so new slides carry on from the last one
+    prs.part.rename_slide_parts([sldId.rId for sldId in _slideIdList()])
+
+    #when streaming, slides are written to the output as they are finished instead of all at the end
+    deckStream = _DeckStream(prs, fileName) if stream else None
+
+    #memory is only traced while profiling, since tracing slows everything else down
+    traceMemory = profiling and not tracemalloc.is_tracing()
+    if traceMemory:
+        tracemalloc.start()
 
-            
+    try:
+        #render charts one by one, or hand them out to a pool of worker processes
+        #slides are always inserted in the original order of the charts
+        if workers is None or workers == 1:
+            jobs = _buildCharts(charts, plan, prepared, mainColors, renderCache, aggregationCache, profiles)
+            #while profiling, each chart is built, exported and put in before the next one starts, so their numbers don't overlap
+            results = (_finishRender(chartDefinition, render, image, renderCache, seconds) for (chartDefinition, render), image, seconds in exporter.iterExport(jobs, timed=True, pipelined=not profiling))
+            slides = _insertSlides(charts, results, mainColors, imageFolder, renderCache, report, deckStream, onChart)
         else:
-            #insert table
-            shape = slide.placeholders[chartDefinition['item-index']['chart']].insert_table(rows=len(temp)+1, cols=len(temp.columns))
-            table = shape.table
-            
-            #iterate through every row and column and place the value that is present in the df
-            #for loop for the rows
-            for i in range(len(temp) + 1):
-                #for each row, get the value of the column
-                for i2 in range(len(temp.columns)):
-                    cell = table.cell(i,i2)
-                    #if we're dealing with the header
-                    if i == 0:
-                        cell.text = temp.columns[i2]
-                    else:
-                        text = temp.iloc[i-1, i2]
-                        textFormat = chartDefinition['column_formats'][i2]
-
-                        #catch Nan values for numeric based values
-                        if 'float' in str(type(text)) or 'int' in str(type(text)):
-                            if math.isnan(text):
-                                cell.text = ''
-                                continue
-                                
-                        #catch Nan values for string based values
-                        if 'str' in str(type(float)) or 'NoneType' in str(type(text)):
-                            if text is None:
-                                cell.text = ''
-                                continue
-                        
-                        if textFormat == 'number':
-                            cell.text = str(int(text))
-                        elif textFormat == 'money':
-                            cell.text = "$" + str(int(text))
-                        elif textFormat == 'percent':
-                            cell.text = str(int(text * 100)) + "%"
-                        elif textFormat == 'twoDigitNum':
-                            cell.text = str(round(text, 2))
-                        elif textFormat == 'date':
-                            cell.text = text.strftime('%m/%d/%Y')
-                        else:
-                            cell.text = str(text)
-
-                        
-            #central formatting for every cell
-            for i in range(len(temp) + 1):
-                for i2 in range(len(temp.columns)):
-                    #Remove the border for each cell
-                    cell = table.cell(i,i2)
-                    cell = _set_cell_border(cell)
-                    
-                    #format color
-                    cell = table.cell(i,i2)
-                    paragraph = cell.text_frame.paragraphs[0]
-                    colorString = chartDefinition['text_color']
-                    color = RGBColor.from_string(colorString.replace('#',''))
-                    paragraph.font.color.rgb = color
-
-            #If we need to change the header fill
-            if 'header_fill_color' in chartDefinition:
-                for i in range(len(temp.columns)):
-                    cell = table.cell(0,i)
-                    cell.fill.solid()
-                    colorString = chartDefinition['header_fill_color']
-                    color = RGBColor.from_string(colorString.replace('#',''))
-                    cell.fill.fore_color.rgb = color
-                    
-            #If we need to change the header text color
-            if 'header_text_color' in chartDefinition:
-                for i in range(len(temp.columns)):
-                    cell = table.cell(0,i)
-                    colorString = chartDefinition['header_text_color']
-                    color = RGBColor.from_string(colorString.replace('#',''))
-                    paragraph = cell.text_frame.paragraphs[0]
-                    paragraph.font.color.rgb = color
-
-            #If we need to change the font size of the header
-            if 'header_font_size' in chartDefinition:
-                for i in range(len(temp.columns)):
-                    cell = table.cell(0,i)
-                    paragraph = cell.text_frame.paragraphs[0]
-                    paragraph.font.size = Pt(int(chartDefinition['header_font_size']))
-
-            #If we need to change the fill color for each cell
-            if 'fill_color' in chartDefinition:
-                #get the data for the fill coloring
-                fillData = chartDefinition['fill_color']
-                fillData = fillData.replace("#", '', regex=True)
-                
-                #loop through each cell
-                for i in range(len(temp) + 1):
-                    for i2 in range(len(temp.columns)):
-                        #skip the header
-                        if i != 0:
-                            cell = table.cell(i,i2)
-                            cell.fill.solid()
-                            color = RGBColor.from_string(fillData.iloc[i-1, i2])
-                            cell.fill.fore_color.rgb = color
-
-            #if we need to change the font size for the main cells
-            if 'text_font_size' in chartDefinition:
-                #loop through each cell
-                for i in range(len(temp) + 1):
-                    for i2 in range(len(temp.columns)):
-                        #skip the header
-                        if i != 0:
-                            cell = table.cell(i, i2)
-                            paragraph = cell.text_frame.paragraphs[0]
-                            paragraph.font.size = Pt(int(chartDefinition['text_font_size']))
-
-            ### Now center the table in the middle of the slide
-            #get base variables
-            slideHeight = 5143500
-            heightOffset = chartDefinition['top_offset'] if 'top_offset' in chartDefinition else 0
-            titleHeight = slide.placeholders[chartDefinition['item-index']['title']].height if 'title' in chartDefinition['item-index'] else 0
-            tableHeight = slide.placeholders[chartDefinition['item-index']['chart']].height
-
-            #calculate where the table needs to start
-            middleOfSlide = int(slideHeight / 2) + int(titleHeight / 2)
-            halfTableHeight = int(tableHeight / 2)
-            idealTableStart = int(middleOfSlide - halfTableHeight + heightOffset)
-
-            #set the top of the table
-            slide.placeholders[chartDefinition['item-index']['chart']].top = idealTableStart
+            #charts that are rolled up from a shared grouping get their data here, so the raw data is scanned once
+            #so do charts with data given in chunks, which can't be sent to a worker, and data in other engines,
+            #which is queried there and only the small result is sent
+            #everything else is prepared in the workers
+            prepared = [preparedData if preparedData is not None or (planGroup is None and _isFrame(chartDefinition)) else _chartData(chartDefinition, aggregationCache, planGroup, chartProfile) for chartDefinition, planGroup, preparedData, chartProfile in zip(charts, plan, prepared, profiles)]
+
+            #tables given in chunks only need their chunks read as the slides go in, so they stay in this process
+            local = {z: _buildChart(charts[z], mainColors, renderCache, aggregationCache, prepared=prepared[z], profile=profiles[z]) for z in range(len(charts)) if charts[z]['type'] == 'table' and _isChunks(charts[z])}
+            frames, sharedCharts = _shareData(charts, prepared)
+
+            #workers only add to the cache. Evicting is left to this process once they are done
+            cacheSettings = None if renderCache is None else (renderCache.folder, float('inf'))
+            initargs = (frames, exporter.format, exporter.scale, cacheSettings, profiling)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=initargs) as executor:
+                tasks = _groupTasks(charts, prepared, local)
+                taskCharts = [[sharedCharts[z] for z in task] for task in tasks]
+                taskData = [[prepared[z] for z in task] for task in tasks]
+                taskProfiles = [[profiles[z] for z in task] for task in tasks]
+                results = executor.map(_renderCharts, taskCharts, taskData, [mainColors] * len(tasks), taskProfiles)
+                slides = _insertSlides(charts, _inOrder(tasks, results, local), mainColors, imageFolder, renderCache, report, deckStream, onChart)
+
+            #the workers added to the cache, so pick up their changes
+            if renderCache is not None:
+                renderCache._load()
+    except:
+        #a streamed deck has let go of the slides it wrote, so it can't be built on
+        if deckStream is not None:
+            deckStream.discard()
+            prs = None
+        raise
+    finally:
+        if ownsExporter:
+            exporter.close()
+        if traceMemory:
+            tracemalloc.stop()
+
+    #put the rebuilt slides in place of the old ones
+    if incremental:
+        allSlides = [previous[z]['slides'] if previous is not None and z < len(previous) else None for z in range(len(allCharts))]
+        for z, chartSlides in zip(changed, slides):
+            allSlides[z] = chartSlides
+        if previous is not None:
+            _arrangeSlides(previous, allSlides)
 
     #finally save out file
-    prs.save("output.pptx")
\ No newline at end of file
+    #a streamed deck has let go of its slides, so the next build needs the template set again
+    if deckStream is not None:
+        deckStream.close()
+        prs = None
+    else:
+        prs.save(fileName)
+    if incremental:
+        _saveManifest(fileName, fingerprints, allSlides)
+
+    return report
+
+#####################
+### Batch builds
+#####################
+
+#function to get the charts' data filtered and grouped once for every partition, then split up by partition
+#charts are grouped by the partition key as well as their own columns, so the full data is only scanned once
+#returns, for each chart, a dict of its data by partition value along with the data for a value with no rows,
+#or just the data if it has no partition key and is the same for every deck
+def _partitionData(charts, partitionKey):
+    sources = []
+    groupLists = []
+    metricDicts = []
+    for chartDefinition in charts:
+
+        #chunks can only be read once, so they are filtered as they are read and kept for every deck
+        if _isChunks(chartDefinition):
+            data = pd.concat(list(_filterChunks(chartDefinition['data'], chartDefinition.get('filters', []))))
+            chartDefinition = {k: v for k, v in chartDefinition.items() if k != 'filters'}
+            chartDefinition['data'] = data
+
+        groupList = _groupList(chartDefinition)
+        if groupList is not None and partitionKey in _dataColumns(chartDefinition['data']) and partitionKey not in groupList:
+            groupList = [partitionKey] + groupList
+        sources.append(chartDefinition)
+        groupLists.append(groupList)
+        metricDicts.append(_metricDict(chartDefinition))
+
+    plan = _planCharts(sources, groupLists, metricDicts)
+    aggregationCache = _AggregationCache()
+
+    partitions = []
+    for chartDefinition, groupList, metricDict, planGroup in zip(sources, groupLists, metricDicts, plan):
+        key = _aggregationKey(chartDefinition, groupList, metricDict)
+        temp = aggregationCache.get(key)
+        if temp is None:
+            temp = _prepareData(chartDefinition, groupList, metricDict) if planGroup is None else planGroup.rollUp(groupList, metricDict)
+            aggregationCache.put(key, chartDefinition['data'], temp)
+
+        if partitionKey not in temp.columns:
+            partitions.append(temp)
+            continue
+
+        #the partition key only stays in the data if the chart asked for it, or is a table
+        dropKey = groupList is not None and partitionKey not in _groupList(chartDefinition)
+        parts = {}
+        for value, part in temp.groupby(partitionKey, sort=False):
+            if dropKey:
+                part = part.drop(columns=partitionKey).reset_index(drop=True)
+            parts[value] = part
+        empty = temp.iloc[:0].drop(columns=partitionKey) if dropKey else temp.iloc[:0]
+        partitions.append((parts, empty))
+
+    return partitions
+
+#function to get the data for one deck, out of each chart's partitions
+#a deck with no rows for a chart gets the chart with no data, like filtering the data down to that value would
+def _deckData(partitions, value):
+    prepared = []
+    for partition in partitions:
+        if isinstance(partition, tuple):
+            parts, empty = partition
+            prepared.append((parts[value] if value in parts else empty, 'hit'))
+        else:
+            prepared.append((partition, 'hit'))
+    return prepared
+
+def _initDeckWorker(colors, exportFormat, exportScale, cacheSettings):
+    setColors(colors)
+    _initWorker({}, exportFormat, exportScale, cacheSettings)
+
+#function to build one deck of a batch from the template, in a worker process
+#returns the deck's report, and how many render cache hits and misses it had, so they can be added to the caller's cache
+def _buildDeck(templateFile, charts, prepared, fileName, options):
+    setTemplate(templateFile)
+    hits, misses = (_workerCache.hits, _workerCache.misses) if _workerCache is not None else (0, 0)
+    report = _createSlides(charts, fileName, prepared, exporter=_workerExporter, renderCache=_workerCache, **options)
+    if _workerCache is not None:
+        hits, misses = _workerCache.hits - hits, _workerCache.misses - misses
+    return report, hits, misses
+
+#master function for creating one deck for each value of a column, from the same charts
+#the data is filtered and grouped once for every deck, then split up by value, instead of once per deck
+#fileName is the output file for each deck, with {key} replaced by the value
+def createDecks(charts, partitionKey, template, fileName='output_{key}.pptx', values=None, workers=None, exporter=None, renderCache=None, native=False, imageSettings=None, stream=False, profile=False, decimate=None):
+
+    #validate input
+    if type(partitionKey) != str:
+        raise ValueError("partitionKey must be the name of a column")
+    if type(template) != str and not isinstance(template, Template):
+        raise Exception("You must input your template as a filename string, or a Template")
+    if '{key}' not in fileName:
+        raise ValueError("fileName must include {key}, so each deck gets its own file")
+    if workers is not None and (type(workers) != int or workers < 1):
+        raise ValueError("workers must be a positive integer")
+    if decimate is not None and decimate not in _decimateMethods:
+        raise ValueError("decimate must be one of " + ', '.join(_decimateMethods))
+    _checkImageSettings(imageSettings)
+
+    #check every chart against the template before the data is touched
+    setTemplate(template)
+    charts = [spec.definition for spec in compileCharts(charts)]
+
+    partitions = _partitionData(charts, partitionKey)
+
+    #a deck for every value found in the data, unless told which ones
+    if values is None:
+        found = set()
+        for partition in partitions:
+            if isinstance(partition, tuple):
+                found.update(partition[0])
+        values = sorted(found)
+
+    fileNames = [fileName.format(key=value) for value in values]
+    for deckFile in fileNames:
+        if os.path.dirname(deckFile) and not os.path.exists(os.path.dirname(deckFile)):
+            os.makedirs(os.path.dirname(deckFile))
+
+    #the data has already been split up, so only the rest of each chart definition goes to each deck
+    deckCharts = [dict(chartDefinition, data=None) for chartDefinition in charts]
+    options = {'native': native, 'imageSettings': imageSettings, 'stream': stream, 'profile': profile, 'decimate': decimate}
+
+    reports = {}
+    if workers is None or workers == 1:
+
+        #use one export session for every deck, unless one was handed to us
+        ownsExporter = exporter is None
+        if ownsExporter:
+            exporter = ImageExporter()
+        try:
+            for value, deckFile in zip(values, fileNames):
+                setTemplate(template)
+                reports[value] = _createSlides(deckCharts, deckFile, _deckData(partitions, value), exporter=exporter, renderCache=renderCache, **options)
+        finally:
+            if ownsExporter:
+                exporter.close()
+    else:
+        #each worker loads the template once, and keeps one export session for all of its decks
+        templateFile = template.fileName if isinstance(template, Template) else template
+        exportFormat, exportScale = (exporter.format, exporter.scale) if exporter is not None else ('png', 2)
+        cacheSettings = None if renderCache is None else (renderCache.folder, float('inf'))
+        initargs = (_getColors(), exportFormat, exportScale, cacheSettings)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_initDeckWorker, initargs=initargs) as executor:
+            futures = [executor.submit(_buildDeck, templateFile, deckCharts, _deckData(partitions, value), deckFile, options) for value, deckFile in zip(values, fileNames)]
+            for value, future in zip(values, futures):
+                reports[value], hits, misses = future.result()
+                if renderCache is not None:
+                    renderCache.hits += hits
+                    renderCache.misses += misses
+
+        #the workers added to the cache, so pick up their changes
+        if renderCache is not None:
+            renderCache._load()
+
+    return reports
+
+#####################
+### Async builds
+#####################
+
+#the one thread that touches the decks being built by async builds
+#the presentation being built is module state, so each step swaps its own deck in, and steps from different builds never overlap
+_deckThread = None
+
+#function to run one step of an async build with its own deck as the presentation, on the deck thread
+def _onDeck(deck, function, *args):
+    global prs
+    previous = globals().get('prs')
+    prs = deck
+    try:
+        return function(*args)
+    finally:
+        prs = previous
+
+#function to load the template for an async build and check its charts against it
+def _startDeck(template, charts, native, imageSettings, decimate):
+    deck = template.presentation() if isinstance(template, Template) else _loadTemplate(template).presentation()
+    specs, charts = _onDeck(deck, _resolveCharts, charts, native, imageSettings, decimate)
+    _onDeck(deck, lambda: prs.part.rename_slide_parts([sldId.rId for sldId in _slideIdList()]))
+    return deck, specs, charts
+
+#function to insert one chart's slides into the deck of an async build
+def _insertAsync(chartDefinition, render, mainColors, report):
+    return _insertSlides([chartDefinition], [render], mainColors, None, None, report)[0]
+
+#function to start a pool of worker processes that charts from async builds are drawn and exported in
+#each worker keeps its export session open, so one pool can be shared by every build a service runs
+def createRenderPool(workers=None, exportFormat='png', exportScale=2):
+    if workers is not None and (type(workers) != int or workers < 1):
+        raise ValueError("workers must be a positive integer")
+    return ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=({}, exportFormat, exportScale, None))
+
+#function to get one chart of an async build ready for its slides, once there is room under the limit
+#data is filtered and grouped on a thread, and only the grouped data is sent to a worker to draw and export
+#tables and native charts aren't exported, so they are built on the thread
+async def _renderAsync(chartDefinition, planGroup, aggregationCache, mainColors, profile, executor, limit):
+    import asyncio
+    loop = asyncio.get_running_loop()
+    async with limit:
+        if chartDefinition['type'] == 'table' or _isNative(chartDefinition):
+            return await loop.run_in_executor(None, _buildChart, chartDefinition, mainColors, None, aggregationCache, planGroup, None, profile)
+
+        prepared = await loop.run_in_executor(None, _chartData, chartDefinition, aggregationCache, planGroup, profile)
+        renders = await loop.run_in_executor(executor, _renderCharts, [dict(chartDefinition, data=None)], [prepared], mainColors, [profile])
+        return renders[0]
+
+#async version of createSlides, for building decks inside a service without holding up its event loop
+#charts are drawn and exported in executor, a pool from createRenderPool, with at most concurrency charts at a time.
+#without an executor, a pool is started for this build. Slides go into the deck in order as each chart is ready,
+#and the deck is saved to fileName. Cancelling the build stops charts that haven't started, and nothing is saved
+async def createSlidesAsync(charts, template, fileName='output.pptx', executor=None, concurrency=4, native=False, imageSettings=None, profile=False, onChart=None, decimate=None):
+    import asyncio
+    global _deckThread
+
+    #validate input
+    if type(template) != str and not isinstance(template, Template):
+        raise Exception("You must input your template as a filename string, or a Template")
+    if type(concurrency) != int or concurrency < 1:
+        raise ValueError("concurrency must be a positive integer")
+    if onChart is not None and not callable(onChart):
+        raise ValueError("onChart must be a function")
+    if decimate is not None and decimate not in _decimateMethods:
+        raise ValueError("decimate must be one of " + ', '.join(_decimateMethods))
+    _checkImageSettings(imageSettings)
+
+    loop = asyncio.get_running_loop()
+    if _deckThread is None:
+        _deckThread = ThreadPoolExecutor(max_workers=1)
+    deck, specs, charts = await loop.run_in_executor(_deckThread, _startDeck, template, charts, native, imageSettings, decimate)
+
+    mainColors = _getColors()
+    plan = _planCharts(charts, [spec.groupList for spec in specs], [spec.metricDict for spec in specs])
+    aggregationCache = _AggregationCache()
+    report = {
+        'aggregation-cache': {'hits': 0, 'misses': 0},
+        'query-plan': {'groups': len(set(id(group) for group in plan if group is not None)), 'rollups': 0}
+    }
+
+    profiling = profile or onChart is not None
+    profiles = [_chartProfile(z, chartDefinition) if profiling else None for z, chartDefinition in enumerate(charts)]
+    if profiling:
+        report['charts'] = []
+
+    ownsExecutor = executor is None
+    if ownsExecutor:
+        executor = createRenderPool(concurrency)
+
+    limit = asyncio.Semaphore(concurrency)
+    tasks = [asyncio.ensure_future(_renderAsync(chartDefinition, planGroup, aggregationCache, mainColors, chartProfile, executor, limit))
+             for chartDefinition, planGroup, chartProfile in zip(charts, plan, profiles)]
+    try:
+        for chartDefinition, task in zip(charts, tasks):
+            render = await task
+            await loop.run_in_executor(_deckThread, _onDeck, deck, _insertAsync, chartDefinition, render, mainColors, report)
+            if onChart is not None:
+                onChart(render['profile'])
+
+        await loop.run_in_executor(_deckThread, deck.save, fileName)
+    finally:
+        #charts still waiting for their turn are dropped. Ones already in a worker finish there, and are thrown away
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if ownsExecutor:
+            executor.shutdown(wait=False)
+
+    return report
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+#chart types whose points can be thinned out, and the ways of doing it
+_decimateTypes = ['line', 'filledLine', 'facetLine', 'facetFilledLine']
+_decimateMethods = ['lttb', 'minmax']
+
+#function to get the values along a trace's axis as numbers, so the distance between points can be measured
+#axes that aren't numbers or dates are spaced out evenly, in the order the points come in
+def _axisNumbers(column):
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        values = column.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(float)
+    elif pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+    else:
+        return np.arange(len(column), dtype=float)
+    return values - values[0] if len(values) else values
+
+#function to pick the points to keep with largest triangle three buckets
+#x has to be in order. Keeps the first and last points, and the one point from each bucket in between
+#that makes the largest triangle with the point kept before it and the average of the next bucket
+def _lttb(x, y, target):
+    n = len(x)
+    if target >= n or target < 3:
+        return np.arange(n)
+
+    #buckets for every point but the first and last, all of them holding at least one point
+    edges = np.linspace(1, n - 1, target - 1).astype(np.int64)
+    starts = edges[:-1]
+    ends = edges[1:]
+
+    #average of the bucket after each bucket, all at once. The last bucket is followed by the last point
+    sumX = np.concatenate([[0.0], np.cumsum(x)])
+    sumY = np.concatenate([[0.0], np.cumsum(y)])
+    nextStarts = np.append(starts[1:], n - 1)
+    nextEnds = np.append(ends[1:], n)
+    averageX = (sumX[nextEnds] - sumX[nextStarts]) / (nextEnds - nextStarts)
+    averageY = (sumY[nextEnds] - sumY[nextStarts]) / (nextEnds - nextStarts)
+
+    keep = np.empty(target, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    previous = 0
+    for i in range(target - 2):
+        start, end = starts[i], ends[i]
+        area = np.abs((x[previous] - averageX[i]) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (averageY[i] - y[previous]))
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    return keep
+
+#function to pick the points to keep with the lowest and highest point in each of buckets equal slices of the axis
+#x has to be in order. Keeps the first and last points as well, so the line starts and ends in the same place
+def _minMax(x, y, buckets):
+    n = len(x)
+    if n <= 2 * buckets or buckets < 1:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) / span * buckets).astype(np.int64), buckets - 1)
+    else:
+        bucket = np.zeros(n, dtype=np.int64)
+
+    #sort by bucket, then by value, so the first and last in each bucket are its lowest and highest
+    order = np.lexsort((y, bucket))
+    sortedBuckets = bucket[order]
+    firsts = np.flatnonzero(np.concatenate([[True], sortedBuckets[1:] != sortedBuckets[:-1]]))
+    lasts = np.append(firsts[1:] - 1, n - 1)
+    return np.unique(np.concatenate([order[firsts], order[lasts], [0, n - 1]]))
+
+#function to pick the points to keep along one trace, given its positions in the data
+#missing values are always kept, since they break the line where they are
+def _traceKeep(x, values, positions, method, target):
+    keep = []
+    for y in values:
+        y = y[positions]
+        present = np.flatnonzero(~np.isnan(y))
+        if method == 'lttb':
+            picked = _lttb(x[present], y[present], target)
+        else:
+            picked = _minMax(x[present], y[present], max(target // 2, 1))
+        keep.append(positions[present[picked]])
+        keep.append(positions[np.isnan(y)])
+    return np.unique(np.concatenate(keep)) if keep else positions
+
+#function to thin out the points of a line or filled line chart to about as many as its image can show
+#each trace is thinned out on its own. Stacked areas keep the same points along the axis for every color in the stack,
+#so they still stack up. Gives back the data with only the rows that are kept, in their original order
+def _decimateChart(chartDefinition, temp):
+    method = chartDefinition['decimate']
+    target = int(chartDefinition['decimate-points'])
+    axis = chartDefinition['axis']
+
+    #facets side by side share the width between them
+    facet = chartDefinition['facet'] if 'facet' in chartDefinition else None
+    if facet is not None and chartDefinition['facet-direction'] == 'columns':
+        target = max(target // max(temp[facet].nunique(), 1), 3)
+    if len(temp) <= target:
+        return temp
+
+    by = [column for column in [chartDefinition.get('color'), facet] if column is not None]
+    stacked = chartDefinition['type'] in ['filledLine', 'facetFilledLine'] and 'color' in chartDefinition
+    values = [temp[metric['name']].to_numpy(dtype=float, na_value=np.nan) for metric in chartDefinition['metrics']]
+    traces = temp.groupby(by, sort=False).indices.values() if by else [np.arange(len(temp))]
+
+    keep = []
+    axisValues = temp[axis]
+    for positions in traces:
+        positions = np.asarray(positions)
+
+        #points along each trace in axis order
+        order = np.argsort(axisValues.iloc[positions].to_numpy(), kind='stable')
+        positions = positions[order]
+        keep.append(_traceKeep(_axisNumbers(axisValues.iloc[positions]), values, positions, method, target))
+
+    keep = np.unique(np.concatenate(keep))
+
+    #a stack only lines up if every color has a point at the same places, so keep every row at a place any of them kept
+    if stacked:
+        places = temp.iloc[keep][[axis] + ([facet] if facet is not None else [])].drop_duplicates()
+        keep = np.flatnonzero(temp.merge(places, how='left', indicator=True)['_merge'].to_numpy() == 'both')
+
+    return temp.iloc[keep]
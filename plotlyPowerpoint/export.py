@@ -0,0 +1,169 @@
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import io
+import time
+
+#marker for the end of a stream of export jobs
+_endOfJobs = object()
+
+#function to pull the next job off an iterator and serialize its figure
+#runs on a background thread so it overlaps with exporting the previous figure
+def _nextJob(jobs):
+    try:
+        item, fig, options = next(jobs)
+    except StopIteration:
+        return _endOfJobs
+
+    figDict = fig.to_dict() if hasattr(fig, 'to_dict') else fig
+    return item, figDict, options
+
+#function to encode an image as png or jpeg. colors is the palette size for a quantized png, or None for full color
+def _encode(picture, imageFormat, quality, colors):
+    buffer = io.BytesIO()
+    if imageFormat == 'png':
+        if colors is not None:
+            picture = picture.quantize(colors, method=Image.FASTOCTREE)
+        picture.save(buffer, 'PNG', optimize=True)
+    else:
+        picture.save(buffer, 'JPEG', quality=quality, optimize=True)
+    return buffer.getvalue()
+
+#function to shrink an exported png to fit the image options
+#format 'auto' keeps whichever of png and jpeg comes out smaller, which is usually jpeg for dense charts
+def _compress(image, options):
+    imageFormat = options.get('format', 'png')
+    quality = options.get('quality', 85)
+    colors = options.get('colors', 256) if options.get('quantize') else None
+    maxBytes = options.get('maxBytes')
+
+    picture = Image.open(io.BytesIO(image))
+    picture.load()
+
+    #jpeg has no transparency, so the chart goes on white like the slide behind it
+    flat = Image.new('RGB', picture.size, 'white')
+    flat.paste(picture, mask=picture.getchannel('A') if 'A' in picture.getbands() else None)
+
+    if imageFormat == 'auto':
+        png = _encode(picture, 'png', quality, colors)
+        jpeg = _encode(flat, 'jpeg', quality, colors)
+        imageFormat = 'png' if len(png) <= len(jpeg) else 'jpeg'
+        result = png if imageFormat == 'png' else jpeg
+    else:
+        imageFormat = 'png' if imageFormat == 'png' else 'jpeg'
+        result = _encode(picture if imageFormat == 'png' else flat, imageFormat, quality, colors)
+    if imageFormat == 'jpeg':
+        picture = flat
+
+    #step down the quality, then the size, until the image fits in its budget
+    while maxBytes is not None and len(result) > maxBytes:
+        if imageFormat == 'jpeg' and quality > 40:
+            quality -= 15
+        elif imageFormat == 'png' and (colors is None or colors > 32):
+            colors = 256 if colors is None else colors // 2
+        elif picture.width > 200:
+            picture = picture.resize((int(picture.width * 0.8), int(picture.height * 0.8)), Image.LANCZOS)
+        else:
+            break
+        result = _encode(picture, imageFormat, quality, colors)
+
+    return result
+
+#long lived image export session. Keeps the image engine warm for a whole deck build,
+#or across several builds when passed to createSlides(exporter=...)
+class ImageExporter:
+
+    def __init__(self, format='png', scale=2):
+        self.format = format
+        self.scale = scale
+        self.isOpen = False
+        self._ownsServer = False
+
+    def open(self):
+        if self.isOpen:
+            return self
+
+        #kaleido v1 starts a new browser for every image unless a sync server is running
+        try:
+            import kaleido
+        except ImportError:
+            kaleido = None
+
+        if kaleido is not None and hasattr(kaleido, 'start_sync_server'):
+            if not kaleido._global_server.is_running():
+                kaleido.start_sync_server(silence_warnings=True)
+                self._ownsServer = True
+
+        #older kaleido keeps a single browser process alive once it has been used
+        self.isOpen = True
+        return self
+
+    def close(self):
+        if self._ownsServer:
+            import kaleido
+            kaleido.stop_sync_server(silence_warnings=True)
+            self._ownsServer = False
+        self.isOpen = False
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *args):
+        self.close()
+
+    #options can also hold quantize, colors, quality, and maxBytes, which shrink the image once it is exported
+    def _export(self, figDict, options):
+        import plotly.io as pio
+        imageFormat = options.get('format', self.format)
+        compress = imageFormat in ['jpeg', 'jpg', 'auto'] or (imageFormat == 'png' and (options.get('quantize') or options.get('maxBytes') is not None))
+
+        image = pio.to_image(figDict,
+                             format='png' if compress else imageFormat,
+                             width=options.get('width'),
+                             height=options.get('height'),
+                             scale=options.get('scale', self.scale),
+                             validate=False)
+
+        if compress:
+            image = _compress(image, dict(options, format=imageFormat))
+        return image
+
+    #export a single figure and return the image bytes
+    def export(self, fig, **options):
+        self.open()
+        return self._export(fig.to_dict() if hasattr(fig, 'to_dict') else fig, options)
+
+    #export a batch of figures and return the image bytes for each, in order
+    def exportMany(self, figs, options=None):
+        if options is None:
+            options = [{}] * len(figs)
+        jobs = ((None, fig, opts) for fig, opts in zip(figs, options))
+        return [image for item, image in self.iterExport(jobs)]
+
+    #export a stream of (item, figure, options) jobs, yielding (item, image bytes) in order
+    #the next job is pulled and serialized in the background while the current one exports
+    #jobs with no figure are passed straight through with no image, and the session is only opened once there is a figure
+    #with timed, yields (item, image bytes, seconds spent exporting it) instead
+    #without pipelined, the next job is only pulled once the one before it has been handed back and dealt with,
+    #so nothing else runs while a job is being worked on, like when each one is being measured
+    def iterExport(self, jobs, timed=False, pipelined=True):
+        jobs = iter(jobs)
+        with ThreadPoolExecutor(max_workers=1) as serializer:
+            pending = serializer.submit(_nextJob, jobs)
+            while True:
+                job = pending.result()
+                if job is _endOfJobs:
+                    break
+                if pipelined:
+                    pending = serializer.submit(_nextJob, jobs)
+
+                item, figDict, options = job
+                if figDict is None:
+                    image, seconds = None, 0.0
+                else:
+                    self.open()
+                    start = time.perf_counter()
+                    image = self._export(figDict, options)
+                    seconds = time.perf_counter() - start
+                yield (item, image, seconds) if timed else (item, image)
+                if not pipelined:
+                    pending = serializer.submit(_nextJob, jobs)
@@ -0,0 +1,115 @@
+import pandas as pd
+import numpy as np
+import operator
+
+#comparison operations supported in filters
+_comparisons = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le
+}
+
+#operations that don't need a value
+_nullOperations = ['is null', 'is not null']
+
+#a date parsed once, keeping the original text for dates stored as strings
+class _Date:
+    __slots__ = ['timestamp', 'text']
+
+    def __init__(self, value):
+        self.timestamp = pd.Timestamp(value)
+        self.text = str(value)
+
+    def __repr__(self):
+        return '_Date(' + repr(self.timestamp) + ')'
+
+#function to convert a filter value to the type given in the filter
+def _convertValue(value, valueType):
+    if valueType == 'int':
+        return int(value)
+    elif valueType == 'float':
+        return float(value)
+    elif valueType == 'str':
+        return str(value)
+    elif valueType == 'date':
+        return _Date(value)
+    elif valueType == 'list':
+        return list(value)
+    raise ValueError("Unknown filter type '" + str(valueType) + "'")
+
+#function to check a filter and parse its value once, up front
+#returns (variable, operation, value)
+def _parseFilter(item):
+    operation = item['operation']
+    valueType = item.get('type')
+
+    if operation in _nullOperations:
+        return item['variable'], operation, None
+
+    if operation in ['in', 'not in']:
+        if valueType == 'date':
+            value = [pd.Timestamp(v) for v in item['value']]
+        elif valueType not in [None, 'list']:
+            value = [_convertValue(v, valueType) for v in item['value']]
+        else:
+            value = list(item['value'])
+    elif operation == 'between':
+        if len(item['value']) != 2:
+            raise ValueError("A 'between' filter needs a value of [low, high]")
+        value = tuple(_convertValue(v, valueType) for v in item['value'])
+    elif operation in ['regex', 'not regex']:
+        value = str(item['value'])
+    elif operation in _comparisons:
+        value = _convertValue(item['value'], valueType)
+    else:
+        raise ValueError("Unknown filter operation '" + str(operation) + "'")
+
+    return item['variable'], operation, value
+
+#function to get the value to compare a column against
+#dates stored as strings are compared as strings, like they always have been
+def _dateValue(column, value):
+    if type(value) == _Date:
+        return value.timestamp if pd.api.types.is_datetime64_any_dtype(column.dtype) else value.text
+    return value
+
+#function to turn a boolean series into a plain mask, treating missing values as false
+def _asMask(series):
+    return series.to_numpy(dtype=bool, na_value=False)
+
+#function to get the boolean mask for a single parsed filter
+def _filterMask(temp, variable, operation, value):
+    column = temp[variable]
+
+    if operation == 'is null':
+        return _asMask(column.isna())
+    elif operation == 'is not null':
+        return _asMask(column.notna())
+    elif operation == 'in':
+        return _asMask(column.isin(value))
+    elif operation == 'not in':
+        return ~_asMask(column.isin(value))
+    elif operation == 'between':
+        return _asMask(column.between(_dateValue(column, value[0]), _dateValue(column, value[1])))
+    elif operation == 'regex':
+        return _asMask(column.str.contains(value, regex=True, na=False))
+    elif operation == 'not regex':
+        return ~_asMask(column.str.contains(value, regex=True, na=False))
+
+    return _asMask(_comparisons[operation](column, _dateValue(column, value)))
+
+#function to compile a list of filters into one function returning a boolean mask for a dataframe
+#every filter is checked and its value parsed once, then the mask is built in a single pass
+def compileFilters(filters):
+    parsed = [_parseFilter(item) for item in filters]
+
+    def mask(temp):
+        result = np.ones(len(temp), dtype=bool)
+        for variable, operation, value in parsed:
+            result &= _filterMask(temp, variable, operation, value)
+        return result
+
+    return mask
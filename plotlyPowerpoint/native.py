@@ -0,0 +1,210 @@
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.util import Pt
+import numpy as np
+import pandas as pd
+
+#grid line color and width, the same as the plotly charts
+_gridColor = RGBColor.from_string('EBEBEB')
+_gridWidth = Pt(0.75)
+
+#function to turn a color from the palette into an RGBColor. Palettes can hold hex or rgb() colors
+def _rgbColor(color):
+    if color.startswith('rgb'):
+        return RGBColor(*[int(float(v)) for v in color[color.index('(') + 1:color.index(')')].split(',')[:3]])
+    return RGBColor.from_string(color.replace('#', ''))
+
+#function to pick a color from the palette, starting over once it runs out
+def _paletteColor(mainColors, position):
+    return mainColors[position % len(mainColors)]
+
+#function to get the values of a column as plain numbers, with missing values left blank
+def _values(column):
+    values = column.to_numpy(dtype=float, na_value=np.nan)
+    return [None if np.isnan(v) else float(v) for v in values]
+
+#function to get the values of an axis as categories for the chart
+def _categories(column):
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        return [v.to_pydatetime() for v in column]
+    return column.tolist()
+
+#function to split data into one series per value of a column, lined up on the axis
+#returns the categories and a list of (name, values) for each series
+def _pivotSeries(temp, axis, by, metric):
+    wide = temp.set_index([by, axis])[metric].unstack(0)
+    return _categories(wide.index.to_series()), [(name, _values(wide[name])) for name in wide.columns]
+
+#function to get the name a metric's series is shown with, which is its column name if it has no prettyName
+def _seriesName(metric):
+    return metric['prettyName'] if 'prettyName' in metric else metric['name']
+
+#function to check if a bar chart is drawn sideways
+def _isHorizontal(chartDefinition):
+    return chartDefinition.get('options', {}).get('orientation') == 'horizontal'
+
+#function to get the native chart type for a chart
+def _nativeType(chartDefinition, stacked):
+    if chartDefinition['type'] in ['line', 'facetLine']:
+        return XL_CHART_TYPE.LINE
+    elif chartDefinition['type'] in ['bar', 'facetBar']:
+        return XL_CHART_TYPE.BAR_CLUSTERED if _isHorizontal(chartDefinition) else XL_CHART_TYPE.COLUMN_CLUSTERED
+    return XL_CHART_TYPE.AREA_STACKED if stacked else XL_CHART_TYPE.AREA
+
+#function to get the categories and series for a chart that isn't faceted
+#each series is (name, values, color, point colors), where point colors is None unless every point has its own color
+def _chartSeries(chartDefinition, temp, mainColors):
+    axis = chartDefinition['axis']
+    metrics = chartDefinition['metrics']
+
+    if chartDefinition['type'] == 'filledLine' and len(metrics) > 1:
+        raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
+
+    #one metric broken out by color
+    if len(metrics) == 1 and 'color' in chartDefinition:
+        categories, pivoted = _pivotSeries(temp, axis, chartDefinition['color'], metrics[0]['name'])
+        return categories, [(name, values, _paletteColor(mainColors, i), None) for i, (name, values) in enumerate(pivoted)]
+
+    #one metric. Bars get a color for each point along the axis
+    categories = _categories(temp[axis])
+    if len(metrics) == 1:
+        pointColors = None
+        if chartDefinition['type'] == 'bar':
+            pointColors = [_paletteColor(mainColors, i) for i in range(len(categories))]
+        return categories, [(_seriesName(metrics[0]), _values(temp[metrics[0]['name']]), _paletteColor(mainColors, 0), pointColors)]
+
+    #multiple metrics, one series each
+    return categories, [(_seriesName(metrics[i]), _values(temp[metrics[i]['name']]), _paletteColor(mainColors, i), None) for i in range(len(metrics))]
+
+#function to get the categories and series for each facet of a faceted chart
+#returns a list of (facet, categories, series)
+def _facetSeries(chartDefinition, temp, mainColors):
+    axis = chartDefinition['axis']
+    metrics = chartDefinition['metrics']
+    options = chartDefinition.get('options', {})
+    colorGrouping = options.get('color-grouping')
+
+    if chartDefinition['type'] == 'facetFilledLine' and len(metrics) > 1:
+        raise ValueError('Filled line charts can only have one metric. Please convert your metrics into a variable:value format and break out the line chart by color')
+
+    facets = []
+    for position, (facet, temp2) in enumerate(temp.groupby(chartDefinition['facet'], sort=False)):
+
+        #filled lines broken out by color are stacked within each facet
+        if chartDefinition['type'] == 'facetFilledLine' and 'color' in chartDefinition:
+            categories, pivoted = _pivotSeries(temp2, axis, chartDefinition['color'], metrics[0]['name'])
+            series = [(name, values, _paletteColor(mainColors, i), None) for i, (name, values) in enumerate(pivoted)]
+        elif chartDefinition['type'] == 'facetFilledLine':
+            categories = _categories(temp2[axis])
+            series = [(facet, _values(temp2[metrics[0]['name']]), _paletteColor(mainColors, position), None)]
+        else:
+            categories = _categories(temp2[axis])
+            series = []
+            for i in range(len(metrics)):
+                color = _paletteColor(mainColors, position if colorGrouping == 'facet' else i)
+                pointColors = None
+                if chartDefinition['type'] == 'facetBar' and colorGrouping == 'axis':
+                    pointColors = [_paletteColor(mainColors, i2) for i2 in range(len(categories))]
+                series.append((_seriesName(metrics[i]), _values(temp2[metrics[i]['name']]), color, pointColors))
+
+        facets.append((facet, categories, series))
+    return facets
+
+#function to style one axis
+def _styleAxis(axis, gridLines, title, tickAngle=None):
+    axis.has_major_gridlines = gridLines
+    if gridLines:
+        axis.major_gridlines.format.line.color.rgb = _gridColor
+        axis.major_gridlines.format.line.width = _gridWidth
+
+    if title is not None:
+        axis.has_title = True
+        axis.axis_title.text_frame.text = title
+
+    #rotate the tick labels, in 60,000ths of a degree
+    if tickAngle is not None:
+        axis._element.get_or_add_txPr().bodyPr.set('rot', str(int(float(tickAngle) * 60000)))
+
+#function to add one native chart to a slide
+#axisTitles says which of the x and y axis titles this chart shows, for facets that share them
+def _addChart(slide, chartDefinition, box, categories, series, stacked, legend, title=None, axisTitles=(True, True)):
+    chartType = _nativeType(chartDefinition, stacked)
+    chartData = CategoryChartData()
+    chartData.categories = categories
+    for name, values, color, pointColors in series:
+        chartData.add_series(str(name), values)
+    chart = slide.shapes.add_chart(chartType, *box, chartData).chart
+
+    #colors from the palette
+    for plotSeries, (name, values, color, pointColors) in zip(chart.plots[0].series, series):
+        if chartType == XL_CHART_TYPE.LINE:
+            plotSeries.format.line.color.rgb = _rgbColor(color)
+            plotSeries.smooth = False
+        else:
+            plotSeries.format.fill.solid()
+            plotSeries.format.fill.fore_color.rgb = _rgbColor(color)
+            if pointColors is not None:
+                for i, pointColor in enumerate(pointColors):
+                    point = plotSeries.points[i]
+                    point.format.fill.solid()
+                    point.format.fill.fore_color.rgb = _rgbColor(pointColor)
+
+    #legend along the bottom, like the plotly charts
+    chart.has_legend = legend
+    if legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+
+    chart.has_title = title is not None
+    if title is not None:
+        chart.chart_title.text_frame.text = str(title)
+        chart.chart_title.text_frame.paragraphs[0].font.size = Pt(12)
+
+    #horizontal bars go from the top down, and swap which axis is along the bottom
+    options = chartDefinition.get('options', {})
+    horizontalAxis, verticalAxis = chart.category_axis, chart.value_axis
+    if chartType == XL_CHART_TYPE.BAR_CLUSTERED:
+        chart.category_axis.reverse_order = True
+        horizontalAxis, verticalAxis = verticalAxis, horizontalAxis
+
+    _styleAxis(horizontalAxis,
+               options.get('vertical-grid-lines') == 'true',
+               chartDefinition.get('x-axis-title') if axisTitles[0] else None,
+               options.get('x-axis-ticks-angle'))
+    _styleAxis(verticalAxis,
+               options.get('horizontal-grid-lines') == 'true',
+               chartDefinition.get('y-axis-title') if axisTitles[1] else None)
+    return chart
+
+#function to put a native powerpoint chart where the chart placeholder is, straight from the chart's data
+#faceted charts become a row or column of charts, one for each facet
+def _insertNativeChart(slide, placeholder, chartDefinition, temp, mainColors):
+    box = (placeholder.left, placeholder.top, placeholder.width, placeholder.height)
+    placeholder.element.getparent().remove(placeholder.element)
+
+    if chartDefinition['type'] not in ['facetLine', 'facetBar', 'facetFilledLine']:
+        categories, series = _chartSeries(chartDefinition, temp, mainColors)
+        stacked = chartDefinition['type'] == 'filledLine' and 'color' in chartDefinition
+        _addChart(slide, chartDefinition, box, categories, series, stacked, len(series) > 1)
+        return
+
+    #split the space between the facets, leaving the same spacing as the plotly charts
+    facets = _facetSeries(chartDefinition, temp, mainColors)
+    options = chartDefinition.get('options', {})
+    facetSpacing = options['facet-spacing'] if 'facet-spacing' in options else 0.1
+    rows = chartDefinition['facet-direction'] == 'rows'
+    left, top, width, height = box
+    length = height if rows else width
+    gap = int(length * facetSpacing)
+    size = int((length - gap * (len(facets) - 1)) / len(facets))
+
+    stacked = chartDefinition['type'] == 'facetFilledLine' and 'color' in chartDefinition
+    for position, (facet, categories, series) in enumerate(facets):
+        offset = position * (size + gap)
+        facetBox = (left, top + offset, width, size) if rows else (left + offset, top, size, height)
+
+        #axis titles go on the outside edge of the grid, and the stacked colors get one legend at the end
+        axisTitles = (position == len(facets) - 1, True) if rows else (True, position == 0)
+        legend = stacked and position == len(facets) - 1
+        _addChart(slide, chartDefinition, facetBox, categories, series, stacked, legend, facet, axisTitles)
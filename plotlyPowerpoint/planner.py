@@ -0,0 +1,135 @@
+import pandas as pd
+import threading
+from plotlyPowerpoint.filters import compileFilters
+from plotlyPowerpoint.cache import _aggregationKey
+
+#methods that can be worked out again from a finer grouping, and the pieces each one needs
+_rollupParts = {
+    'sum': ['sum'],
+    'count': ['count'],
+    'min': ['min'],
+    'max': ['max'],
+    'mean': ['sum', 'count']
+}
+
+#how each piece is combined when rolling up to a coarser grouping
+_rollupMethods = {
+    'sum': 'sum',
+    'count': 'sum',
+    'min': 'min',
+    'max': 'max'
+}
+
+#function to get the name of the column holding one piece of a metric in the fine grouping
+def _partName(column, part):
+    return column + '|' + part
+
+#a set of charts over the same data and filters
+#the data is filtered and grouped once at the finest grain any of the charts need, then rolled up for each chart
+class _PlanGroup:
+
+    def __init__(self, data, filters):
+        self.data = data
+        self.filters = filters
+        self.groupList = []
+        self.parts = {}
+        self.fine = None
+        self._lock = threading.Lock()
+
+    #function to widen the group to cover what another chart needs
+    def add(self, groupList, metricDict):
+        for column in groupList:
+            if column not in self.groupList:
+                self.groupList.append(column)
+
+        for column, method in metricDict.items():
+            parts = self.parts.setdefault(column, [])
+            for part in _rollupParts[method]:
+                if part not in parts:
+                    parts.append(part)
+
+    #function to filter and group the data, once
+    #charts built at the same time on different threads wait for the first one to do it
+    def prepare(self):
+        with self._lock:
+            return self._prepare()
+
+    def _prepare(self):
+        if self.fine is None:
+            temp = self.data
+            if self.filters:
+                temp = temp.loc[compileFilters(self.filters)(temp), :]
+
+            #missing values are kept as their own group here, and dropped when rolling up like a normal groupby would
+            named = {}
+            for column, parts in self.parts.items():
+                for part in parts:
+                    named[_partName(column, part)] = pd.NamedAgg(column, part)
+            self.fine = temp.groupby(self.groupList, dropna=False).agg(**named).reset_index()
+
+            #the raw data isn't needed anymore
+            self.data = None
+
+        return self.fine
+
+    #function to roll the fine grouping up to the grouping one chart needs
+    #gives the same columns, in the same order, as grouping the raw data directly
+    def rollUp(self, groupList, metricDict):
+        fine = self.prepare()
+
+        partMethods = {}
+        for column, method in metricDict.items():
+            for part in _rollupParts[method]:
+                partMethods[_partName(column, part)] = _rollupMethods[part]
+        rolled = fine.groupby(groupList).agg(partMethods)
+
+        temp = rolled.index.to_frame(index=False)
+        for column, method in metricDict.items():
+            if method == 'mean':
+                temp[column] = (rolled[_partName(column, 'sum')] / rolled[_partName(column, 'count')]).values
+            else:
+                temp[column] = rolled[_partName(column, method)].values
+
+        return temp
+
+#function to check if a chart's data can be rolled up from a finer grouping
+def _canRollUp(chartDefinition, groupList, metricDict):
+    if groupList is None or not isinstance(chartDefinition['data'], pd.DataFrame):
+        return False
+
+    for column, method in metricDict.items():
+        if type(method) != str or method not in _rollupParts or column in groupList:
+            return False
+
+    #grouping by several categories at once would create every combination of them
+    data = chartDefinition['data']
+    for column in groupList:
+        if column not in data.columns or isinstance(data[column].dtype, pd.CategoricalDtype):
+            return False
+
+    return True
+
+#function to look at every chart before any work starts, and plan how their data is prepared
+#charts over the same data and filters share one scan of the data when there is more than one grouping to get
+#returns the plan group for each chart, or None if the chart gets its data on its own
+def _planCharts(charts, groupLists, metricDicts):
+    candidates = {}
+    for z in range(len(charts)):
+        if _canRollUp(charts[z], groupLists[z], metricDicts[z]):
+            key = _aggregationKey(charts[z], None, None)
+            candidates.setdefault(key, []).append(z)
+
+    plan = [None] * len(charts)
+    for key, members in candidates.items():
+
+        #a single grouping is already handled by the aggregation cache
+        distinct = set(_aggregationKey(charts[z], groupLists[z], metricDicts[z]) for z in members)
+        if len(distinct) < 2:
+            continue
+
+        group = _PlanGroup(charts[members[0]]['data'], charts[members[0]].get('filters', []))
+        for z in members:
+            group.add(groupLists[z], metricDicts[z])
+            plan[z] = group
+
+    return plan
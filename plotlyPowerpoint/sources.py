@@ -0,0 +1,331 @@
+import operator
+import os
+import pandas as pd
+from plotlyPowerpoint.filters import _parseFilter, _Date
+
+#data can also be given as a polars DataFrame or LazyFrame, an arrow Table or Dataset, or a duckdb relation,
+#or as the path to a parquet, feather or arrow file, or a folder of them, which is read as an arrow dataset
+#its filters and grouping run in that engine, and only the result comes back as a pandas dataframe
+#each engine is only imported once data from it is given
+
+#comparison operations, as operators on each engine's expressions
+_comparisons = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le
+}
+
+#file formats data can be read from, by extension. Feather files are arrow ipc files
+_fileFormats = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'ipc',
+    '.arrow': 'ipc',
+    '.ipc': 'ipc'
+}
+
+#function to check if data is given as the path to a file or folder
+def _isPath(data):
+    return isinstance(data, (str, os.PathLike))
+
+#function to get the format of a data file, or of the first file in a folder of them
+#returns None if it isn't a format that can be read
+def _fileFormat(path):
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        for folder, subfolders, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                extension = os.path.splitext(name)[1].lower()
+                if extension in _fileFormats and not name.startswith(('.', '_')):
+                    return _fileFormats[extension]
+        return None
+    return _fileFormats.get(os.path.splitext(path)[1].lower())
+
+#function to find the engine holding a chart's data, without importing it
+#returns 'polars', 'arrow', 'duckdb', or None for data that isn't in one of them
+def _engine(data):
+    if _isPath(data):
+        return 'arrow' if _fileFormat(data) is not None else None
+
+    module = type(data).__module__.split('.')[0]
+    name = type(data).__name__
+    if module == 'polars' and name in ['DataFrame', 'LazyFrame']:
+        return 'polars'
+    elif module == 'pyarrow' and (name in ['Table', 'RecordBatch'] or name.endswith('Dataset')):
+        return 'arrow'
+    elif module in ['duckdb', '_duckdb'] and name == 'DuckDBPyRelation':
+        return 'duckdb'
+    return None
+
+#function to check if data is in another engine, and is queried there instead of in pandas
+def _isSource(data):
+    return _engine(data) is not None
+
+#polars data, queried lazily so only the columns and rows that are needed are read
+class _PolarsQuery:
+
+    #metrics polars can work out, the same way pandas does
+    methods = {
+        'sum': lambda column: column.sum(),
+        'mean': lambda column: column.mean(),
+        'count': lambda column: column.count(),
+        'min': lambda column: column.min(),
+        'max': lambda column: column.max(),
+        'median': lambda column: column.median(),
+        'nunique': lambda column: column.drop_nulls().n_unique(),
+        'std': lambda column: column.std(),
+        'var': lambda column: column.var()
+    }
+
+    def __init__(self, data):
+        import polars as pl
+        self.pl = pl
+        self.frame = data.lazy()
+        self.schema = self.frame.collect_schema()
+
+    def columns(self):
+        return list(self.schema.names())
+
+    def isTemporal(self, name):
+        return self.schema[name].is_temporal()
+
+    def column(self, name):
+        return self.pl.col(name)
+
+    def literal(self, value):
+        return self.pl.lit(value)
+
+    def isNull(self, column):
+        return column.is_null()
+
+    def isIn(self, column, values):
+        return column.is_in(values)
+
+    def matches(self, column, pattern):
+        return column.str.contains(pattern)
+
+    def collect(self, keep, columns):
+        frame = self.frame if keep is None else self.frame.filter(keep)
+        if columns is not None:
+            frame = frame.select(columns)
+        return frame.collect().to_pandas()
+
+    def aggregate(self, keep, groupList, metricDict):
+        frame = self.frame if keep is None else self.frame.filter(keep)
+        metrics = [self.methods[method](self.pl.col(column)).alias(column) for column, method in metricDict.items()]
+        return frame.group_by(groupList).agg(metrics).sort(groupList).collect().to_pandas()
+
+#arrow data, read as a dataset so filters are pushed into the scan, and only the columns that are needed are read
+#parquet files skip every row group whose min and max show it has no rows that pass the filters,
+#and folders partitioned like year=2021/ skip every folder that doesn't
+class _ArrowQuery:
+
+    #metrics arrow can work out the same way pandas does, as (aggregate function, options)
+    #sums of nothing are 0 and counts skip missing values, like pandas
+    methods = {
+        'sum': ('sum', lambda pc: pc.ScalarAggregateOptions(min_count=0)),
+        'mean': ('mean', lambda pc: None),
+        'count': ('count', lambda pc: pc.CountOptions('only_valid')),
+        'min': ('min', lambda pc: None),
+        'max': ('max', lambda pc: None),
+        'nunique': ('count_distinct', lambda pc: pc.CountOptions('only_valid')),
+        'std': ('stddev', lambda pc: pc.VarianceOptions(ddof=1)),
+        'var': ('variance', lambda pc: pc.VarianceOptions(ddof=1))
+    }
+
+    def __init__(self, data):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        self.pa = pa
+        self.pc = pc
+        if _isPath(data):
+            self.dataset = ds.dataset(os.fspath(data), format=_fileFormat(data), partitioning='hive')
+        elif isinstance(data, ds.Dataset):
+            self.dataset = data
+        else:
+            self.dataset = ds.dataset(data)
+        self.schema = self.dataset.schema
+
+    def columns(self):
+        return list(self.schema.names)
+
+    def isTemporal(self, name):
+        return self.pa.types.is_temporal(self.schema.field(name).type)
+
+    def column(self, name):
+        return self.pc.field(name)
+
+    def literal(self, value):
+        return self.pc.scalar(value)
+
+    def isNull(self, column):
+        return column.is_null()
+
+    def isIn(self, column, values):
+        return column.isin(values)
+
+    def matches(self, column, pattern):
+        return self.pc.match_substring_regex(column, pattern=pattern)
+
+    def collect(self, keep, columns):
+        return self.dataset.to_table(columns=columns, filter=keep).to_pandas()
+
+    #the data is streamed through the filter and grouping a batch at a time, so only the groups are held in memory
+    def aggregate(self, keep, groupList, metricDict):
+        from pyarrow import acero
+        needed = groupList + [column for column in metricDict if column not in groupList]
+
+        #the scan only uses the filter to skip files and row groups, so the rows it reads still need filtering
+        steps = [acero.Declaration('scan', acero.ScanNodeOptions(self.dataset, columns=needed, filter=keep))]
+        if keep is not None:
+            steps.append(acero.Declaration('filter', acero.FilterNodeOptions(keep)))
+        steps.append(acero.Declaration('project', acero.ProjectNodeOptions([self.pc.field(column) for column in needed], needed)))
+
+        aggregations = []
+        for column, method in metricDict.items():
+            function, options = self.methods[method]
+            aggregations.append((column, 'hash_' + function, options(self.pc), column))
+        steps.append(acero.Declaration('aggregate', acero.AggregateNodeOptions(aggregations, keys=groupList)))
+        result = acero.Declaration.from_sequence(steps).to_table()
+
+        #same columns, in the same order, as grouping in pandas
+        result = result.select(groupList + list(metricDict))
+        return result.sort_by([(column, 'ascending') for column in groupList]).to_pandas()
+
+#duckdb relation, with the filters and grouping added to its query
+class _DuckdbQuery:
+
+    #metrics duckdb can work out the same way pandas does, as sql around the quoted column
+    methods = {
+        'sum': 'coalesce(sum({0}), 0)',
+        'mean': 'avg({0})',
+        'count': 'count({0})',
+        'min': 'min({0})',
+        'max': 'max({0})',
+        'median': 'median({0})',
+        'nunique': 'count(DISTINCT {0})',
+        'std': 'stddev_samp({0})',
+        'var': 'var_samp({0})'
+    }
+
+    def __init__(self, data):
+        import duckdb
+        self.duckdb = duckdb
+        self.relation = data
+        self.types = dict(zip(data.columns, [str(columnType) for columnType in data.types]))
+
+    def columns(self):
+        return list(self.relation.columns)
+
+    def isTemporal(self, name):
+        return self.types[name].startswith(('DATE', 'TIME'))
+
+    def column(self, name):
+        return self.duckdb.ColumnExpression(name)
+
+    def literal(self, value):
+        return self.duckdb.ConstantExpression(value)
+
+    def isNull(self, column):
+        return column.isnull()
+
+    def isIn(self, column, values):
+        if not values:
+            return self.duckdb.ConstantExpression(False)
+        return column.isin(*[self.literal(value) for value in values])
+
+    def matches(self, column, pattern):
+        return self.duckdb.FunctionExpression('regexp_matches', column, self.literal(pattern))
+
+    def collect(self, keep, columns):
+        relation = self.relation if keep is None else self.relation.filter(keep)
+        if columns is not None:
+            relation = relation.select(*[self.column(column) for column in columns])
+        return relation.df()
+
+    def aggregate(self, keep, groupList, metricDict):
+        relation = self.relation if keep is None else self.relation.filter(keep)
+        groups = ', '.join(_quote(column) for column in groupList)
+        metrics = [self.methods[method].format(_quote(column)) + ' AS ' + _quote(column) for column, method in metricDict.items()]
+        return relation.aggregate(', '.join([groups] + metrics), groups).order(groups).df()
+
+_queries = {
+    'polars': _PolarsQuery,
+    'arrow': _ArrowQuery,
+    'duckdb': _DuckdbQuery
+}
+
+#function to quote a column name for sql
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+#function to get the columns of data in another engine, without reading it
+def _sourceColumns(data):
+    return _queries[_engine(data)](data).columns()
+
+#function to get a filter value the way the engine compares it
+#dates are compared as dates against date columns, and as the original text against anything else, like in pandas
+def _plainValue(query, variable, value):
+    if type(value) == _Date:
+        return value.timestamp.to_pydatetime() if query.isTemporal(variable) else value.text
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value
+
+#function to build the expression for a single parsed filter
+#rows with a missing value only pass filters that exclude something, like != and not in, the same as in pandas
+def _filterPart(query, variable, operation, value):
+    column = query.column(variable)
+
+    if operation == 'is null':
+        return query.isNull(column)
+    elif operation == 'is not null':
+        return ~query.isNull(column)
+    elif operation == 'in':
+        return query.isIn(column, [_plainValue(query, variable, v) for v in value])
+    elif operation == 'not in':
+        return ~query.isIn(column, [_plainValue(query, variable, v) for v in value]) | query.isNull(column)
+    elif operation == 'between':
+        low, high = [query.literal(_plainValue(query, variable, v)) for v in value]
+        return (column >= low) & (column <= high)
+    elif operation == 'regex':
+        return query.matches(column, value)
+    elif operation == 'not regex':
+        return ~query.matches(column, value) | query.isNull(column)
+
+    result = _comparisons[operation](column, query.literal(_plainValue(query, variable, value)))
+    if operation == '!=':
+        result = result | query.isNull(column)
+    return result
+
+#function to combine a list of filters into one expression in the engine, or None if there are none
+def _filterExpression(query, filters):
+    keep = None
+    for item in filters:
+        part = _filterPart(query, *_parseFilter(item))
+        keep = part if keep is None else keep & part
+    return keep
+
+#function to filter and group data in the engine it is in, giving back a pandas dataframe
+#matches filtering and grouping the same data in pandas: rows with a missing group are dropped, and groups are sorted
+#metrics the engine can't work out are done in pandas, from only the filtered rows and the columns they need
+#tables aren't grouped, so they get every column of the filtered rows
+def _queryData(data, filters, groupList, metricDict):
+    query = _queries[_engine(data)](data)
+    keep = _filterExpression(query, filters)
+    if groupList is None:
+        return query.collect(keep, None)
+
+    native = all(type(method) == str and method in query.methods for method in metricDict.values())
+    if not native or any(column in groupList for column in metricDict):
+        needed = groupList + [column for column in metricDict if column not in groupList]
+        return query.collect(keep, needed).groupby(groupList).agg(metricDict).reset_index()
+
+    for column in groupList:
+        present = ~query.isNull(query.column(column))
+        keep = present if keep is None else keep & present
+    return query.aggregate(keep, groupList, metricDict)
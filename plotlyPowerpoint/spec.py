@@ -0,0 +1,288 @@
+from pptx.dml.color import RGBColor
+from plotlyPowerpoint.filters import _parseFilter
+from plotlyPowerpoint.decimate import _decimateTypes, _decimateMethods
+from plotlyPowerpoint.sources import _isSource, _isPath, _sourceColumns
+import numbers
+import os
+import pandas as pd
+
+#chart types that can be built, and the ones split into facets
+_chartTypes = ['line', 'bar', 'facetLine', 'facetBar', 'filledLine', 'facetFilledLine', 'table']
+_facetTypes = ['facetLine', 'facetBar', 'facetFilledLine']
+
+#methods a metric can be summarised with, on top of any function that reduces a column to one value
+#each one is a pandas groupby reduction, so the grouped data keeps one row per group
+_metricMethods = ['sum', 'mean', 'median', 'min', 'max', 'count', 'nunique', 'std', 'var', 'sem', 'prod', 'first', 'last', 'size', 'skew']
+
+#image settings a chart can have
+_imageSettings = ['dpi', 'scale', 'format', 'quantize', 'colors', 'quality', 'max-bytes']
+
+#image formats that can be exported and put on a slide
+_imageFormats = ['png', 'jpeg', 'jpg', 'auto']
+
+#whole number image settings, and the lowest and highest each one can be
+_imageRanges = {
+    'colors': (1, 256),
+    'quality': (1, 100),
+    'max-bytes': (1, None)
+}
+
+#placeholders a chart fills in, and the key in the chart definition that needs each one
+_placeholderKeys = [('chart', None), ('title', 'name'), ('description', 'description'), ('subtitle', 'subtitle')]
+
+#table colors, given as hex strings
+_tableColors = ['text_color', 'header_text_color', 'header_fill_color']
+
+#a chart definition that has been checked against its data and the template
+#holds the definition, with any defaults filled in, and the grouping and metrics the build works out from it up front
+#everything else is still read from the definition as each chart is drawn, which is safe once it has been checked
+class ChartSpec:
+    __slots__ = ['index', 'name', 'type', 'definition', 'groupList', 'metricDict']
+
+    def __init__(self, index, definition):
+        self.index = index
+        self.name = definition.get('name')
+        self.type = definition['type']
+        self.definition = definition
+        self.groupList = _groupList(definition)
+        self.metricDict = _metricDict(definition)
+
+    def __repr__(self):
+        return 'ChartSpec(' + str(self.index) + ', ' + repr(self.type) + ', ' + repr(self.name) + ')'
+
+#function to get the columns a chart's data is grouped by, or None for tables
+def _groupList(chartDefinition):
+    if chartDefinition['type'] == 'table':
+        return None
+
+    #assembe list
+    groupList = []
+    if 'color' in chartDefinition:
+        groupList.append(chartDefinition['color'])
+
+    #add axis
+    groupList.append(chartDefinition['axis'])
+
+    #add facet if included
+    if 'facet' in chartDefinition:
+        groupList.append(chartDefinition['facet'])
+
+    return groupList
+
+#function to get the metrics a chart's data is summarised with, or None for tables
+def _metricDict(chartDefinition):
+    if chartDefinition['type'] == 'table':
+        return None
+
+    #assemble dictionary for aggregation
+    metricDict = {}
+    for metric in chartDefinition["metrics"]:
+        metricDict[metric["name"]] = metric["method"]
+
+    return metricDict
+
+#function to check image settings, for one chart or for the whole deck
+def _imageSettingsProblems(settings):
+    if not isinstance(settings, dict):
+        return ["image settings must be a dictionary"]
+
+    unknown = [key for key in settings if key not in _imageSettings]
+    if unknown:
+        return ["unknown image settings " + ', '.join(repr(key) for key in unknown)]
+
+    problems = []
+    if 'format' in settings and settings['format'] not in _imageFormats:
+        problems.append("image format " + repr(settings['format']) + " must be one of " + ', '.join(_imageFormats))
+
+    for key in ['dpi', 'scale']:
+        if key in settings:
+            try:
+                number = float(settings[key])
+            except (TypeError, ValueError):
+                number = None
+            if number is None or not 0 < number < float('inf'):
+                problems.append("image " + key + " " + repr(settings[key]) + " must be a positive number")
+
+    for key, (low, high) in _imageRanges.items():
+        if key in settings:
+            number = _wholeNumber(settings[key])
+            if number is None or number < low or (high is not None and number > high):
+                problems.append("image " + key + " " + repr(settings[key]) + " must be a whole number " + ("from " + str(low) + " to " + str(high) if high is not None else "of at least " + str(low)))
+    return problems
+
+#function to read a setting given as a whole number, or as text holding one. Returns None if it isn't one
+def _wholeNumber(value):
+    if type(value) == bool:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+#function to check where a chart goes in the template
+#layouts holds the placeholder indexes on each slide layout
+def _placeholderProblems(chartDefinition, layouts):
+    itemIndex = chartDefinition.get('item-index')
+    if not isinstance(itemIndex, dict):
+        return ["needs an 'item-index' giving its slide layout and placeholders"]
+
+    layout = itemIndex.get('slide')
+    if not isinstance(layout, numbers.Integral) or not 0 <= layout < len(layouts):
+        return ["slide layout " + repr(layout) + " is not in the template, which has " + str(len(layouts)) + " layouts"]
+
+    problems = []
+    for key, needs in _placeholderKeys:
+        if needs is not None and needs not in chartDefinition:
+            continue
+        if key not in itemIndex:
+            problems.append("needs a '" + key + "' placeholder in its 'item-index'")
+        elif itemIndex[key] not in layouts[layout]:
+            problems.append("placeholder " + repr(itemIndex[key]) + " for its " + key + " is not on slide layout " + str(layout))
+    return problems
+
+#function to check what a chart draws, and that the columns it uses are in its data
+#columns is None when the data can't be looked at up front, like data read in chunks
+def _chartProblems(chartDefinition, columns):
+    chartType = chartDefinition['type']
+    problems = []
+
+    #tables show their data as it is
+    if chartType == 'table':
+        if 'column_formats' not in chartDefinition:
+            problems.append("needs 'column_formats', with a format for each column")
+        elif columns is not None and len(chartDefinition['column_formats']) < len(columns):
+            problems.append("has " + str(len(chartDefinition['column_formats'])) + " column_formats for " + str(len(columns)) + " columns")
+
+        for key in _tableColors:
+            if key in chartDefinition:
+                try:
+                    RGBColor.from_string(str(chartDefinition[key]).replace('#', ''))
+                except ValueError:
+                    problems.append(key + " " + repr(chartDefinition[key]) + " is not a hex color")
+
+        if 'pagination' in chartDefinition:
+            pagination = chartDefinition['pagination']
+            if not isinstance(pagination, dict):
+                problems.append("'pagination' must be a dictionary")
+            elif 'rows-per-slide' in pagination and (not str(pagination['rows-per-slide']).isdigit() or int(pagination['rows-per-slide']) < 1):
+                problems.append("rows-per-slide must be at least 1")
+        return problems
+
+    used = []
+    for key in ['name', 'axis', 'metrics']:
+        if key not in chartDefinition:
+            problems.append("needs a '" + key + "'")
+    if 'axis' in chartDefinition:
+        used.append(('axis', chartDefinition['axis']))
+    for key in ['color', 'facet']:
+        if key in chartDefinition:
+            used.append((key, chartDefinition[key]))
+
+    metrics = chartDefinition.get('metrics', [])
+    if 'metrics' in chartDefinition and (not isinstance(metrics, list) or not metrics):
+        problems.append("'metrics' must be a list with at least one metric")
+        metrics = []
+
+    #only line and bar charts with more than one metric show the prettyName of each one
+    needs = ['name', 'prettyName', 'method'] if chartType in ['line', 'bar'] and len(metrics) > 1 else ['name', 'method']
+    for metric in metrics:
+        missing = [key for key in needs if not isinstance(metric, dict) or key not in metric]
+        if missing:
+            problems.append("metric " + repr(metric) + " needs " + ', '.join("'" + key + "'" for key in missing))
+            continue
+        if not callable(metric['method']) and metric['method'] not in _metricMethods:
+            problems.append("metric method " + repr(metric['method']) + " must be a function or one of " + ', '.join(_metricMethods))
+        used.append(('metric', metric['name']))
+
+    if chartType in ['filledLine', 'facetFilledLine'] and len(metrics) > 1:
+        problems.append("is a filled line chart, which can only have one metric")
+
+    if chartType in _facetTypes:
+        if 'facet' not in chartDefinition:
+            problems.append("needs a 'facet'")
+        if chartDefinition.get('facet-direction') not in ['rows', 'columns']:
+            problems.append("'facet-direction' must be 'rows' or 'columns'")
+
+    if 'options' in chartDefinition and not isinstance(chartDefinition['options'], dict):
+        problems.append("'options' must be a dictionary")
+
+    for key, column in used:
+        if columns is not None and column not in columns:
+            problems.append(key + " column " + repr(column) + " is not in the data")
+    return problems
+
+#function to find everything wrong with one chart definition
+def _problems(chartDefinition, layouts):
+    if not isinstance(chartDefinition, dict):
+        return ["must be a dictionary"]
+    if chartDefinition.get('type') not in _chartTypes:
+        return ["type " + repr(chartDefinition.get('type')) + " is not one of " + ', '.join(_chartTypes)]
+    if 'data' not in chartDefinition:
+        return ["needs 'data'"]
+
+    data = chartDefinition['data']
+    if _isPath(data) and not os.path.exists(data):
+        return ["data file " + repr(str(data)) + " does not exist"]
+    if _isPath(data) and not _isSource(data):
+        return ["data file " + repr(str(data)) + " is not a parquet, feather or arrow file, or a folder of them"]
+
+    if isinstance(data, pd.DataFrame):
+        columns = set(data.columns)
+    elif _isSource(data):
+        try:
+            columns = set(_sourceColumns(data))
+        except (OSError, ValueError) as error:
+            return ["data can't be read: " + str(error)]
+    else:
+        columns = None
+    problems = _placeholderProblems(chartDefinition, layouts) + _chartProblems(chartDefinition, columns)
+
+    for item in chartDefinition.get('filters', []):
+        try:
+            _parseFilter(item)
+        except (KeyError, TypeError, ValueError) as error:
+            problems.append("filter " + repr(item) + " is not valid: " + str(error))
+            continue
+        if columns is not None and item['variable'] not in columns:
+            problems.append("filter column " + repr(item['variable']) + " is not in the data")
+
+    if 'image-settings' in chartDefinition:
+        problems.extend(_imageSettingsProblems(chartDefinition['image-settings']))
+
+    if chartDefinition.get('native', 'false') not in ['true', 'false']:
+        problems.append("'native' must be 'true' or 'false'")
+
+    if 'decimate' in chartDefinition:
+        if chartDefinition['decimate'] not in _decimateMethods + ['false']:
+            problems.append("'decimate' must be one of " + ', '.join(_decimateMethods + ['false']))
+        elif chartDefinition['decimate'] != 'false' and chartDefinition['type'] not in _decimateTypes:
+            problems.append("only " + ', '.join(_decimateTypes) + " charts can be decimated")
+    if 'decimate-points' in chartDefinition and (not str(chartDefinition['decimate-points']).isdigit() or int(chartDefinition['decimate-points']) < 3):
+        problems.append("'decimate-points' must be at least 3")
+    return problems
+
+#function to check every chart, then compile the ones that are fine into specs
+#raises a ValueError listing every problem in every chart, so they can all be fixed at once
+def _compileSpecs(charts, layouts):
+    specs = []
+    errors = []
+    for z, chartDefinition in enumerate(charts):
+        if isinstance(chartDefinition, ChartSpec):
+            specs.append(chartDefinition)
+            continue
+
+        problems = _problems(chartDefinition, layouts)
+        if problems:
+            label = 'chart ' + str(z) + (' (' + repr(chartDefinition['name']) + ')' if isinstance(chartDefinition, dict) and 'name' in chartDefinition else '')
+            errors.extend(label + ': ' + problem for problem in problems)
+            continue
+
+        #facet charts read their options without checking for them
+        if chartDefinition['type'] in _facetTypes and 'options' not in chartDefinition:
+            chartDefinition = dict(chartDefinition, options={})
+        specs.append(ChartSpec(z, chartDefinition))
+
+    if errors:
+        raise ValueError("Found problems with the chart definitions:\n" + '\n'.join(errors))
+    return specs
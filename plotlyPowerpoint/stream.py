@@ -0,0 +1,89 @@
+from xml.sax.saxutils import quoteattr
+import zipfile
+import os
+
+#content types for parts that aren't listed one by one
+_defaultContentTypes = {
+    'rels': 'application/vnd.openxmlformats-package.relationships+xml',
+    'xml': 'application/xml'
+}
+
+#function to get a package's own relationships, which python-pptx 0.6.22 made private
+def _packageRels(package):
+    return package._rels if hasattr(package, '_rels') else package.rels
+
+#function to build the [Content_Types].xml listing every part in the package
+def _contentTypesXml(parts):
+    xml = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+           '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">']
+    for extension, contentType in _defaultContentTypes.items():
+        xml.append('<Default Extension=' + quoteattr(extension) + ' ContentType=' + quoteattr(contentType) + '/>')
+    for part in parts:
+        xml.append('<Override PartName=' + quoteattr(str(part.partname)) + ' ContentType=' + quoteattr(part.content_type) + '/>')
+    xml.append('</Types>')
+    return ''.join(xml).encode('utf-8')
+
+#writer that saves a presentation to its file as it is built
+#finished slides, and the pictures and charts on them, are written out straight away and then let go,
+#so memory stays about the same however many slides there are. Everything else is written when it is closed
+class _DeckStream:
+
+    def __init__(self, prs, fileName):
+        self.prs = prs
+        self.package = prs.part.package
+        self.fileName = fileName
+        self.file = zipfile.ZipFile(fileName, 'w', zipfile.ZIP_DEFLATED)
+        self.written = set()
+
+        #parts from the template can be shared by later slides, so they are left until the end
+        self.template = set(id(part) for part in self.package.iter_parts())
+
+    #function to write out a part and everything only it leads to, then let go of their contents
+    def _writePart(self, part):
+        if id(part) in self.written or id(part) in self.template:
+            return
+
+        self.file.writestr(part.partname.membername, part.blob)
+        if len(part.rels):
+            self.file.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        self.written.add(id(part))
+
+        for rel in list(part.rels.values()):
+            if not rel.is_external:
+                self._writePart(rel.target_part)
+
+        #the part stays in the package so it is still listed, but its contents can go
+        if hasattr(part, '_element'):
+            part._element = None
+        else:
+            part._blob = b''
+        for name in ['slide', 'chart']:
+            part.__dict__.pop(name, None)
+
+    #function to write out finished slides, given their ids. Slides already written are skipped
+    def writeSlides(self, slideIds):
+        slideIds = set(slideIds)
+        for sldId in reversed(self.prs._element.get_or_add_sldIdLst()):
+            if sldId.id in slideIds:
+                self._writePart(self.prs.part.rels[sldId.rId].target_part)
+                slideIds.discard(sldId.id)
+                if not slideIds:
+                    break
+
+    #function to write out the rest of the presentation and close the file
+    def close(self):
+        parts = list(self.package.iter_parts())
+        for part in parts:
+            if id(part) not in self.written:
+                self.file.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    self.file.writestr(part.partname.rels_uri.membername, part.rels.xml)
+
+        self.file.writestr('_rels/.rels', _packageRels(self.package).xml)
+        self.file.writestr('[Content_Types].xml', _contentTypesXml(parts))
+        self.file.close()
+
+    #function to give up on the file if the build fails part way, so no broken file is left behind
+    def discard(self):
+        self.file.close()
+        os.remove(self.fileName)
@@ -0,0 +1,205 @@
+from pptx.dml.color import RGBColor
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Emu, Pt
+from xml.sax.saxutils import escape
+import pandas as pd
+import numpy as np
+import math
+
+#table style and row height python-pptx gives a new table
+_tableStyleId = '{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}'
+_rowHeight = 370840
+
+#function to build the border xml shared by every cell, the same as _set_cell_border
+def _cellBorders(border_color="000000", border_width='12700'):
+    borders = ''
+    for line in ['a:lnL', 'a:lnR', 'a:lnT', 'a:lnB']:
+        borders += ('<' + line + ' w="' + border_width + '" cap="flat" cmpd="sng" algn="ctr">'
+                    '<a:NoFill><a:srgbClr val="' + border_color + '"/></a:NoFill>'
+                    '<a:prstDash val="solid"/><a:round/>'
+                    '<a:headEnd type="none" w="med" len="med"/><a:tailEnd type="none" w="med" len="med"/>'
+                    '</' + line + '>')
+    return borders
+
+#function to turn a color from a chart definition into the hex string used in the xml
+def _hexColor(colorString):
+    return str(RGBColor.from_string(colorString.replace('#', '')))
+
+#function to build the fill xml for a cell, from a hex color
+def _cellFill(color):
+    return '<a:solidFill><a:srgbClr val="' + color + '"/></a:solidFill>'
+
+#function to build the paragraph properties setting the text color and size of a cell
+def _paragraphProperties(color=None, size=None):
+    if color is None and size is None:
+        return ''
+
+    size = '' if size is None else ' sz="' + str(Pt(int(size)).centipoints) + '"'
+    if color is None:
+        return '<a:pPr><a:defRPr' + size + '/></a:pPr>'
+    return '<a:pPr><a:defRPr' + size + '>' + _cellFill(color) + '</a:defRPr></a:pPr>'
+
+#function to build the text xml for a cell. Only the first paragraph gets the properties, like setting paragraphs[0].font
+def _cellText(text, paragraphProperties):
+    paragraphs = []
+    for line in text.split('\n'):
+        runs = '<a:br/>'.join('<a:r><a:t>' + escape(part) + '</a:t></a:r>' if part else '' for part in line.split('\v'))
+        properties = paragraphProperties if not paragraphs else ''
+        paragraphs.append('<a:p>' + properties + runs + '</a:p>' if properties or runs else '<a:p/>')
+    return '<a:txBody><a:bodyPr/><a:lstStyle/>' + ''.join(paragraphs) + '</a:txBody>'
+
+#function to format a single value, for columns that can't be formatted all at once
+def _formatValue(text, textFormat):
+
+    #catch Nan values for numeric based values
+    if 'float' in str(type(text)) or 'int' in str(type(text)):
+        if math.isnan(text):
+            return ''
+
+    #catch Nan values for string based values
+    if text is None:
+        return ''
+
+    if textFormat == 'number':
+        return str(int(text))
+    elif textFormat == 'money':
+        return "$" + str(int(text))
+    elif textFormat == 'percent':
+        return str(int(text * 100)) + "%"
+    elif textFormat == 'twoDigitNum':
+        return str(round(text, 2))
+    elif textFormat == 'date':
+        return text.strftime('%m/%d/%Y')
+    return str(text)
+
+#function to format a whole column of a table at once, giving the text for each of its cells
+#gives the same text as formatting each value on its own, with missing values left blank
+def _formatColumn(column, textFormat):
+    values = column.to_numpy()
+    kind = values.dtype.kind
+
+    if kind in 'iuf' and textFormat in ['number', 'money', 'percent']:
+        missing = np.isnan(values) if kind == 'f' else None
+        if missing is not None:
+            values = np.where(missing, 0, values)
+        if textFormat == 'percent':
+            values = values * 100
+
+        #int() rounds toward zero. Values too big for int64 are left to int(), which handles any size
+        if values.dtype.kind == 'f':
+            if len(values) and not np.abs(values).max() < 2 ** 63:
+                return [_formatValue(text, textFormat) for text in column.to_numpy()]
+            values = np.trunc(values).astype('int64')
+        text = values.astype(str)
+
+        if textFormat == 'money':
+            text = np.char.add('$', text)
+        elif textFormat == 'percent':
+            text = np.char.add(text, '%')
+    elif kind in 'iuf' and textFormat == 'twoDigitNum':
+        missing = np.isnan(values) if kind == 'f' else None
+        text = np.round(values, 2).astype(str)
+    elif kind == 'M' and textFormat == 'date':
+        return column.dt.strftime('%m/%d/%Y').fillna('').tolist()
+    elif kind in 'iufbO' and textFormat not in ['number', 'money', 'percent', 'twoDigitNum', 'date']:
+        missing = column.isna().to_numpy()
+        text = values.astype(str)
+    else:
+        return [_formatValue(text, textFormat) for text in values]
+
+    if missing is not None:
+        text = np.where(missing, '', text)
+    return text.tolist()
+
+#function to get the text for every cell in the body of a table, one list per column
+def _tableText(temp, chartDefinition):
+    return [_formatColumn(temp.iloc[:, i2], chartDefinition['column_formats'][i2]) for i2 in range(len(temp.columns))]
+
+#function to split the rows of a table into pages of at most rowsPerPage rows
+#data can be a dataframe or an iterator of dataframe chunks, which is read one chunk at a time
+def _tablePages(data, rowsPerPage):
+    if isinstance(data, pd.DataFrame):
+        data = [data]
+
+    pending = []
+    pendingRows = 0
+    empty = None
+    for chunk in data:
+        empty = chunk.iloc[:0]
+        start = 0
+        while start < len(chunk):
+            take = min(rowsPerPage - pendingRows, len(chunk) - start)
+            pending.append(chunk.iloc[start:start + take])
+            pendingRows += take
+            start += take
+
+            if pendingRows == rowsPerPage:
+                yield pending[0] if len(pending) == 1 else pd.concat(pending)
+                pending = []
+                pendingRows = 0
+                empty = None
+
+    #an empty table still gets a page for its header
+    if pending:
+        yield pending[0] if len(pending) == 1 else pd.concat(pending)
+    elif empty is not None:
+        yield empty
+
+#function to build the whole a:tbl element for a table in one pass
+#header is the list of column names, or None to leave out the header row, cells is the text for the body, one list per column
+#fillData is a dataframe with the fill color for each cell of the body, or None
+def _tableXml(header, cells, chartDefinition, width, fillData=None):
+    cols = len(cells)
+    rows = len(cells[0]) if cols else 0
+
+    #fragments shared by every cell
+    borders = _cellBorders()
+    textColor = _hexColor(chartDefinition['text_color']) if 'text_color' in chartDefinition else None
+    headerColor = _hexColor(chartDefinition['header_text_color']) if 'header_text_color' in chartDefinition else textColor
+    headerProperties = _paragraphProperties(headerColor, chartDefinition.get('header_font_size'))
+    bodyProperties = _paragraphProperties(textColor, chartDefinition.get('text_font_size'))
+    headerTcPr = '<a:tcPr>' + borders + (_cellFill(_hexColor(chartDefinition['header_fill_color'])) if 'header_fill_color' in chartDefinition else '') + '</a:tcPr>'
+    bodyTcPr = '<a:tcPr>' + borders + '</a:tcPr>'
+
+    #the fill color for each cell of the body, one list per column
+    fills = None
+    if fillData is not None:
+        fills = [fillData.iloc[:, i2].str.replace('#', '', regex=False).str.upper().tolist() for i2 in range(cols)]
+
+    #adjust width of last col to absorb any div error
+    colWidth = width // cols
+    grid = ''.join('<a:gridCol w="' + str(colWidth if i2 < cols - 1 else width - (cols - 1) * colWidth) + '"/>' for i2 in range(cols))
+
+    #without a header row, the first row of the body shouldn't be styled as one
+    firstRow = '0' if header is None else '1'
+    xml = ['<a:tbl ' + nsdecls('a') + '><a:tblPr firstRow="' + firstRow + '" bandRow="1"><a:tableStyleId>' + _tableStyleId + '</a:tableStyleId></a:tblPr>',
+           '<a:tblGrid>' + grid + '</a:tblGrid>']
+    if header is not None:
+        xml.append('<a:tr h="' + str(_rowHeight) + '">')
+        for i2 in range(cols):
+            xml.append('<a:tc>' + _cellText(str(header[i2]), headerProperties) + headerTcPr + '</a:tc>')
+        xml.append('</a:tr>')
+
+    for i in range(rows):
+        xml.append('<a:tr h="' + str(_rowHeight) + '">')
+        for i2 in range(cols):
+            tcPr = bodyTcPr if fills is None else '<a:tcPr>' + borders + _cellFill(fills[i2][i]) + '</a:tcPr>'
+            xml.append('<a:tc>' + _cellText(cells[i2][i], bodyProperties) + tcPr + '</a:tc>')
+        xml.append('</a:tr>')
+    xml.append('</a:tbl>')
+
+    return parse_xml(''.join(xml))
+
+#function to put a table into a placeholder, building the table xml in one go instead of cell by cell
+#returns the graphic frame holding the table
+def _insertTable(placeholder, header, cells, chartDefinition, fillData=None):
+    rows = (len(cells[0]) if cells else 0) + (0 if header is None else 1)
+    width = placeholder.width
+    shape = placeholder.insert_table(rows=1, cols=len(cells))
+
+    #swap in the full table, and size the frame like python-pptx would for this many rows
+    tbl = shape._element.xpath('.//a:tbl')[0]
+    tbl.getparent().replace(tbl, _tableXml(header, cells, chartDefinition, width, fillData))
+    shape.height = Emu(rows * _rowHeight)
+    return shape
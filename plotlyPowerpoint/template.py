@@ -0,0 +1,90 @@
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.package import XmlPart, _Relationship, _Relationships
+from pptx.util import lazyproperty
+import copy
+import io
+import os
+
+#parts building a deck only ever reads, so every copy of a template can share them
+_sharedTypes = [CT.PML_SLIDE_MASTER, CT.PML_SLIDE_LAYOUT, CT.PML_NOTES_MASTER, CT.PML_HANDOUT_MASTER, CT.OFC_THEME]
+
+#function to get the fields of a package or part, without the values python-pptx has worked out and cached on it
+def _fields(item):
+    return {name: value for name, value in item.__dict__.items() if not isinstance(getattr(type(item), name, None), lazyproperty)}
+
+#function to copy a set of relationships, pointing them at the copied parts
+def _copyRels(rels, parts):
+    copied = _Relationships(rels._base_uri)
+    for rId, rel in rels.items():
+        target = rel._target if rel.is_external else parts.get(id(rel._target), rel._target)
+        copied._rels[rId] = _Relationship(rel._base_uri, rId, rel._reltype, rel._target_mode, target)
+    return copied
+
+#function to copy a package, only copying the xml of the parts a deck can change
+#masters, layouts, themes and binary parts like images and fonts are shared with the original
+#this works on how python-pptx keeps parts and relationships internally, which is why its version is pinned
+def _copyPackage(package):
+    copied = object.__new__(type(package))
+    copied.__dict__.update(_fields(package))
+
+    #copies of the parts, by the id of the original
+    parts = {}
+    originals = [part for part in package.iter_parts() if isinstance(part, XmlPart) and part.content_type not in _sharedTypes]
+    for part in originals:
+        new = object.__new__(type(part))
+        new.__dict__.update(_fields(part))
+        new._package = copied
+        new._element = copy.deepcopy(part._element)
+        parts[id(part)] = new
+
+    for part in originals:
+        parts[id(part)].__dict__['_rels'] = _copyRels(part.rels, parts)
+    copied.__dict__['_rels'] = _copyRels(package._rels, parts)
+    return copied
+
+#a powerpoint template, read and parsed once
+#hands out a fresh, independent presentation for each deck by copying the parsed template in memory
+#only the presentation and its slides are copied, the rest is shared since building a deck never changes it
+class Template:
+
+    def __init__(self, fileName):
+        self.fileName = fileName
+        with open(fileName, 'rb') as f:
+            self._prs = Presentation(io.BytesIO(f.read()))
+
+        #the layouts, and the placeholders on each one by index
+        self.layouts = []
+        for layout in self._prs.slide_layouts:
+            placeholders = {}
+            for placeholder in layout.placeholders:
+                placeholders[placeholder.placeholder_format.idx] = {
+                    'name': placeholder.name,
+                    'type': str(placeholder.placeholder_format.type),
+                    'left': placeholder.left,
+                    'top': placeholder.top,
+                    'width': placeholder.width,
+                    'height': placeholder.height
+                }
+            self.layouts.append({'name': layout.name, 'placeholders': placeholders})
+
+    #function to get a new presentation from the template, without reading or parsing the file again
+    def presentation(self):
+        return _copyPackage(self._prs.part.package).presentation_part.presentation
+
+    #function to get the placeholders on a layout, by index
+    def placeholders(self, layout):
+        return self.layouts[layout]['placeholders']
+
+#templates already loaded, by path, along with the size and modified time of the file when it was loaded
+_templates = {}
+
+#function to get the template for a file, only loading it again if the file has changed
+def _loadTemplate(fileName):
+    stat = os.stat(fileName)
+    path = os.path.abspath(fileName)
+    stamp = (stat.st_size, stat.st_mtime)
+
+    if path not in _templates or _templates[path][0] != stamp:
+        _templates[path] = (stamp, Template(fileName))
+    return _templates[path][1]
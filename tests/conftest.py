@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+#run against the package in this checkout, not an installed copy
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _root)
+
+import plotlyPowerpoint as pp
+
+_template = os.path.join(_root, 'example', 'template.pptx')
+
+#placeholders in the example template
+chartIndex = {'slide': 0, 'title': 0, 'chart': 10, 'description': 11}
+tableIndex = {'slide': 2, 'title': 0, 'chart': 12, 'description': 11}
+
+@pytest.fixture
+def template():
+    pp.setTemplate(_template)
+    return _template
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex
+
+#metric method that takes a while, and keeps track of how many charts are being grouped at once
+class _SlowSum:
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.running = 0
+        self.most = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, column):
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.running -= 1
+        return column.sum()
+
+def _data():
+    return pd.DataFrame({'day': [1, 2], 'sales': [5, 3]})
+
+def _chart(name, method, data=None):
+    return {
+        'data': _data() if data is None else data,
+        'type': 'bar',
+        'name': name,
+        'metrics': [{'name': 'sales', 'method': method}],
+        'axis': 'day',
+        'item-index': chartIndex,
+        'native': 'true'
+    }
+
+def _titles(fileName):
+    return [slide.shapes.title.text for slide in Presentation(fileName).slides if slide.shapes.title is not None]
+
+#slides go in the order of the charts, even when later charts are ready first
+def test_slides_in_order(template, tmp_path):
+    charts = [_chart('Chart ' + str(z), _SlowSum(0.1 if z == 0 else 0.0)) for z in range(4)]
+    seen = []
+    fileName = str(tmp_path / 'deck.pptx')
+    asyncio.run(pp.createSlidesAsync(charts, template, fileName, concurrency=4, onChart=lambda entry: seen.append(entry['index'])))
+
+    assert _titles(fileName)[-4:] == ['Chart 0', 'Chart 1', 'Chart 2', 'Chart 3']
+    assert seen == [0, 1, 2, 3]
+
+#no more than concurrency charts are worked on at once
+def test_concurrency_limit(template, tmp_path):
+    method = _SlowSum(0.05)
+    charts = [_chart('Chart ' + str(z), method) for z in range(6)]
+    asyncio.run(pp.createSlidesAsync(charts, template, str(tmp_path / 'deck.pptx'), concurrency=2))
+
+    assert method.most == 2
+
+#cancelling a build stops it, and leaves no file behind
+def test_cancel_saves_nothing(template, tmp_path):
+    charts = [_chart('Chart ' + str(z), _SlowSum(0.1)) for z in range(10)]
+    fileName = str(tmp_path / 'deck.pptx')
+
+    async def cancelBuild():
+        task = asyncio.ensure_future(pp.createSlidesAsync(charts, template, fileName, concurrency=1))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelBuild())
+    assert not os.path.exists(fileName)
+
+#charts that need the same data at the same time only work it out once
+def test_same_data_worked_out_once(template, tmp_path):
+    data = _data()
+    method = _SlowSum(0.05)
+    charts = [_chart('Chart ' + str(z), method, data) for z in range(3)]
+    report = asyncio.run(pp.createSlidesAsync(charts, template, str(tmp_path / 'deck.pptx'), concurrency=3))
+
+    assert report['aggregation-cache'] == {'hits': 2, 'misses': 1}
+    assert method.most == 1
@@ -0,0 +1,76 @@
+import os
+import threading
+
+from plotlyPowerpoint.cache import RenderCache
+
+def _fill(folder, count, size):
+    cache = RenderCache(folder)
+    for i in range(count):
+        cache.put('image' + str(i), bytes([i]) * size)
+    return cache
+
+#opening a folder with a smaller limit than it was filled with evicts straight away, least recently used first
+def test_smaller_limit_evicts_on_open(tmp_path):
+    folder = str(tmp_path)
+    _fill(folder, 6, 1000)
+    for i in range(6):
+        os.utime(os.path.join(folder, 'image' + str(i) + '.img'), (i, i))
+
+    cache = RenderCache(folder, maxBytes=2500)
+    assert cache.stats()['bytes'] <= 2500
+    assert cache.stats()['evictions'] == 4
+    assert cache.get('image0') is None
+    assert cache.get('image5') == bytes([5]) * 1000
+    assert sorted(name for name in os.listdir(folder)) == ['image4.img', 'image5.img']
+
+def test_put_and_get(tmp_path):
+    cache = RenderCache(str(tmp_path), maxBytes=2500)
+    cache.put('a', b'x' * 1000)
+    cache.put('b', b'y' * 1000)
+    assert cache.get('a') == b'x' * 1000
+    cache.put('c', b'z' * 1000)
+
+    #b was used least recently, so it goes
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+#an image evicted between being read and being marked as used is still handed back, and isn't counted again
+def test_get_evicted_while_reading(tmp_path, monkeypatch):
+    cache = RenderCache(str(tmp_path))
+    cache.put('a', b'x' * 1000)
+
+    utime = os.utime
+    def evictFirst(path):
+        os.remove(path)
+        cache._size -= cache._index.pop('a')
+        utime(path)
+    monkeypatch.setattr(os, 'utime', evictFirst)
+
+    assert cache.get('a') == b'x' * 1000
+    assert cache.stats()['entries'] == 0 and cache.stats()['bytes'] == 0
+
+#images looked up on one thread while they are added on another keep the size in step with the folder
+def test_get_and_put_on_threads(tmp_path):
+    cache = RenderCache(str(tmp_path), maxBytes=20000)
+    errors = []
+
+    def work(offset):
+        try:
+            for i in range(300):
+                key = 'image' + str((i + offset) % 40)
+                if cache.get(key) is None:
+                    cache.put(key, bytes([i % 256]) * 1000)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    stats = cache.stats()
+    onDisk = sum(os.path.getsize(os.path.join(str(tmp_path), name)) for name in os.listdir(str(tmp_path)) if name.endswith('.img'))
+    assert stats['bytes'] == sum(cache._index.values()) == onDisk
+    assert stats['bytes'] <= 20000
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotlyPowerpoint.decimate import _decimateChart, _lttb, _minMax
+
+#largest triangle three buckets written out one point at a time, the way it was first described
+def _referenceLttb(x, y, target):
+    n = len(x)
+    if target >= n or target < 3:
+        return list(range(n))
+
+    every = (n - 2) / (target - 2)
+    keep = [0]
+    previous = 0
+    for i in range(target - 2):
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+
+        #average of the next bucket, which is only the last point after the last bucket
+        nextStart = end
+        nextEnd = min(int(np.floor((i + 2) * every)) + 1, n)
+        averageX = sum(x[nextStart:nextEnd]) / (nextEnd - nextStart)
+        averageY = sum(y[nextStart:nextEnd]) / (nextEnd - nextStart)
+
+        best, bestArea = start, -1.0
+        for j in range(start, end):
+            area = abs((x[previous] - averageX) * (y[j] - y[previous]) - (x[previous] - x[j]) * (averageY - y[previous])) / 2
+            if area > bestArea:
+                best, bestArea = j, area
+        keep.append(best)
+        previous = best
+    keep.append(n - 1)
+    return keep
+
+#the same points are picked as the reference, for even and uneven buckets and uneven spacing along the axis
+@pytest.mark.parametrize('size,target', [(1000, 100), (1003, 97), (250, 3), (64, 63), (5000, 1000)])
+def test_lttb_matches_reference(size, target):
+    rng = np.random.default_rng(size)
+    x = np.cumsum(rng.random(size) + 0.1)
+    y = np.cumsum(rng.normal(size=size))
+    assert list(_lttb(x, y, target)) == _referenceLttb(list(x), list(y), target)
+
+#too few points to thin out keeps them all
+def test_lttb_keeps_short_traces():
+    x = np.arange(10, dtype=float)
+    assert list(_lttb(x, x, 10)) == list(range(10))
+    assert list(_lttb(x, x, 2)) == list(range(10))
+
+#min-max keeps the ends of the line, and its lowest and highest points
+def test_minmax_keeps_extremes():
+    rng = np.random.default_rng(0)
+    x = np.arange(1000, dtype=float)
+    y = rng.normal(size=1000)
+    keep = _minMax(x, y, 50)
+    assert len(keep) <= 102
+    assert {0, 999, int(np.argmin(y)), int(np.argmax(y))} <= set(keep)
+
+def _stack(colors=4, points=2000):
+    rng = np.random.default_rng(2)
+    frames = []
+    for color in range(colors):
+        frames.append(pd.DataFrame({
+            'day': pd.date_range('2020-01-01', periods=points, freq='h'),
+            'team': 'team' + str(color),
+            'hours': rng.random(points) * (color + 1)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+#every color in a stacked area keeps a point at the same places along the axis, so the stack still lines up
+def test_stacked_areas_share_points():
+    data = _stack()
+    chartDefinition = {'type': 'filledLine', 'axis': 'day', 'color': 'team', 'metrics': [{'name': 'hours', 'method': 'sum'}], 'decimate': 'lttb', 'decimate-points': 200}
+    result = _decimateChart(chartDefinition, data)
+
+    assert len(result) < len(data)
+    places = [set(group['day']) for team, group in result.groupby('team')]
+    assert len(places) == 4
+    assert all(place == places[0] for place in places)
+
+#lines with a color are each thinned out on their own, keeping missing values where they break the line
+def test_lines_thinned_per_trace():
+    data = _stack(colors=2)
+    data.loc[[10, 2500], 'hours'] = np.nan
+    chartDefinition = {'type': 'line', 'axis': 'day', 'color': 'team', 'metrics': [{'name': 'hours', 'method': 'sum'}], 'decimate': 'lttb', 'decimate-points': 200}
+    result = _decimateChart(chartDefinition, data)
+
+    assert list(result.index) == sorted(result.index)
+    assert {10, 2500} <= set(result.index)
+    for team, group in result.groupby('team'):
+        assert len(group) <= 202
+        assert group['day'].min() == data['day'].min() and group['day'].max() == data['day'].max()
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex, tableIndex
+
+def _data():
+    rng = np.random.default_rng(3)
+    size = 60
+    return pd.DataFrame({
+        'client': rng.choice(['acme', 'beta', 'core'], size),
+        'region': rng.choice(['east', 'west', 'north'], size),
+        'month': rng.integers(1, 5, size),
+        'sales': rng.integers(1, 100, size)
+    })
+
+def _charts(data):
+    return [
+        {'data': data, 'type': 'bar', 'name': 'Sales by region', 'metrics': [{'name': 'sales', 'method': 'sum'}], 'axis': 'region', 'item-index': chartIndex, 'native': 'true'},
+        {'data': data, 'type': 'line', 'name': 'Sales by month', 'metrics': [{'name': 'sales', 'method': 'mean'}], 'axis': 'month', 'color': 'region', 'item-index': chartIndex, 'native': 'true'},
+        {'data': data, 'type': 'table', 'name': 'Rows', 'column_formats': ['', '', 'number', 'number'], 'item-index': tableIndex,
+         'filters': [{'variable': 'sales', 'operation': '>', 'value': '80', 'type': 'int'}]}
+    ]
+
+#function to read what is on each slide of a deck: its title, and the data in its charts and tables
+def _contents(fileName):
+    slides = []
+    for slide in Presentation(fileName).slides:
+        items = []
+        for shape in slide.shapes:
+            if shape.has_table:
+                items.append([[cell.text for cell in row.cells] for row in shape.table.rows])
+            elif shape.has_chart:
+                plot = shape.chart.plots[0]
+                items.append((list(plot.categories), [(series.name, list(series.values)) for series in plot.series]))
+        slides.append((slide.shapes.title.text if slide.shapes.title is not None else None, items))
+    return slides
+
+#each deck has the same slides as building it on its own, with the data filtered down to its value
+@pytest.mark.parametrize('workers', [None, 2])
+def test_decks_match_filtered_builds(template, tmp_path, monkeypatch, workers):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    pp.createDecks(_charts(data), 'client', template, fileName='decks/{key}.pptx', workers=workers)
+
+    for value in ['acme', 'beta', 'core']:
+        charts = [dict(chartDefinition, filters=chartDefinition.get('filters', []) + [{'variable': 'client', 'operation': '==', 'value': value, 'type': 'str'}])
+                  for chartDefinition in _charts(data)]
+        pp.setTemplate(template)
+        pp.createSlides(charts)
+        assert _contents('decks/' + value + '.pptx') == _contents('output.pptx')
+
+#images found in the cache by decks built in workers are counted in the caller's cache
+def test_worker_cache_stats(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    chart = {'data': data, 'type': 'bar', 'name': 'Sales by region', 'metrics': [{'name': 'sales', 'method': 'sum'}], 'axis': 'region', 'item-index': chartIndex}
+
+    cache = pp.RenderCache(str(tmp_path / 'cache'))
+    pp.createDecks([chart], 'client', template, fileName='decks/{key}.pptx', workers=2, renderCache=cache)
+    assert cache.stats()['misses'] == 3 and cache.stats()['hits'] == 0
+
+    pp.createDecks([chart], 'client', template, fileName='decks/{key}.pptx', workers=2, renderCache=cache)
+    assert cache.stats()['misses'] == 3 and cache.stats()['hits'] == 3
+    assert cache.stats()['entries'] == 3
@@ -0,0 +1,28 @@
+import time
+
+from plotlyPowerpoint.export import ImageExporter
+
+#function to give jobs with no figure, noting when each one is pulled
+def _jobs(events, count):
+    for i in range(count):
+        events.append(('pulled', i))
+        yield i, None, None
+
+#without pipelining, each job is only pulled once the one before it has been dealt with
+def test_not_pipelined_runs_one_at_a_time():
+    events = []
+    for item, image in ImageExporter().iterExport(_jobs(events, 4), pipelined=False):
+        time.sleep(0.01)
+        events.append(('used', item))
+
+    assert events == [(kind, i) for i in range(4) for kind in ['pulled', 'used']]
+
+#pipelined, the next job is pulled while the one before it is still being dealt with
+def test_pipelined_pulls_ahead():
+    events = []
+    for item, image in ImageExporter().iterExport(_jobs(events, 4)):
+        time.sleep(0.01)
+        events.append(('used', item))
+
+    assert events.index(('pulled', 1)) < events.index(('used', 0))
+    assert sorted(events) == sorted((kind, i) for i in range(4) for kind in ['pulled', 'used'])
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotlyPowerpoint.filters import compileFilters
+
+#the statement each filter used to be turned into, and run with eval
+def _statement(item):
+    if item['type'] == 'int':
+        return "temp['" + item['variable'] + "'] " + item['operation'] + " int(" + item['value'] + ")"
+    elif item['type'] in ['str', 'date']:
+        return "temp['" + item['variable'] + "'] " + item['operation'] + " '" + item['value'] + "'"
+    elif item['operation'] == 'in':
+        return "temp['" + item['variable'] + "'].isin(" + str(item['value']) + ")"
+    return "~temp['" + item['variable'] + "'].isin(" + str(item['value']) + ")"
+
+def _evalFilters(temp, filters):
+    for item in filters:
+        temp = temp.loc[eval(_statement(item)), :]
+    return temp
+
+def _data():
+    rng = np.random.default_rng(1)
+    size = 200
+    data = pd.DataFrame({
+        'count': rng.integers(0, 10, size).astype(float),
+        'name': rng.choice(['a', 'b', 'c', None], size),
+        'day': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 60, size), unit='D'),
+    })
+    data['dayText'] = data['day'].dt.strftime('%Y-%m-%d')
+    data.loc[rng.random(size) < 0.1, 'count'] = np.nan
+    return data
+
+_filters = [
+    [{'variable': 'count', 'operation': operation, 'value': '4', 'type': 'int'}] for operation in ['==', '!=', '>', '>=', '<', '<=']
+] + [
+    [{'variable': 'name', 'operation': operation, 'value': 'b', 'type': 'str'}] for operation in ['==', '!=', '>', '<=']
+] + [
+    [{'variable': 'day', 'operation': operation, 'value': '2021-02-01', 'type': 'date'}] for operation in ['==', '!=', '>=', '<']
+] + [
+    [{'variable': 'dayText', 'operation': operation, 'value': '2021-02-01', 'type': 'date'}] for operation in ['==', '>', '<=']
+] + [
+    [{'variable': 'name', 'operation': 'in', 'value': ['a', 'c'], 'type': 'list'}],
+    [{'variable': 'name', 'operation': 'not in', 'value': ['a', 'c'], 'type': 'list'}],
+    [{'variable': 'count', 'operation': 'not in', 'value': [1, 2, 3], 'type': 'list'}],
+    [
+        {'variable': 'count', 'operation': '>', 'value': '2', 'type': 'int'},
+        {'variable': 'name', 'operation': 'not in', 'value': ['a'], 'type': 'list'},
+        {'variable': 'day', 'operation': '<', 'value': '2021-02-15', 'type': 'date'}
+    ]
+]
+
+#compiled filters keep the same rows as the statements they replaced, missing values included
+@pytest.mark.parametrize('filters', _filters)
+def test_filters_match_eval(filters):
+    data = _data()
+    expected = _evalFilters(data, filters)
+    pd.testing.assert_frame_equal(data.loc[compileFilters(filters)(data), :], expected)
@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#builds a deck of a native chart and a table, fingerprinted for the render cache and incremental builds, and lists the modules it loaded
+_build = '''
+import json, sys
+import pandas as pd
+import plotlyPowerpoint as pp
+from conftest import chartIndex, tableIndex
+
+pp.setTemplate(sys.argv[1])
+data = pd.DataFrame({'day': [1, 2], 'sales': [5, 3]})
+pp.createSlides([
+    {'data': data, 'type': 'bar', 'name': 'Native', 'metrics': [{'name': 'sales', 'method': 'sum'}], 'axis': 'day', 'item-index': chartIndex, 'native': 'true'},
+    {'data': data, 'type': 'table', 'name': 'Table', 'column_formats': ['', 'number'], 'item-index': tableIndex}
+], renderCache=pp.RenderCache('cache'), incremental=True)
+print(json.dumps(sorted(sys.modules)))
+'''
+
+#decks of tables and native charts never load plotly
+def test_tables_and_native_skip_plotly(template, tmp_path):
+    path = os.pathsep.join([_root, os.path.join(_root, 'tests')])
+    result = subprocess.run([sys.executable, '-c', _build, template], cwd=tmp_path, capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=path))
+
+    modules = json.loads(result.stdout.splitlines()[-1])
+    assert [m for m in modules if m == 'plotly' or m.startswith('plotly.')] == []
+    assert os.path.exists(tmp_path / 'output.pptx')
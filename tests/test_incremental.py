@@ -0,0 +1,94 @@
+import json
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex
+
+def _chart(name, scale=1):
+    data = pd.DataFrame({'day': [1, 2, 3, 4], 'sales': [scale * value for value in [5, 3, 8, 6]]})
+    return {
+        'data': data,
+        'type': 'line',
+        'name': name,
+        'metrics': [{'name': 'sales', 'method': 'sum'}],
+        'axis': 'day',
+        'item-index': chartIndex
+    }
+
+#function to build the charts on a fresh copy of the template, the way each incremental build starts
+def _build(charts, template):
+    pp.setTemplate(template)
+    return pp.createSlides(charts, native=True, incremental=True)
+
+def _slides():
+    deck = Presentation('output.pptx')
+    return [(slide.slide_id, slide.shapes.title.text if slide.shapes.title is not None else None) for slide in deck.slides]
+
+def _titles():
+    return [title for slideId, title in _slides()]
+
+@pytest.fixture
+def build(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return lambda charts: _build(charts, template)
+
+#a build with nothing changed keeps every slide as it was
+def test_nothing_changed(build):
+    charts = [_chart('First'), _chart('Second'), _chart('Third')]
+    assert build(charts)['incremental'] == {'rebuilt': 3, 'kept': 0}
+    before = _slides()
+
+    assert build(charts)['incremental'] == {'rebuilt': 0, 'kept': 3}
+    assert _slides() == before
+
+    with open('output.manifest.json') as f:
+        manifest = json.load(f)
+    assert len(manifest['charts']) == 3
+
+#only the chart that changed gets a new slide, in the same place as its old one
+def test_one_changed(build):
+    build([_chart('First'), _chart('Second'), _chart('Third')])
+    before = _slides()
+
+    assert build([_chart('First'), _chart('Second', scale=2), _chart('Third')])['incremental'] == {'rebuilt': 1, 'kept': 2}
+    after = _slides()
+    assert [title for slideId, title in after] == [title for slideId, title in before]
+    assert after[-2][0] != before[-2][0]
+    assert after[:-2] == before[:-2] and after[-1] == before[-1]
+
+#a renamed chart is rebuilt with its new title where the old one was
+def test_renamed(build):
+    build([_chart('First'), _chart('Second'), _chart('Third')])
+    before = _titles()
+
+    assert build([_chart('First'), _chart('Renamed'), _chart('Third')])['incremental'] == {'rebuilt': 1, 'kept': 2}
+    assert _titles() == before[:-2] + ['Renamed', 'Third']
+
+#a chart taken off the end has its slide removed, and the rest are kept
+def test_removed(build):
+    build([_chart('First'), _chart('Second'), _chart('Third')])
+    before = _slides()
+
+    assert build([_chart('First'), _chart('Second')])['incremental'] == {'rebuilt': 0, 'kept': 2}
+    assert _slides() == before[:-1]
+
+#a chart added back is built again and goes on the end
+def test_readded(build):
+    build([_chart('First'), _chart('Second'), _chart('Third')])
+    before = _titles()
+    build([_chart('First'), _chart('Second')])
+
+    assert build([_chart('First'), _chart('Second'), _chart('Third')])['incremental'] == {'rebuilt': 1, 'kept': 2}
+    assert _titles() == before
+
+#changing the output outside of a build starts again from the template
+def test_output_changed(build):
+    charts = [_chart('First'), _chart('Second')]
+    build(charts)
+    with open('output.pptx', 'ab') as f:
+        f.write(b'\0')
+
+    assert build(charts)['incremental'] == {'rebuilt': 2, 'kept': 0}
@@ -0,0 +1,96 @@
+import sys
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+from pptx.enum.chart import XL_CHART_TYPE
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex
+
+_palette = ['#112233', 'rgb(68, 85, 102)', '#778899']
+
+def _data():
+    return pd.DataFrame({
+        'day': [1, 2, 3, 1, 2, 3, 1, 2],
+        'team': ['a', 'a', 'a', 'b', 'b', 'b', 'c', 'c'],
+        'sales': [5, 3, 8, 6, 2, 4, 1, 7],
+        'cost': [1, 1, 2, 2, 3, 3, 4, 4]
+    })
+
+def _chart(chartType, metrics, **extra):
+    return dict({'data': _data(), 'type': chartType, 'name': 'Chart', 'metrics': metrics, 'axis': 'day', 'item-index': chartIndex, 'native': 'true'}, **extra)
+
+#function to build charts with the test palette, and get the native charts on each new slide
+def _build(template, charts, monkeypatch):
+    monkeypatch.setattr(sys.modules['plotlyPowerpoint.core'], 'colorPalette', _palette, raising=False)
+    pp.createSlides(charts)
+    slides = list(Presentation('output.pptx').slides)[len(Presentation(template).slides):]
+    return [[shape.chart for shape in slide.shapes if shape.has_chart] for slide in slides]
+
+def _series(chart):
+    return [(series.name, list(series.values)) for series in chart.plots[0].series]
+
+def _fill(item):
+    return str(item.format.fill.fore_color.rgb)
+
+#one metric broken out by color gets a series for each value, colored in order from the palette
+def test_series_by_color(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chart = _build(template, [_chart('line', [{'name': 'sales', 'method': 'sum'}], color='team')], monkeypatch)[0][0]
+
+    assert chart.chart_type == XL_CHART_TYPE.LINE
+    assert list(chart.plots[0].categories) == ['1', '2', '3']
+    assert _series(chart) == [('a', [5, 3, 8]), ('b', [6, 2, 4]), ('c', [1, 7, None])]
+    assert [str(series.format.line.color.rgb) for series in chart.plots[0].series] == ['112233', '445566', '778899']
+    assert chart.has_legend
+
+#each metric is its own series, named by its prettyName
+def test_series_by_metric(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    metrics = [{'name': 'sales', 'method': 'sum', 'prettyName': 'Sales'}, {'name': 'cost', 'method': 'max', 'prettyName': 'Top cost'}]
+    chart = _build(template, [_chart('bar', metrics)], monkeypatch)[0][0]
+
+    assert _series(chart) == [('Sales', [12, 12, 12]), ('Top cost', [4, 4, 3])]
+    assert [_fill(series) for series in chart.plots[0].series] == ['112233', '445566']
+
+#a bar chart with one metric colors each bar, starting over once the palette runs out, and names its series by the column
+def test_bar_point_colors(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chart = _build(template, [_chart('bar', [{'name': 'sales', 'method': 'sum'}], axis='team')], monkeypatch)[0][0]
+
+    series = chart.plots[0].series[0]
+    assert _series(chart) == [('sales', [16, 12, 8])]
+    assert [_fill(series.points[i]) for i in range(3)] == ['112233', '445566', '778899']
+    assert not chart.has_legend
+
+    monkeypatch.setattr(sys.modules['plotlyPowerpoint.core'], 'colorPalette', _palette[:2])
+    pp.setTemplate(template)
+    pp.createSlides([_chart('bar', [{'name': 'sales', 'method': 'sum'}], axis='team')])
+    series = Presentation('output.pptx').slides[-1].shapes[-1].chart.plots[0].series[0]
+    assert [_fill(series.points[i]) for i in range(3)] == ['112233', '445566', '112233']
+
+#bars stand up by default, and horizontal bars run from the top down with the value axis along the bottom
+@pytest.mark.parametrize('orientation, chartType, reversed', [(None, XL_CHART_TYPE.COLUMN_CLUSTERED, False), ('horizontal', XL_CHART_TYPE.BAR_CLUSTERED, True)])
+def test_bar_orientation(template, tmp_path, monkeypatch, orientation, chartType, reversed):
+    monkeypatch.chdir(tmp_path)
+    options = {'horizontal-grid-lines': 'true'}
+    if orientation is not None:
+        options['orientation'] = orientation
+    chart = _build(template, [_chart('bar', [{'name': 'sales', 'method': 'sum'}], options=options, **{'x-axis-title': 'Day', 'y-axis-title': 'Sales'})], monkeypatch)[0][0]
+
+    assert chart.chart_type == chartType
+    assert chart.category_axis.reverse_order == reversed
+    along, up = (chart.value_axis, chart.category_axis) if reversed else (chart.category_axis, chart.value_axis)
+    assert along.axis_title.text_frame.text == 'Day' and up.axis_title.text_frame.text == 'Sales'
+    assert up.has_major_gridlines and not along.has_major_gridlines
+
+#a faceted chart becomes one chart for each facet, titled with the facet and colored by it when asked
+def test_facets(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chart = _chart('facetBar', [{'name': 'sales', 'method': 'sum'}], facet='team', **{'facet-direction': 'columns', 'options': {'color-grouping': 'facet'}})
+    charts = _build(template, [chart], monkeypatch)[0]
+
+    assert [chart.chart_title.text_frame.text for chart in charts] == ['a', 'b', 'c']
+    assert [_series(chart) for chart in charts] == [[('sales', [5, 3, 8])], [('sales', [6, 2, 4])], [('sales', [1, 7])]]
+    assert [_fill(chart.plots[0].series[0]) for chart in charts] == ['112233', '445566', '778899']
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from plotlyPowerpoint.tables import _tablePages
+from conftest import tableIndex
+
+def _data():
+    return pd.DataFrame({'order': ['order ' + str(z) for z in range(12)], 'units': range(12)})
+
+def _table(data, **pagination):
+    return {'data': data, 'type': 'table', 'name': 'Orders', 'column_formats': ['', 'number'], 'item-index': tableIndex,
+            'pagination': dict({'rows-per-slide': 5}, **pagination)}
+
+#function to read the table slides a build added: the title and table rows of each
+def _pages(template, fileName='output.pptx'):
+    slides = list(Presentation(fileName).slides)[len(Presentation(template).slides):]
+    return [(slide.shapes.title.text, [shape for shape in slide.shapes if shape.has_table][0].table) for slide in slides]
+
+def _rows(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+def _body(data):
+    return [[order, str(units)] for order, units in zip(data['order'], data['units'])]
+
+#chunks of any size are regrouped into full pages, and an empty table still gets a page for its header
+def test_table_pages_regroup_chunks():
+    data = _data()
+    chunks = [data.iloc[0:3], data.iloc[3:8], data.iloc[8:8], data.iloc[8:12]]
+    pages = list(_tablePages(iter(chunks), 5))
+
+    assert [len(page) for page in pages] == [5, 5, 2]
+    pd.testing.assert_frame_equal(pd.concat(pages), data)
+    assert [len(page) for page in _tablePages(data.iloc[:0], 5)] == [0]
+
+#rows are split over slides in order, each with the header, and later slides get the continuation title
+def test_pages_repeat_header(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    pp.createSlides([_table(data)])
+    pages = _pages(template)
+
+    assert [title for title, table in pages] == ['Orders', 'Orders (cont.)', 'Orders (cont.)']
+    for page, (title, table) in enumerate(pages):
+        assert _rows(table) == [['order', 'units']] + _body(data.iloc[page * 5:page * 5 + 5])
+
+#without repeat-header only the first slide has the header row
+def test_pages_without_header(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    pp.createSlides([_table(data, **{'repeat-header': 'false'})])
+    pages = _pages(template)
+
+    assert _rows(pages[0][1]) == [['order', 'units']] + _body(data.iloc[0:5])
+    assert _rows(pages[1][1]) == _body(data.iloc[5:10])
+    assert _rows(pages[2][1]) == _body(data.iloc[10:12])
+
+#the continuation title can use the chart name and the page number
+def test_continuation_title(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pp.createSlides([_table(_data(), **{'continuation-title': '{name}, page {page}'})])
+
+    assert [title for title, table in _pages(template)] == ['Orders', 'Orders, page 2', 'Orders, page 3']
+
+#each slide's cells are filled with the colors of its own rows
+def test_pages_fill_color(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    fills = pd.DataFrame([['#0000' + format(z, '02X'), '#00' + format(z, '02X') + '00'] for z in range(12)])
+    pp.createSlides([dict(_table(data), fill_color=fills, text_color='#000000')])
+
+    for page, (title, table) in enumerate(_pages(template)):
+        colors = [['#' + str(cell.fill.fore_color.rgb) for cell in row.cells] for row in list(table.rows)[1:]]
+        assert colors == fills.iloc[page * 5:page * 5 + 5].values.tolist()
+
+#a table given in chunks, and filtered as it is read, gives the same slides as the whole dataframe
+@pytest.mark.parametrize('size', [1, 4, 7, 20])
+def test_chunks_match_dataframe(template, tmp_path, monkeypatch, size):
+    monkeypatch.chdir(tmp_path)
+    data = _data()
+    filters = [{'variable': 'units', 'operation': '!=', 'value': '6', 'type': 'int'}]
+    pp.createSlides([dict(_table(data), filters=filters)])
+    whole = [(title, _rows(table)) for title, table in _pages(template)]
+
+    pp.setTemplate(template)
+    chunks = (data.iloc[z:z + size] for z in range(0, len(data), size))
+    pp.createSlides([dict(_table(chunks), filters=filters)])
+
+    assert [(title, _rows(table)) for title, table in _pages(template)] == whole
+    assert len(whole) == 3
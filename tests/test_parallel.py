@@ -0,0 +1,44 @@
+import hashlib
+
+import pandas as pd
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex, tableIndex
+
+def _charts():
+    first = pd.DataFrame({'day': [1, 2, 3, 4] * 2, 'team': ['a'] * 4 + ['b'] * 4, 'sales': [5, 3, 8, 6, 2, 4, 1, 7]})
+    second = pd.DataFrame({'region': ['east', 'west', 'north'] * 10, 'units': range(30)})
+    sales = [{'name': 'sales', 'method': 'sum'}]
+    units = [{'name': 'units', 'method': 'sum'}]
+    return [
+        {'data': first, 'type': 'line', 'name': 'Sales by day', 'metrics': sales, 'axis': 'day', 'color': 'team', 'item-index': chartIndex},
+        {'data': second, 'type': 'bar', 'name': 'Units by region', 'metrics': units, 'axis': 'region', 'item-index': chartIndex},
+        {'data': second, 'type': 'table', 'name': 'Units', 'column_formats': ['', 'number'], 'item-index': tableIndex, 'pagination': {'rows-per-slide': 12}},
+        {'data': first, 'type': 'bar', 'name': 'Sales by team', 'metrics': sales, 'axis': 'team', 'item-index': chartIndex, 'native': 'true'},
+        {'data': first, 'type': 'line', 'name': 'Mean sales', 'metrics': [{'name': 'sales', 'method': 'mean'}], 'axis': 'day', 'item-index': chartIndex},
+        {'data': second, 'type': 'line', 'name': 'Units by region again', 'metrics': units, 'axis': 'region', 'item-index': chartIndex}
+    ]
+
+#function to read each slide of a deck: its title, the kinds of shapes on it, and its pictures
+def _contents(fileName):
+    slides = []
+    for slide in Presentation(fileName).slides:
+        kinds = sorted(str(shape.shape_type) for shape in slide.shapes)
+        pictures = [hashlib.sha1(shape.image.blob).hexdigest() for shape in slide.shapes if hasattr(shape, 'image')]
+        slides.append((slide.shapes.title.text if slide.shapes.title is not None else None, kinds, pictures))
+    return slides
+
+#rendering in worker processes puts the slides in the same order, with the same contents, as rendering one by one
+def test_workers_keep_order(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pp.createSlides(_charts())
+    sequential = _contents('output.pptx')
+
+    pp.setTemplate(template)
+    pp.createSlides(_charts(), workers=2)
+    parallel = _contents('output.pptx')
+
+    assert parallel == sequential
+    assert [title for title, kinds, pictures in sequential][-8:] == ['Sales by day', 'Units by region', 'Units', 'Units (cont.)', 'Units (cont.)',
+                                                                     'Sales by team', 'Mean sales', 'Units by region again']
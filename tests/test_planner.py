@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotlyPowerpoint.planner import _PlanGroup, _planCharts
+
+def _data():
+    rng = np.random.default_rng(0)
+    size = 500
+    data = pd.DataFrame({
+        'region': rng.choice(['east', 'west', 'north', None], size),
+        'month': rng.integers(1, 13, size).astype(float),
+        'product': rng.choice(['a', 'b', 'c'], size),
+        'sales': rng.random(size) * 100,
+        'units': rng.integers(0, 50, size)
+    })
+
+    #missing group keys and missing values
+    data.loc[rng.random(size) < 0.05, 'month'] = np.nan
+    data.loc[rng.random(size) < 0.1, 'sales'] = np.nan
+    return data
+
+#every grouping rolled up from the finest one matches grouping the raw data directly
+@pytest.mark.parametrize('method', ['sum', 'mean', 'count', 'min', 'max'])
+def test_rollup_matches_groupby(method):
+    data = _data()
+    groupLists = [['region', 'month'], ['month'], ['product', 'region'], ['region']]
+    metricDict = {'sales': method, 'units': method}
+
+    group = _PlanGroup(data, [])
+    for groupList in groupLists:
+        group.add(groupList, metricDict)
+
+    for groupList in groupLists:
+        expected = data.groupby(groupList).agg(metricDict).reset_index()
+        pd.testing.assert_frame_equal(group.rollUp(groupList, metricDict), expected)
+
+#charts can ask for different methods of the same column
+def test_rollup_mixed_methods():
+    data = _data()
+    group = _PlanGroup(data, [{'variable': 'product', 'operation': '!=', 'value': 'c', 'type': 'str'}])
+    group.add(['region'], {'sales': 'mean', 'units': 'max'})
+    group.add(['month'], {'sales': 'count', 'units': 'sum'})
+
+    filtered = data.loc[data['product'] != 'c', :]
+    for groupList, metricDict in [(['region'], {'sales': 'mean', 'units': 'max'}), (['month'], {'sales': 'count', 'units': 'sum'})]:
+        expected = filtered.groupby(groupList).agg(metricDict).reset_index()
+        pd.testing.assert_frame_equal(group.rollUp(groupList, metricDict), expected)
+
+#charts over the same data share a group, as long as there is more than one grouping to get
+def test_plan_groups_charts():
+    data = _data()
+    other = _data()
+    charts = [{'data': data}, {'data': data}, {'data': other}, {'data': data, 'filters': [{'variable': 'product', 'operation': '==', 'value': 'a', 'type': 'str'}]}]
+    groupLists = [['region'], ['month'], ['region'], ['region']]
+    metricDicts = [{'sales': 'sum'}, {'sales': 'mean'}, {'sales': 'sum'}, {'sales': 'sum'}]
+
+    plan = _planCharts(charts, groupLists, metricDicts)
+    assert plan[0] is not None and plan[0] is plan[1]
+    assert plan[2] is None
+    assert plan[3] is None
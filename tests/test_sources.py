@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plotlyPowerpoint.filters import compileFilters
+from plotlyPowerpoint.sources import _engine, _queryData
+
+def _data():
+    rng = np.random.default_rng(1)
+    size = 2000
+    data = pd.DataFrame({
+        'day': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 365, size), unit='D'),
+        'color': rng.choice(['a', 'b', 'c', None], size),
+        'g': rng.integers(0, 5, size),
+        'sales': np.where(rng.random(size) < 0.1, np.nan, rng.random(size) * 100),
+        'units': rng.integers(0, 10, size)
+    })
+    data['dayText'] = data['day'].dt.strftime('%Y-%m-%d')
+    return data
+
+#function to hand the data to an engine, skipping the test if it isn't installed
+def _source(engine, data, folder):
+    if engine == 'polars':
+        pl = pytest.importorskip('polars')
+        return pl.from_pandas(data)
+    elif engine == 'polars lazy':
+        pl = pytest.importorskip('polars')
+        return pl.from_pandas(data).lazy()
+    elif engine == 'arrow':
+        pa = pytest.importorskip('pyarrow')
+        return pa.Table.from_pandas(data, preserve_index=False)
+    elif engine == 'duckdb':
+        duckdb = pytest.importorskip('duckdb')
+        return duckdb.from_df(data)
+
+    pq = pytest.importorskip('pyarrow.parquet')
+    pa = pytest.importorskip('pyarrow')
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    if engine == 'parquet':
+        path = str(folder / 'data.parquet')
+        pq.write_table(table, path, row_group_size=500)
+        return path
+
+    #a folder partitioned by g, like g=1/
+    path = str(folder / 'data')
+    pq.write_to_dataset(table, path, partition_cols=['g'])
+    return path
+
+_filterSets = [
+    [],
+    [{'variable': 'g', 'operation': '>=', 'value': '1', 'type': 'int'}],
+    [{'variable': 'color', 'operation': '!=', 'value': 'a', 'type': 'str'}],
+    [{'variable': 'color', 'operation': 'in', 'value': ['a', 'b']}],
+    [{'variable': 'color', 'operation': 'not in', 'value': ['a', 'b']}],
+    [{'variable': 'day', 'operation': 'between', 'value': ['2020-03-01', '2020-06-01'], 'type': 'date'}],
+    [{'variable': 'dayText', 'operation': '>', 'value': '2020-06-01', 'type': 'date'}],
+    [{'variable': 'color', 'operation': 'regex', 'value': '^[ab]'}],
+    [{'variable': 'color', 'operation': 'not regex', 'value': '^[ab]'}],
+    [{'variable': 'sales', 'operation': 'is null'}],
+    [{'variable': 'sales', 'operation': 'is not null'}, {'variable': 'units', 'operation': '<', 'value': 5, 'type': 'int'}]
+]
+
+_metricSets = [
+    {'sales': 'sum', 'units': 'mean'},
+    {'sales': 'count', 'units': 'max'},
+    {'sales': 'median', 'units': 'nunique'},
+    {'sales': 'std', 'units': 'min'},
+    {'sales': lambda column: column.sum()}
+]
+
+#filtering and grouping in another engine gives the same result as doing it in pandas
+@pytest.mark.parametrize('filters', _filterSets)
+@pytest.mark.parametrize('engine', ['polars', 'polars lazy', 'arrow', 'duckdb', 'parquet', 'parquet folder'])
+def test_query_matches_pandas(engine, filters, tmp_path):
+    data = _data()
+    source = _source(engine, data, tmp_path)
+    assert _engine(source) is not None
+    filtered = data.loc[compileFilters(filters)(data), :]
+
+    for groupList in [['color', 'day'], ['g']]:
+        for metricDict in _metricSets:
+            expected = filtered.groupby(groupList).agg(metricDict).reset_index()
+            result = _queryData(source, filters, groupList, metricDict)
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_exact=False, rtol=1e-6)
+
+    #tables get every column of the filtered rows, in any order
+    expected = filtered.sort_values(list(data.columns)).reset_index(drop=True)
+    result = _queryData(source, filters, None, None)
+    result = result[list(data.columns)].sort_values(list(data.columns)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex
+
+def _data():
+    return pd.DataFrame({'day': [1, 2, 3], 'region': ['a', 'b', 'a'], 'sales': [1.0, 2.0, 3.0], 'units': [1, 2, 3]})
+
+#charts that read a metric's prettyName only when they have more than one metric
+def test_single_metric_needs_no_pretty_name(template):
+    metrics = [{'name': 'sales', 'method': 'sum'}]
+    charts = [
+        {'data': _data(), 'type': 'line', 'name': 'Line', 'axis': 'day', 'metrics': metrics, 'item-index': chartIndex},
+        {'data': _data(), 'type': 'bar', 'name': 'Bar', 'axis': 'region', 'metrics': metrics, 'item-index': chartIndex},
+        {'data': _data(), 'type': 'facetBar', 'name': 'Facet', 'axis': 'day', 'facet': 'region', 'facet-direction': 'rows',
+         'metrics': metrics, 'item-index': chartIndex}
+    ]
+    assert len(pp.compileCharts(charts)) == 3
+
+def test_several_metrics_need_pretty_names(template):
+    metrics = [{'name': 'sales', 'method': 'sum'}, {'name': 'units', 'prettyName': 'Units', 'method': 'sum'}]
+    chart = {'data': _data(), 'type': 'line', 'name': 'Line', 'axis': 'day', 'metrics': metrics, 'item-index': chartIndex}
+    with pytest.raises(ValueError, match="needs 'prettyName'"):
+        pp.compileCharts([chart])
+
+#a metric method pandas can't group by is caught up front, not once the charts before it are built
+def test_unknown_metric_method(template):
+    chart = {'data': _data(), 'type': 'line', 'name': 'Line', 'axis': 'day', 'metrics': [{'name': 'sales', 'method': 'summ'}], 'item-index': chartIndex}
+    with pytest.raises(ValueError, match="metric method 'summ' must be a function or one of"):
+        pp.compileCharts([chart])
+
+def test_metric_methods_pass(template):
+    charts = [{'data': _data(), 'type': 'line', 'name': 'Line', 'axis': 'day', 'metrics': [{'name': 'sales', 'method': method}], 'item-index': chartIndex}
+              for method in ['mean', 'nunique', 'size', lambda column: column.max() - column.min()]]
+    assert len(pp.compileCharts(charts)) == 4
+
+def test_every_problem_is_listed(template):
+    charts = [
+        {'data': _data(), 'type': 'line', 'name': 'Line', 'axis': 'missing', 'metrics': [{'name': 'sales', 'method': 'sum'}], 'item-index': chartIndex},
+        {'data': _data(), 'type': 'pie'}
+    ]
+    with pytest.raises(ValueError) as error:
+        pp.compileCharts(charts)
+    assert "chart 0 ('Line'): axis column 'missing' is not in the data" in str(error.value)
+    assert "chart 1: type 'pie'" in str(error.value)
+
+#image settings that can't be exported or put on a slide are caught before anything is built
+@pytest.mark.parametrize('settings, problem', [
+    ({'format': 'gif'}, "image format 'gif'"),
+    ({'format': 'svg'}, "image format 'svg'"),
+    ({'format': 'webp'}, "image format 'webp'"),
+    ({'dpi': 0}, "image dpi 0"),
+    ({'scale': 'big'}, "image scale 'big'"),
+    ({'colors': 300}, "image colors 300"),
+    ({'quality': 2.5}, "image quality 2.5"),
+    ({'max-bytes': -1}, "image max-bytes -1"),
+    ({'size': 3}, "unknown image settings 'size'")
+])
+def test_image_settings_are_checked(template, settings, problem):
+    chart = {'data': _data(), 'type': 'bar', 'name': 'Bar', 'axis': 'region', 'metrics': [{'name': 'sales', 'method': 'sum'}],
+             'image-settings': settings, 'item-index': chartIndex}
+    with pytest.raises(ValueError, match=problem):
+        pp.compileCharts([chart])
+    with pytest.raises(ValueError, match=problem):
+        pp.createSlides([dict(chart, **{'image-settings': {}})], imageSettings=settings)
+
+def test_image_settings_in_range_pass(template):
+    settings = {'format': 'jpg', 'dpi': '150', 'scale': 1.5, 'colors': '64', 'quality': 85.0, 'max-bytes': 150000, 'quantize': 'true'}
+    chart = {'data': _data(), 'type': 'bar', 'name': 'Bar', 'axis': 'region', 'metrics': [{'name': 'sales', 'method': 'sum'}],
+             'image-settings': settings, 'item-index': chartIndex}
+    assert len(pp.compileCharts([chart])) == 1
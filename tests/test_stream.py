@@ -0,0 +1,56 @@
+import hashlib
+import zipfile
+
+import pandas as pd
+import pytest
+from pptx import Presentation
+
+import plotlyPowerpoint as pp
+from conftest import chartIndex, tableIndex
+
+def _charts():
+    data = pd.DataFrame({'day': [1, 2, 3, 4, 1, 2, 3, 4], 'team': ['a'] * 4 + ['b'] * 4, 'sales': [5, 3, 8, 6, 2, 4, 1, 7]})
+    metrics = [{'name': 'sales', 'method': 'sum'}]
+    return [
+        {'data': data, 'type': 'line', 'name': 'Picture', 'metrics': metrics, 'axis': 'day', 'color': 'team', 'item-index': chartIndex},
+        {'data': data, 'type': 'bar', 'name': 'Native', 'metrics': metrics, 'axis': 'day', 'item-index': chartIndex, 'native': 'true'},
+        {'data': data, 'type': 'table', 'name': 'Table', 'column_formats': ['', '', 'number'], 'item-index': tableIndex}
+    ]
+
+#function to read what a saved deck holds: its slide titles, every part and the content type of each, and the media
+def _contents(fileName):
+    deck = Presentation(fileName)
+    titles = [slide.shapes.title.text if slide.shapes.title is not None else None for slide in deck.slides]
+    with zipfile.ZipFile(fileName) as f:
+        names = sorted(f.namelist())
+        media = {name: hashlib.sha1(f.read(name)).hexdigest() for name in names if name.startswith('ppt/media/')}
+    parts = sorted((str(part.partname), part.content_type) for part in deck.part.package.iter_parts())
+    return titles, names, parts, media
+
+#a streamed deck opens with the same slides, parts and media as saving it all at the end
+def test_stream_matches_save(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pp.createSlides(_charts())
+    saved = _contents('output.pptx')
+
+    pp.setTemplate(template)
+    pp.createSlides(_charts(), stream=True)
+    streamed = _contents('output.pptx')
+
+    assert streamed == saved
+    assert saved[0][-3:] == ['Picture', 'Native', 'Table']
+    assert saved[3]
+
+#a streamed deck can't be built on, so the next build asks for the template and leaves the output alone
+def test_build_after_stream_needs_template(template, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pp.createSlides(_charts()[1:], native=True, stream=True)
+    with open('output.pptx', 'rb') as f:
+        before = f.read()
+
+    with pytest.raises(Exception, match='setTemplate'):
+        pp.createSlides(_charts()[1:], native=True)
+
+    with open('output.pptx', 'rb') as f:
+        assert f.read() == before
+    assert len(Presentation('output.pptx').slides) == len(Presentation(template).slides) + 2
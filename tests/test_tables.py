@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+from lxml import etree
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.util import Pt
+
+from plotlyPowerpoint.core import _set_cell_border
+from plotlyPowerpoint.tables import _formatColumn, _formatValue, _insertTable, _tableText
+from conftest import tableIndex
+
+_formats = ['number', 'money', 'percent', 'twoDigitNum', 'date', '']
+
+_columns = {
+    'floats': pd.Series([1.5, -2.75, np.nan, 0.0, 123456.789, -0.004]),
+    'ints': pd.Series([1, -2, 0, 2 ** 40]),
+    'unsigned': pd.Series([1, 2, 3], dtype='uint32'),
+    'huge': pd.Series([1e20, -3e19, np.nan, 2.5]),
+    'strings': pd.Series(['a', None, 'c & d']),
+    'bools': pd.Series([True, False]),
+    'dates': pd.Series(pd.to_datetime(['2021-01-02', None, '2020-12-31']))
+}
+
+#a column is formatted all at once, and has to give the same text as formatting each value on its own
+@pytest.mark.parametrize('name', list(_columns))
+@pytest.mark.parametrize('textFormat', _formats)
+def test_column_matches_values(name, textFormat):
+    column = _columns[name]
+    try:
+        expected = [_formatValue(value, textFormat) for value in column.to_numpy()]
+    except (TypeError, ValueError, AttributeError):
+        pytest.skip('format does not apply to this column')
+    assert _formatColumn(column, textFormat) == expected
+
+#values too big for int64 are printed in full, instead of wrapping around
+def test_huge_values_do_not_overflow():
+    column = pd.Series([1e20, np.nan])
+    assert _formatColumn(column, 'number') == ['100000000000000000000', '']
+    assert _formatColumn(column, 'money') == ['$100000000000000000000', '']
+    assert _formatColumn(pd.Series([1e17]), 'percent') == ['10000000000000000000%']
+
+#the table writer from before tables were built in one pass, setting every cell one at a time
+def _cellByCell(placeholder, temp, chartDefinition):
+    table = placeholder.insert_table(rows=len(temp) + 1, cols=len(temp.columns)).table
+    for i in range(len(temp) + 1):
+        for i2 in range(len(temp.columns)):
+            cell = table.cell(i, i2)
+            cell.text = temp.columns[i2] if i == 0 else _formatValue(temp.iloc[i - 1, i2], chartDefinition['column_formats'][i2])
+
+    for i in range(len(temp) + 1):
+        for i2 in range(len(temp.columns)):
+            cell = _set_cell_border(table.cell(i, i2))
+            cell.text_frame.paragraphs[0].font.color.rgb = RGBColor.from_string(chartDefinition['text_color'].replace('#', ''))
+
+    for i in range(len(temp.columns)):
+        cell = table.cell(0, i)
+        if 'header_fill_color' in chartDefinition:
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = RGBColor.from_string(chartDefinition['header_fill_color'].replace('#', ''))
+        if 'header_text_color' in chartDefinition:
+            cell.text_frame.paragraphs[0].font.color.rgb = RGBColor.from_string(chartDefinition['header_text_color'].replace('#', ''))
+        if 'header_font_size' in chartDefinition:
+            cell.text_frame.paragraphs[0].font.size = Pt(int(chartDefinition['header_font_size']))
+
+    for i in range(1, len(temp) + 1):
+        for i2 in range(len(temp.columns)):
+            cell = table.cell(i, i2)
+            if 'fill_color' in chartDefinition:
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = RGBColor.from_string(chartDefinition['fill_color'].replace('#', '', regex=True).iloc[i - 1, i2])
+            if 'text_font_size' in chartDefinition:
+                cell.text_frame.paragraphs[0].font.size = Pt(int(chartDefinition['text_font_size']))
+
+def _table():
+    return pd.DataFrame({
+        'name': ['alpha', None, 'c & d', 'line\nbreak'],
+        'sales': [1234.5, np.nan, -2.75, 0.0],
+        'share': [0.25, 0.5, np.nan, 1.0],
+        'day': pd.to_datetime(['2021-01-02', '2021-02-03', '2021-03-04', '2020-12-31'])
+    })
+
+_tableOptions = [
+    {'text_color': '#000000'},
+    {'text_color': '#333333', 'header_text_color': '#FFFFFF', 'header_fill_color': '#1F4E79', 'header_font_size': 14, 'text_font_size': 10,
+     'fill_color': pd.DataFrame([['#FFFFFF', '#eeeeee', '#FFFFFF', '#DDDDDD']] * 4)}
+]
+
+#building the table in one pass gives the same xml as setting every cell one at a time
+@pytest.mark.parametrize('options', _tableOptions)
+def test_table_xml_matches_cell_by_cell(template, options):
+    temp = _table()
+    chartDefinition = dict(options, column_formats=['', 'money', 'percent', 'date'])
+    deck = Presentation(template)
+    placeholders = [deck.slides.add_slide(deck.slide_layouts[tableIndex['slide']]).placeholders[tableIndex['chart']] for i in range(2)]
+
+    _cellByCell(placeholders[0], temp, chartDefinition)
+    _insertTable(placeholders[1], list(temp.columns), _tableText(temp, chartDefinition), chartDefinition, chartDefinition.get('fill_color'))
+
+    frames = [slide.shapes[-1] for slide in list(deck.slides)[-2:]]
+    tables = [frame._element.xpath('.//a:tbl')[0] for frame in frames]
+    assert etree.tostring(tables[1], method='c14n', exclusive=True) == etree.tostring(tables[0], method='c14n', exclusive=True)
+    assert (frames[1].width, frames[1].height) == (frames[0].width, frames[0].height)
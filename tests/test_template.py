@@ -0,0 +1,35 @@
+import io
+
+from pptx import Presentation
+
+from plotlyPowerpoint.template import Template
+
+#each copy is its own deck: slides added to or removed from one don't show up in another, or in the template
+def test_copies_are_independent(template):
+    template = Template(template)
+    first = template.presentation()
+    second = template.presentation()
+    count = len(template._prs.slides)
+
+    first.slides.add_slide(first.slide_layouts[0])
+    sldId = second.slides._sldIdLst[0]
+    second.part.drop_rel(sldId.rId)
+    second.slides._sldIdLst.remove(sldId)
+    second.slides[0].shapes.title.text = 'changed'
+
+    assert len(first.slides) == count + 1
+    assert len(second.slides) == count - 1
+    assert len(template._prs.slides) == count
+    assert template.presentation().slides[1].shapes.title.text != 'changed'
+
+#a copy saves and opens again with the slides it was given
+def test_copy_saves(template):
+    deck = Template(template).presentation()
+    slide = deck.slides.add_slide(deck.slide_layouts[0])
+    slide.shapes.title.text = 'new slide'
+
+    saved = io.BytesIO()
+    deck.save(saved)
+    reopened = Presentation(io.BytesIO(saved.getvalue()))
+    assert reopened.slides[-1].shapes.title.text == 'new slide'
+    assert len(reopened.slide_layouts) == len(deck.slide_layouts)